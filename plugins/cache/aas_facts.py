@@ -0,0 +1,297 @@
+# Copyright: (c) 2024, Benjamin Goetz <benjamin.goetz@ipa.fraunhofer.de>
+# Apache 2.0
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+name: aas_facts
+
+short_description: Stores the facts of each host as submodel in an AAS submodel repository
+
+version_added: "1.0.0"
+
+description:
+    - Facts are converted like by the 'convert_to_sm' module and stored as one submodel per host with the id
+      '_prefix' + inventory hostname, so no separate upload tasks are needed.
+    - Facts are kept in memory during the run. Changed hosts are written in concurrent batches once 'batch_size'
+      hosts are pending and when the run ends. The hash of the facts is stored as extension of the submodel, hosts
+      whose facts did not change are not written again.
+    - The facts are also stored unchanged as JSON in an extension of the submodel, the submodel elements are only
+      a view of them (e.g. idShorts without characters not allowed in idShorts). Facts of hosts which are not in
+      memory are read from this extension with the metadata of their submodel.
+
+options:
+    _uri:
+        description: Url of the submodel repository, e.g. http://localhost:8081
+        required: true
+        type: str
+        env:
+            - name: ANSIBLE_CACHE_PLUGIN_CONNECTION
+        ini:
+            - key: fact_caching_connection
+              section: defaults
+    _prefix:
+        description: Prefix of the submodel ids
+        type: str
+        default: 'urn:slm:aas:facts:'
+        env:
+            - name: ANSIBLE_CACHE_PLUGIN_PREFIX
+        ini:
+            - key: fact_caching_prefix
+              section: defaults
+    semantic_id:
+        description: Semantic id of the fact submodels, used to list the hosts in the cache
+        type: str
+        default: https://docs.ansible.com/ansible/latest/playbook_guide/playbooks_vars_facts.html#ansible-facts
+        env:
+            - name: SLM_AAS_FACTS_SEMANTIC_ID
+        ini:
+            - key: semantic_id
+              section: slm_aas_facts
+    batch_size:
+        description: Number of changed hosts after which their submodels are written
+        type: int
+        default: 100
+        env:
+            - name: SLM_AAS_FACTS_BATCH_SIZE
+        ini:
+            - key: batch_size
+              section: slm_aas_facts
+    concurrency:
+        description: Maximum number of parallel requests when writing a batch
+        type: int
+        default: 8
+        env:
+            - name: SLM_AAS_FACTS_CONCURRENCY
+        ini:
+            - key: concurrency
+              section: slm_aas_facts
+
+author:
+    - Benjamin Goetz (@ipa-big)
+'''
+
+EXAMPLES = r'''
+# ansible.cfg
+# [defaults]
+# fact_caching = slm.aas.aas_facts
+# fact_caching_connection = http://localhost:8081
+'''
+
+from ansible.errors import AnsibleError
+from ansible.plugins.cache import BaseCacheModule
+from ansible.utils.display import Display
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.submodel_repository import SmRepoClient
+except ImportError:
+    from plugins.module_utils.submodel_repository import SmRepoClient
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.convert import convert_to_submodel
+except ImportError:
+    from plugins.module_utils.convert import convert_to_submodel
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.pagination import iter_paged
+except ImportError:
+    from plugins.module_utils.pagination import iter_paged
+
+import atexit
+import base64
+import hashlib
+import json
+import os
+import threading
+
+import requests
+
+display = Display()
+
+FACTS_HASH_EXTENSION = 'slm.aas.factsHash'
+FACTS_EXTENSION = 'slm.aas.facts'
+
+
+def encode_facts(facts) -> str:
+    return json.dumps(facts, sort_keys=True, default=str)
+
+
+def get_facts_hash(facts) -> str:
+    return hashlib.sha256(encode_facts(facts).encode('utf-8')).hexdigest()
+
+
+def get_extension_value(submodel, name):
+    for extension in submodel.get('extensions') or []:
+        if extension.get('name') == name:
+            return extension.get('value')
+    return None
+
+
+def get_stored_facts_hash(submodel) -> str:
+    return get_extension_value(submodel, FACTS_HASH_EXTENSION) or ''
+
+
+def map_in_threads(function, items, max_workers) -> list:
+    """Like ThreadPoolExecutor.map, but with plain threads, which can still be started in atexit handlers."""
+    items = list(items)
+    results = [None] * len(items)
+    errors = []
+    indexes = iter(range(len(items)))
+    lock = threading.Lock()
+
+    def work():
+        while not errors:
+            with lock:
+                index = next(indexes, None)
+            if index is None:
+                return
+            try:
+                results[index] = function(items[index])
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=work) for _ in range(min(max(max_workers, 1), len(items)))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if errors:
+        raise errors[0]
+    return results
+
+
+class CacheModule(BaseCacheModule):
+    # Facts are stored as submodels, not as JSON payload of Ansible's serialization wrapper:
+    _persistent = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.prefix = self.get_option('_prefix') or ''
+        self.semantic_id = self.get_option('semantic_id')
+        self.batch_size = max(self.get_option('batch_size'), 1)
+        self.client = SmRepoClient(self.get_option('_uri').rstrip('/'), max_workers=self.get_option('concurrency'))
+
+        self.facts = dict()
+        # Hash of the facts stored in the repository, per host (None: no submodel, '': submodel without hash):
+        self.stored_hashes = dict()
+        self.pending = set()
+
+        # Forks of the controller do not run the handler, they exit without atexit:
+        self.pid = os.getpid()
+        atexit.register(self.write_pending)
+
+    def get_sm_id(self, key) -> str:
+        return f'{self.prefix}{key}'
+
+    def get_submodel(self, key, facts) -> dict:
+        submodel = convert_to_submodel(self.get_sm_id(key), facts, self.semantic_id)
+        submodel['extensions'] = [
+            dict(name=FACTS_HASH_EXTENSION, valueType='xs:string', value=get_facts_hash(facts)),
+            dict(name=FACTS_EXTENSION, valueType='xs:string', value=encode_facts(facts)),
+        ]
+        return submodel
+
+    def get_stored_hash(self, key):
+        if key not in self.stored_hashes:
+            status_code, content = self.client.get_metadata(self.get_sm_id(key))
+            self.stored_hashes[key] = get_stored_facts_hash(content) if status_code == 200 else None
+        return self.stored_hashes[key]
+
+    def write(self, key):
+        facts = self.facts[key]
+        facts_hash = get_facts_hash(facts)
+        stored_hash = self.get_stored_hash(key)
+        if stored_hash == facts_hash:
+            return 200
+
+        submodel = self.get_submodel(key, facts)
+        if stored_hash is None:
+            status_code, content = self.client.create(submodel, force=True)
+        else:
+            status_code, content = self.client.update(submodel)
+
+        if status_code in [201, 204]:
+            self.stored_hashes[key] = facts_hash
+        return status_code
+
+    def write_pending(self):
+        if os.getpid() != self.pid or not self.pending:
+            return
+
+        keys = sorted(self.pending)
+        self.pending = set()
+
+        # Runs at exit as well, when concurrent.futures no longer accepts new work:
+        try:
+            status_codes = map_in_threads(self.write, keys, self.client.max_workers)
+        except requests.exceptions.RequestException as e:
+            display.warning(f'Failed to write facts to {self.client.url}. {e}')
+            return
+
+        failed = [key for key, status_code in zip(keys, status_codes) if status_code not in [200, 201, 204]]
+        if failed:
+            display.warning(f'Failed to write facts of {len(failed)} hosts to {self.client.url}: {", ".join(failed)}')
+
+    def get(self, key):
+        if key not in self.facts:
+            if key in self.stored_hashes and self.stored_hashes[key] is None:
+                raise KeyError(key)
+            try:
+                self.facts[key] = self.read(key)
+            except requests.exceptions.RequestException as e:
+                raise AnsibleError(f'Failed to read facts of {key} from {self.client.url}. {e}')
+
+        return self.facts[key]
+
+    def read(self, key):
+        status_code, content = self.client.get_metadata(self.get_sm_id(key))
+        if status_code == 404:
+            self.stored_hashes[key] = None
+        if status_code != 200:
+            raise KeyError(key)
+        self.stored_hashes[key] = get_stored_facts_hash(content)
+
+        facts = get_extension_value(content, FACTS_EXTENSION)
+        if facts is not None:
+            return json.loads(facts)
+
+        # Submodels written before the facts were stored as extension only have their value:
+        status_code, content = self.client.get_value(self.get_sm_id(key))
+        if status_code != 200:
+            raise KeyError(key)
+        return content
+
+    def set(self, key, value):
+        self.facts[key] = value
+        self.pending.add(key)
+
+        if len(self.pending) >= self.batch_size:
+            self.write_pending()
+
+    def keys(self):
+        url = f'{self.client.url}/submodels?semanticId='
+        url += base64.b64encode(self.semantic_id.encode('utf-8')).decode('ascii')
+
+        keys = set(self.facts)
+        for submodel in iter_paged(self.client.session.get, url, limit=self.client.page_size):
+            if submodel['id'].startswith(self.prefix):
+                keys.add(submodel['id'][len(self.prefix):])
+        return sorted(keys)
+
+    def contains(self, key):
+        if key in self.facts:
+            return True
+        return self.get_stored_hash(key) is not None
+
+    def delete(self, key):
+        self.facts.pop(key, None)
+        self.pending.discard(key)
+        self.stored_hashes[key] = None
+        self.client.delete(self.get_sm_id(key))
+
+    def flush(self):
+        for key in self.keys():
+            self.delete(key)
@@ -0,0 +1,189 @@
+# Copyright: (c) 2024, Benjamin Goetz <benjamin.goetz@ipa.fraunhofer.de>
+# Apache 2.0
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+name: submodel_upload
+
+type: aggregate
+
+short_description: Uploads the gathered facts of each host as submodel in the background
+
+version_added: "1.0.0"
+
+description:
+    - Collects the facts of every host when its fact gathering ('setup' or 'gather_facts') finishes and converts
+      them like the 'convert_to_sm' module, so no 'convert_to_sm' and 'submodel' tasks per host are needed.
+    - Submodels are uploaded concurrently in the background, in batches once 'batch_size' hosts are collected and
+      at the end of every play, which waits for all uploads of the play.
+    - The submodel id of a host is 'id_prefix' + inventory hostname.
+
+requirements:
+    - Enable the plugin with 'callbacks_enabled' in ansible.cfg
+
+options:
+    url:
+        description: Url of the submodel repository, e.g. http://localhost:8081
+        required: true
+        type: str
+        env:
+            - name: SLM_AAS_SUBMODEL_UPLOAD_URL
+        ini:
+            - key: url
+              section: callback_submodel_upload
+    id_prefix:
+        description: Prefix of the submodel ids
+        type: str
+        default: 'urn:slm:aas:facts:'
+        env:
+            - name: SLM_AAS_SUBMODEL_UPLOAD_ID_PREFIX
+        ini:
+            - key: id_prefix
+              section: callback_submodel_upload
+    semantic_id:
+        description: Semantic id of the submodels
+        type: str
+        default: https://docs.ansible.com/ansible/latest/playbook_guide/playbooks_vars_facts.html#ansible-facts
+        env:
+            - name: SLM_AAS_SUBMODEL_UPLOAD_SEMANTIC_ID
+        ini:
+            - key: semantic_id
+              section: callback_submodel_upload
+    batch_size:
+        description: Number of collected hosts after which their submodels are uploaded
+        type: int
+        default: 50
+        env:
+            - name: SLM_AAS_SUBMODEL_UPLOAD_BATCH_SIZE
+        ini:
+            - key: batch_size
+              section: callback_submodel_upload
+    concurrency:
+        description: Maximum number of parallel uploads
+        type: int
+        default: 8
+        env:
+            - name: SLM_AAS_SUBMODEL_UPLOAD_CONCURRENCY
+        ini:
+            - key: concurrency
+              section: callback_submodel_upload
+
+author:
+    - Benjamin Goetz (@ipa-big)
+'''
+
+EXAMPLES = r'''
+# ansible.cfg
+# [defaults]
+# callbacks_enabled = slm.aas.submodel_upload
+#
+# [callback_submodel_upload]
+# url = http://localhost:8081
+'''
+
+from ansible.plugins.callback import CallbackBase
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.submodel_repository import SmRepoClient
+except ImportError:
+    from plugins.module_utils.submodel_repository import SmRepoClient
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.convert import convert_to_submodel
+except ImportError:
+    from plugins.module_utils.convert import convert_to_submodel
+
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from basyx.aas.model import AASConstraintViolation
+
+# Errors of convert_to_submodel for facts which can not be represented as submodel:
+CONVERSION_ERRORS = (AASConstraintViolation, AttributeError, TypeError, ValueError)
+
+FACT_MODULES = (
+    'setup', 'ansible.builtin.setup', 'ansible.legacy.setup',
+    'gather_facts', 'ansible.builtin.gather_facts', 'ansible.legacy.gather_facts',
+)
+
+FACT_PREFIX = 'ansible_'
+
+
+def get_facts(result) -> dict:
+    # Facts are returned with prefix, like 'ansible_facts' of a host without it:
+    return {
+        key[len(FACT_PREFIX):] if key.startswith(FACT_PREFIX) else key: value
+        for key, value in result.get('ansible_facts', {}).items()
+    }
+
+
+class CallbackModule(CallbackBase):
+    CALLBACK_VERSION = 2.0
+    CALLBACK_TYPE = 'aggregate'
+    CALLBACK_NAME = 'slm.aas.submodel_upload'
+    CALLBACK_NEEDS_ENABLED = True
+
+    def __init__(self, display=None):
+        super().__init__(display)
+
+        self.client = None
+        self.executor = None
+        self.pending = dict()
+        self.uploads = []
+
+    def set_options(self, task_keys=None, var_options=None, direct=None):
+        super().set_options(task_keys=task_keys, var_options=var_options, direct=direct)
+
+        self.client = SmRepoClient(self.get_option('url').rstrip('/'), max_workers=self.get_option('concurrency'))
+        self.executor = ThreadPoolExecutor(max_workers=max(self.get_option('concurrency'), 1))
+
+    def upload(self, host, facts):
+        # Runs in the executor, errors are returned so one host does not fail the others or the playbook:
+        try:
+            submodel = convert_to_submodel(
+                f'{self.get_option("id_prefix")}{host}', facts, self.get_option('semantic_id')
+            )
+        except CONVERSION_ERRORS as e:
+            return host, None, f'Failed to convert facts. {e}'
+        try:
+            status_code, content = self.client.create(submodel, force=True)
+        except requests.exceptions.RequestException as e:
+            return host, None, str(e)
+        return host, status_code, content
+
+    def flush(self):
+        pending, self.pending = self.pending, dict()
+        self.uploads += [self.executor.submit(self.upload, host, facts) for host, facts in pending.items()]
+
+    def wait(self):
+        self.flush()
+        uploads, self.uploads = self.uploads, []
+
+        failed = []
+        for upload in uploads:
+            host, status_code, content = upload.result()
+            if status_code not in [201, 204]:
+                failed.append(f'{host} ({status_code or content})')
+
+        if failed:
+            self._display.warning(f'Failed to upload submodels of {len(failed)} hosts: {", ".join(failed)}')
+        elif uploads:
+            self._display.vv(f'Uploaded submodels of {len(uploads)} hosts to {self.client.url}')
+
+    def v2_runner_on_ok(self, result):
+        if result._task.action not in FACT_MODULES:
+            return
+
+        self.pending[result._host.get_name()] = get_facts(result._result)
+        if len(self.pending) >= self.get_option('batch_size'):
+            self.flush()
+
+    def v2_playbook_on_play_start(self, play):
+        # End of the previous play:
+        self.wait()
+
+    def v2_playbook_on_stats(self, stats):
+        self.wait()
+        self.executor.shutdown()
@@ -0,0 +1,32 @@
+# Copyright: (c) 2024, Benjamin Goetz <benjamin.goetz@ipa.fraunhofer.de>
+# Apache 2.0
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+    DOCUMENTATION = r'''
+options:
+    cache:
+        description:
+            - Cache GET responses. 'memory' caches within the module process, 'file' in 'cache_dir', which is shared
+              by all tasks and forks running on the same host (e.g. when delegated to the controller).
+            - Fresh entries are served without a request, stale entries are revalidated via ETag if the server sent one.
+            - Writes through the module invalidate the cached resource, its parents and children.
+        required: false
+        type: str
+        choices: ['none', 'memory', 'file']
+        default: none
+    cache_ttl:
+        description: Seconds a cached response is used without revalidation
+        required: false
+        type: int
+        default: 60
+    cache_dir:
+        description:
+            - Directory of the file cache, created with mode 0700 if it does not exist
+            - The module fails if the directory is owned by another user or writable by group or others
+        required: false
+        type: path
+        default: ~/.ansible/tmp/slm-aas-cache
+'''
@@ -0,0 +1,32 @@
+# Copyright: (c) 2024, Benjamin Goetz <benjamin.goetz@ipa.fraunhofer.de>
+# Apache 2.0
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+    DOCUMENTATION = r'''
+options:
+    max_requests_per_second:
+        description:
+            - Maximum number of requests per second sent to one endpoint (scheme, host and port), 0 means unlimited.
+            - The limit is shared by all tasks and forks of the same user running on the same host with the same
+              'limiter_dir' (e.g. when delegated to the controller), independent of the number of forks.
+        required: false
+        type: float
+        default: 0
+    max_in_flight:
+        description:
+            - Maximum number of concurrent requests to one endpoint, 0 means unlimited.
+            - Shared the same way as 'max_requests_per_second'.
+        required: false
+        type: int
+        default: 0
+    limiter_dir:
+        description:
+            - Directory of the lock files of the limiter, created with mode 0700 if it does not exist
+            - The module fails if the directory is owned by another user or writable by group or others
+        required: false
+        type: path
+        default: ~/.ansible/tmp/slm-aas-limiter
+'''
@@ -0,0 +1,18 @@
+# Copyright: (c) 2024, Benjamin Goetz <benjamin.goetz@ipa.fraunhofer.de>
+# Apache 2.0
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+    DOCUMENTATION = r'''
+options:
+    metrics:
+        description:
+            - Add a 'metrics' section to the result, with wall and CPU time per phase (import, conversion,
+              serialization, network, total), number of requests, bytes sent and received, retries, cache hits,
+              server time (if the server sends a 'Server-Timing' header) and peak RSS of the module process.
+        required: false
+        type: bool
+        default: false
+'''
@@ -0,0 +1,24 @@
+# Copyright: (c) 2024, Benjamin Goetz <benjamin.goetz@ipa.fraunhofer.de>
+# Apache 2.0
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+    DOCUMENTATION = r'''
+options:
+    trace_dir:
+        description:
+            - Record spans of the module run (conversion, each HTTP request with method, url, status code and sizes,
+              retries) and append them to '<trace_dir>/<trace_host>.jsonl' on the host running the module.
+            - Each line is an OpenTelemetry (OTLP JSON) trace export, which can be loaded into a trace viewer offline.
+            - Tracing is disabled if not set.
+        required: false
+        type: path
+    trace_host:
+        description:
+            - Host name of the spans and the trace file, e.g. "{{ inventory_hostname }}"
+            - Defaults to the hostname of the host running the module
+        required: false
+        type: str
+'''
@@ -0,0 +1,20 @@
+# Copyright: (c) 2024, Benjamin Goetz <benjamin.goetz@ipa.fraunhofer.de>
+# Apache 2.0
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+    DOCUMENTATION = r'''
+options:
+    validate:
+        description:
+            - Validate the documents against the rules of the AAS V3 metamodel before any request is sent, e.g.
+              idShorts, values matching their valueType and the elements of SubmodelElementLists
+            - The module fails with up to 20 'validation_errors' (JSON path and message) if a document is invalid
+            - Disabled by default, documents accepted by the server may still be rejected, e.g. single character
+              idShorts which do not match constraint AASd-002
+        required: false
+        type: bool
+        default: false
+'''
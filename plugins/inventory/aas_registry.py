@@ -0,0 +1,239 @@
+# Copyright: (c) 2024, Benjamin Goetz <benjamin.goetz@ipa.fraunhofer.de>
+# Apache 2.0
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+name: aas_registry
+
+short_description: Builds the inventory from the shell descriptors of an AAS registry
+
+version_added: "1.0.0"
+
+description:
+    - Pages through '/shell-descriptors' of a shell registry and adds one host per shell descriptor.
+    - The inventory source must be a YAML file whose name ends with 'aas_registry.yml' or 'aas_registry.yaml'.
+    - Only the shell descriptors are listed by default, which keeps the start of the inventory fast.
+    - With 'fetch_submodels', the value ('$value') of each submodel referenced by a shell descriptor is fetched
+      concurrently and added as host variable (prefix 'submodel_var_prefix' and idShort of the submodel). Values are
+      plain data, they are never templated. Submodels that can not be fetched are skipped with a warning.
+    - With the inventory cache enabled, descriptors and submodel values are only fetched again once 'cache_timeout'
+      has expired.
+
+options:
+    plugin:
+        description: Name of the plugin
+        required: true
+        type: str
+        choices: ['slm.aas.aas_registry']
+    scheme:
+        description: Scheme of the connection url for the shell registry
+        required: false
+        type: str
+        default: http
+    host:
+        description: Hostname of the host which runs the shell registry
+        required: true
+        type: str
+    port:
+        description: Port of the shell registry
+        required: false
+        type: str
+        default: 8082
+    page_size:
+        description: Number of descriptors requested per page
+        required: false
+        type: int
+        default: 100
+    hostname:
+        description: Descriptor attribute used as inventory hostname
+        required: false
+        type: str
+        choices: ['idShort', 'id']
+        default: idShort
+    fetch_submodels:
+        description:
+            - Fetch the values of the submodels of each shell and add them as host variables.
+            - Disabled by default, one request per submodel is made when the inventory is built.
+        required: false
+        type: bool
+        default: false
+    submodel_var_prefix:
+        description: Prefix of the submodel host variables
+        required: false
+        type: str
+        default: aas_submodel_
+    concurrency:
+        description: Maximum number of submodel values fetched in parallel
+        required: false
+        type: int
+        default: 8
+extends_documentation_fragment:
+    - constructed
+    - inventory_cache
+
+author:
+    - Benjamin Goetz (@ipa-big)
+'''
+
+EXAMPLES = r'''
+# aas_registry.yml
+plugin: slm.aas.aas_registry
+host: localhost
+port: 8082
+cache: true
+cache_plugin: ansible.builtin.jsonfile
+cache_connection: /tmp/aas_inventory
+cache_timeout: 600
+keyed_groups:
+  - key: aas_asset_kind
+    prefix: asset_kind
+
+# Use a submodel of a host, it was fetched (or read from the cache) while building the inventory:
+# - ansible.builtin.debug:
+#     msg: "{{ aas_submodel_TechnicalData }}"
+'''
+
+from ansible.errors import AnsibleParserError
+from ansible.plugins.inventory import BaseInventoryPlugin, Cacheable, Constructable
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.registry import ShellRegistryClient
+except ImportError:
+    from plugins.module_utils.registry import ShellRegistryClient
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.session import create_session
+except ImportError:
+    from plugins.module_utils.session import create_session
+
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+
+def get_href(descriptor):
+    for endpoint in descriptor.get('endpoints') or []:
+        href = endpoint.get('protocolInformation', {}).get('href')
+        if href:
+            return href
+    return None
+
+
+def get_host_entry(descriptor) -> dict:
+    """Returns the part of a shell descriptor that is kept in the inventory cache, without submodel values."""
+    return dict(
+        id=descriptor['id'],
+        idShort=descriptor.get('idShort'),
+        assetKind=descriptor.get('assetKind'),
+        globalAssetId=descriptor.get('globalAssetId'),
+        href=get_href(descriptor),
+        submodels={
+            submodel_descriptor.get('idShort') or submodel_descriptor['id']: get_href(submodel_descriptor)
+            for submodel_descriptor in descriptor.get('submodelDescriptors') or []
+        },
+        values=dict(),
+    )
+
+
+def get_variable_name(prefix, id_short) -> str:
+    return prefix + re.sub(r'\W', '_', id_short)
+
+
+def get_submodel_value(session, href):
+    response = session.get(f'{href}/$value')
+    response.raise_for_status()
+    return json.loads(response.content)
+
+
+class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
+    NAME = 'slm.aas.aas_registry'
+
+    def verify_file(self, path):
+        return super().verify_file(path) and path.endswith(('aas_registry.yml', 'aas_registry.yaml'))
+
+    def get_host_entries(self) -> list:
+        registry_url = f'{self.get_option("scheme")}://{self.get_option("host")}:{self.get_option("port")}'
+        client = ShellRegistryClient(registry_url, page_size=self.get_option('page_size'))
+
+        try:
+            host_entries = [get_host_entry(descriptor) for descriptor in client.iter_descriptors(stream=True)]
+        except requests.exceptions.RequestException as e:
+            raise AnsibleParserError(f'Failed to list shell descriptors of {registry_url}. {e}')
+
+        if self.get_option('fetch_submodels'):
+            self.add_submodel_values(host_entries)
+        return host_entries
+
+    def add_submodel_values(self, host_entries):
+        concurrency = max(self.get_option('concurrency'), 1)
+        session = create_session(pool_maxsize=concurrency)
+        submodels = [
+            (entry, id_short, href)
+            for entry in host_entries for id_short, href in entry['submodels'].items() if href
+        ]
+
+        def fetch(submodel):
+            try:
+                return get_submodel_value(session, submodel[2]), None
+            except (requests.exceptions.RequestException, ValueError) as e:
+                return None, e
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for (entry, id_short, href), (value, error) in zip(submodels, executor.map(fetch, submodels)):
+                if error is not None:
+                    self.display.warning(f'Failed to fetch submodel {id_short} of {entry["id"]} from {href}. {error}')
+                else:
+                    entry['values'][id_short] = value
+
+    def populate(self, host_entries):
+        strict = self.get_option('strict')
+        prefix = self.get_option('submodel_var_prefix')
+
+        for entry in host_entries:
+            hostname = entry.get(self.get_option('hostname')) or entry['id']
+            self.inventory.add_host(hostname)
+
+            variables = dict(
+                aas_id=entry['id'],
+                aas_id_short=entry['idShort'],
+                aas_asset_kind=entry['assetKind'],
+                aas_global_asset_id=entry['globalAssetId'],
+                aas_href=entry['href'],
+                aas_submodel_hrefs=entry['submodels'],
+            )
+            for id_short, value in (entry.get('values') or {}).items():
+                variables[get_variable_name(prefix, id_short)] = value
+
+            for name, value in variables.items():
+                self.inventory.set_variable(hostname, name, value)
+
+            self._set_composite_vars(self.get_option('compose'), variables, hostname, strict=strict)
+            self._add_host_to_composed_groups(self.get_option('groups'), variables, hostname, strict=strict)
+            self._add_host_to_keyed_groups(self.get_option('keyed_groups'), variables, hostname, strict=strict)
+
+    def parse(self, inventory, loader, path, cache=True):
+        super().parse(inventory, loader, path, cache)
+        self._read_config_data(path)
+
+        cache_key = self.get_cache_key(path)
+        use_cache = self.get_option('cache') and cache
+        update_cache = self.get_option('cache') and not cache
+
+        host_entries = None
+        if use_cache:
+            try:
+                host_entries = self._cache[cache_key]
+            except KeyError:
+                update_cache = True
+
+        if host_entries is None:
+            host_entries = self.get_host_entries()
+
+        if update_cache:
+            self._cache[cache_key] = host_entries
+
+        self.populate(host_entries)
@@ -0,0 +1,282 @@
+# Copyright: (c) 2024, Benjamin Goetz <benjamin.goetz@ipa.fraunhofer.de>
+# Apache 2.0
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+name: submodel_value
+
+short_description: Reads values of submodel elements from a submodel repository
+
+version_added: "1.0.0"
+
+description:
+    - Resolves idShortPaths of submodel elements to their values (value-only serialization).
+    - All terms of the same submodel are resolved with one request to '/submodels/{id}/$value', the submodels of
+      different terms are requested in parallel.
+    - Responses are kept in a file cache shared by all tasks and forks of the run, so further lookups of the same
+      submodel within 'cache_ttl' need no request. The cache is private to the run, every run starts without
+      cached responses.
+
+options:
+    _terms:
+        description:
+            - idShortPaths (e.g. 'Nameplate.SerialNumber' or 'Documents[0].Title') of the submodel 'submodel_id'
+            - Or dicts with 'submodel_id' and 'path' to read from different submodels
+        required: true
+        type: list
+        elements: raw
+    scheme:
+        description: Scheme of the connection url for the submodel repository
+        type: str
+        default: http
+    host:
+        description: Hostname of the host which runs the submodel repository
+        required: true
+        type: str
+    port:
+        description: Port of the submodel repository
+        type: str
+        default: 8081
+    submodel_id:
+        description: Submodel of terms which are given as idShortPath only
+        type: str
+    level:
+        description:
+            - Level of the requested submodel values
+            - Level core only returns the direct children of the submodel, which is smaller than deep
+            - If not set, core is requested for submodels whose terms all point to top-level elements. A submodel is
+              requested again with deep if one of these elements is missing or turns out to be a collection or list.
+        type: str
+        choices: ['deep', 'core']
+    default:
+        description: Value returned for paths that do not exist (may be null), fails if not set
+        type: raw
+    concurrency:
+        description: Maximum number of parallel requests
+        type: int
+        default: 4
+    cache:
+        description: Cache of the submodel responses, 'file' shares the responses between all tasks and forks
+        type: str
+        choices: ['none', 'memory', 'file']
+        default: file
+    cache_ttl:
+        description: Seconds a cached submodel is used without revalidation
+        type: int
+        default: 60
+    cache_dir:
+        description:
+            - Directory of the file caches, defaults to ~/.ansible/tmp/slm-aas-cache
+            - Each run uses its own subdirectory, subdirectories of finished runs are removed
+        type: path
+
+author:
+    - Benjamin Goetz (@ipa-big)
+'''
+
+EXAMPLES = r'''
+- name: Read two values of the same submodel with one request
+  ansible.builtin.debug:
+    msg: "{{ lookup('slm.aas.submodel_value', 'ManufacturerName', 'SerialNumber',
+             host='localhost', submodel_id='https://example.com/ids/sm/Nameplate') }}"
+
+- name: Read values of several submodels
+  ansible.builtin.set_fact:
+    values: "{{ query('slm.aas.submodel_value', *terms, host='localhost') }}"
+  vars:
+    terms:
+      - submodel_id: https://example.com/ids/sm/Nameplate
+        path: SerialNumber
+      - submodel_id: https://example.com/ids/sm/TechnicalData
+        path: GeneralInformation.ManufacturerPartNumber
+'''
+
+RETURN = r'''
+_raw:
+    description: Values of the submodel elements, in the order of the terms
+    type: list
+    elements: raw
+'''
+
+from ansible.errors import AnsibleLookupError
+from ansible.plugins.lookup import LookupBase
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.submodel_repository import SmRepoClient
+except ImportError:
+    from plugins.module_utils.submodel_repository import SmRepoClient
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.cache import DEFAULT_CACHE_DIR, create_cache
+except ImportError:
+    from plugins.module_utils.cache import DEFAULT_CACHE_DIR, create_cache
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.private_dir import ensure_private_dir
+except ImportError:
+    from plugins.module_utils.private_dir import ensure_private_dir
+
+import multiprocessing
+import os
+import re
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+PATH_TOKEN = re.compile(r'\[(\d+)\]|([^.\[\]]+)')
+RUN_DIR_PREFIX = 'run-'
+
+# Marks paths that do not exist in a submodel:
+MISSING = object()
+
+
+def get_path_tokens(id_short_path) -> list:
+    return [
+        int(index) if index else id_short
+        for index, id_short in PATH_TOKEN.findall(id_short_path)
+    ]
+
+
+def get_path_value(submodel_value, id_short_path):
+    """Returns the value of 'id_short_path' in the value-only serialization of a submodel, or MISSING."""
+    value = submodel_value
+    for token in get_path_tokens(id_short_path):
+        if isinstance(token, int) and isinstance(value, list) and token < len(value):
+            value = value[token]
+        elif isinstance(token, str) and isinstance(value, dict) and token in value:
+            value = value[token]
+        else:
+            return MISSING
+    return value
+
+
+def is_top_level(id_short_path) -> bool:
+    tokens = get_path_tokens(id_short_path)
+    return len(tokens) == 1 and isinstance(tokens[0], str)
+
+
+def get_levels(terms, level=None) -> dict:
+    """Returns the level requested per submodel of 'terms', core if all of its paths point to top-level elements."""
+    if level is not None:
+        return {submodel_id: level for submodel_id, path in terms}
+
+    levels = dict()
+    for submodel_id, path in terms:
+        levels[submodel_id] = 'core' if is_top_level(path) and levels.get(submodel_id) != 'deep' else 'deep'
+    return levels
+
+
+def is_incomplete(value) -> bool:
+    # With level core, collections and lists are returned without their elements (or not at all):
+    return value is MISSING or isinstance(value, (dict, list))
+
+
+def is_process_alive(pid) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # The process exists, but belongs to another user:
+        return True
+    return True
+
+
+def get_run_cache_dir(cache_dir) -> str:
+    """Returns the subdirectory of 'cache_dir' of the current run, shared by the controller and its forks.
+
+    Lookups run in the forks of ansible-playbook, the pid of their parent identifies the run. Subdirectories of
+    runs that are no longer alive are removed.
+    """
+    parent = multiprocessing.parent_process()
+    run_pid = parent.pid if parent is not None else os.getpid()
+
+    ensure_private_dir(cache_dir)
+    for name in os.listdir(cache_dir):
+        pid = name[len(RUN_DIR_PREFIX):]
+        if name.startswith(RUN_DIR_PREFIX) and pid.isdigit() and int(pid) != run_pid and not is_process_alive(int(pid)):
+            shutil.rmtree(os.path.join(cache_dir, name), ignore_errors=True)
+
+    return os.path.join(cache_dir, f'{RUN_DIR_PREFIX}{run_pid}')
+
+
+def get_terms(terms, submodel_id=None) -> list:
+    result = []
+    for term in terms:
+        if isinstance(term, dict):
+            term_submodel_id, path = term.get('submodel_id', submodel_id), term.get('path')
+        else:
+            term_submodel_id, path = submodel_id, term
+
+        if not term_submodel_id or not path:
+            raise AnsibleLookupError(f'Term {term} needs a submodel_id and a path')
+        result.append((term_submodel_id, str(path)))
+    return result
+
+
+class LookupModule(LookupBase):
+    def get_submodel_values(self, client, levels, terms=()) -> dict:
+        """Returns the value of each submodel of 'levels' (submodel id -> level).
+
+        A submodel requested with level core is requested again with deep if one of its 'terms' is missing or its
+        value is a collection or list, their elements are not part of the core level.
+        """
+        def get_submodel_value(submodel_id):
+            level = levels[submodel_id]
+            content = self.get_submodel_value(client, submodel_id, level)
+            if level == 'core' and any(
+                is_incomplete(get_path_value(content, path))
+                for term_submodel_id, path in terms if term_submodel_id == submodel_id
+            ):
+                content = self.get_submodel_value(client, submodel_id, 'deep')
+            return content
+
+        with ThreadPoolExecutor(max_workers=max(self.get_option('concurrency'), 1)) as executor:
+            return dict(zip(levels, executor.map(get_submodel_value, levels)))
+
+    def get_submodel_value(self, client, submodel_id, level):
+        try:
+            status_code, content = client.get_value(submodel_id, level)
+        except requests.exceptions.ConnectionError as e:
+            raise AnsibleLookupError(f'Failed to connect to {client.url}. {e}')
+
+        if status_code != 200:
+            raise AnsibleLookupError(f'Failed to get submodel {submodel_id}, status code {status_code}. {content}')
+        return content
+
+    def run(self, terms, variables=None, **kwargs):
+        self.set_options(var_options=variables, direct=kwargs)
+
+        terms = get_terms(terms, self.get_option('submodel_id'))
+        # 'default: null' is a valid default, only a missing 'default' fails:
+        has_default = 'default' in kwargs
+
+        cache_dir = None
+        if self.get_option('cache') == 'file':
+            cache_dir = get_run_cache_dir(self.get_option('cache_dir') or DEFAULT_CACHE_DIR)
+
+        repo_url = f'{self.get_option("scheme")}://{self.get_option("host")}:{self.get_option("port")}'
+        client = SmRepoClient(
+            repo_url,
+            max_workers=self.get_option('concurrency'),
+            cache=create_cache(dict(
+                cache=self.get_option('cache'),
+                cache_ttl=self.get_option('cache_ttl'),
+                cache_dir=cache_dir,
+            ))
+        )
+        submodel_values = self.get_submodel_values(client, get_levels(terms, self.get_option('level')), terms)
+
+        values = []
+        for submodel_id, path in terms:
+            value = get_path_value(submodel_values[submodel_id], path)
+            if value is MISSING:
+                if not has_default:
+                    raise AnsibleLookupError(f'Path {path} not found in submodel {submodel_id}')
+                value = self.get_option('default')
+            values.append(value)
+
+        return values
@@ -0,0 +1,66 @@
+# Copyright: (c) 2024, Benjamin Goetz <benjamin.goetz@ipa.fraunhofer.de>
+# Apache 2.0
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+import sys
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+BASYX_MODEL = 'basyx.aas.model'
+JSON_CONTENT_TYPE = 'application/json'
+
+
+def is_basyx_instance(value, class_name) -> bool:
+    """Returns whether 'value' is an instance of the basyx model class 'class_name', without importing basyx.
+
+    Callers passing basyx objects have imported basyx already, if it is not imported 'value' can not be one.
+    """
+    model = sys.modules.get(BASYX_MODEL)
+    return model is not None and isinstance(value, getattr(model, class_name))
+
+
+def to_json_dict(value) -> dict:
+    # Only basyx objects need the encoder, so basyx is imported on first use:
+    from basyx.aas.adapter.json import AASToJsonEncoder
+
+    return json.loads(
+        json.dumps(value, cls=AASToJsonEncoder)
+    )
+
+
+def encode_json(value) -> bytes:
+    """Encodes a dict or basyx object to compact JSON, the bytes are meant to be sent as they are (also on retries).
+
+    Dicts are encoded with orjson if it is installed.
+    """
+    if type(value).__module__.startswith('basyx.'):
+        from basyx.aas.adapter.json import AASToJsonEncoder
+
+        return json.dumps(value, cls=AASToJsonEncoder, separators=(',', ':')).encode('utf-8')
+
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(value)
+        except TypeError:
+            # E.g. integers beyond 64 bit or keys which are no strings, which json handles:
+            pass
+    return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+
+def get_model_reference(sm_id: str) -> dict:
+    # Same as the serialized basyx ModelReference to submodel 'sm_id':
+    return {
+        "type": "ModelReference",
+        "keys": [
+            {
+                "type": "Submodel",
+                "value": sm_id
+            }
+        ]
+    }
@@ -0,0 +1,182 @@
+# Copyright: (c) 2024, Benjamin Goetz <benjamin.goetz@ipa.fraunhofer.de>
+# Apache 2.0
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import base64
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.private_dir import ensure_private_dir, \
+        get_default_private_dir
+except ImportError:
+    from plugins.module_utils.private_dir import ensure_private_dir, get_default_private_dir
+
+DEFAULT_CACHE_TTL = 60
+DEFAULT_CACHE_DIR = get_default_private_dir('slm-aas-cache')
+
+# Methods which change the resource of their url (and thereby parent collections and child resources):
+WRITE_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+
+
+def get_cache_argument_spec() -> dict:
+    return dict(
+        cache=dict(type='str', choices=['none', 'memory', 'file'], default='none'),
+        cache_ttl=dict(type='int', default=DEFAULT_CACHE_TTL),
+        cache_dir=dict(type='path', default=DEFAULT_CACHE_DIR),
+    )
+
+
+def create_cache(params):
+    if params.get('cache') == 'memory':
+        return ResponseCache(params['cache_ttl'])
+    elif params.get('cache') == 'file':
+        return FileResponseCache(params['cache_dir'], params['cache_ttl'])
+    return None
+
+
+def split_url(url):
+    """Returns the resource (url without query) and the query of 'url'."""
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path.rstrip('/'), '', '')), parts.query
+
+
+def get_ancestors(resource) -> list:
+    parts = urlsplit(resource)
+    segments = parts.path.strip('/').split('/')
+    return [
+        urlunsplit((parts.scheme, parts.netloc, '/' + '/'.join(segments[:index]) if index else '', '', ''))
+        for index in range(len(segments))
+    ]
+
+
+class CacheEntry:
+    def __init__(self, status_code, headers, content, stored_at=None):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.stored_at = time.time() if stored_at is None else stored_at
+
+    @property
+    def etag(self):
+        return self.headers.get('ETag')
+
+    def is_fresh(self, ttl) -> bool:
+        return time.time() - self.stored_at < ttl
+
+    def as_dict(self) -> dict:
+        return dict(
+            status_code=self.status_code,
+            headers=self.headers,
+            content=base64.b64encode(self.content).decode('ascii'),
+            stored_at=self.stored_at,
+        )
+
+    @classmethod
+    def from_dict(cls, value):
+        return cls(
+            value['status_code'],
+            value['headers'],
+            base64.b64decode(value['content']),
+            value['stored_at'],
+        )
+
+
+class ResponseCache:
+    """In-memory cache of GET responses, keyed by resource url and query."""
+
+    def __init__(self, ttl=DEFAULT_CACHE_TTL):
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.resources = dict()
+
+    def get(self, url):
+        resource, query = split_url(url)
+        with self.lock:
+            return self.resources.get(resource, {}).get(query)
+
+    def set(self, url, entry: CacheEntry):
+        resource, query = split_url(url)
+        with self.lock:
+            self.resources.setdefault(resource, {})[query] = entry
+
+    def invalidate(self, url, method='PUT'):
+        resource, query = split_url(url)
+        with self.lock:
+            for key in [resource] + get_ancestors(resource):
+                self.resources.pop(key, None)
+            if method != 'POST':
+                # POST only adds to a collection, all other writes may change the resources below:
+                for key in [key for key in self.resources if key.startswith(resource + '/')]:
+                    del self.resources[key]
+
+
+class FileResponseCache(ResponseCache):
+    """Cache of GET responses in 'cache_dir', shared between processes (e.g. the forks of a play).
+
+    Each resource is stored in its own file, named after the hash of its url. Files are replaced atomically.
+    'cache_dir' must be private to the current user (see ensure_private_dir), responses may contain secrets.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, ttl=DEFAULT_CACHE_TTL):
+        super().__init__(ttl)
+        self.cache_dir = ensure_private_dir(cache_dir)
+
+    def get_path(self, resource):
+        return os.path.join(self.cache_dir, hashlib.sha256(resource.encode('utf-8')).hexdigest() + '.json')
+
+    def read(self, path):
+        try:
+            with open(path) as fp:
+                return json.load(fp)
+        except (OSError, ValueError):
+            return None
+
+    def write(self, path, value):
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as fp:
+                json.dump(value, fp)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def get(self, url):
+        resource, query = split_url(url)
+        value = self.read(self.get_path(resource))
+        if value is None or query not in value['entries']:
+            return None
+        return CacheEntry.from_dict(value['entries'][query])
+
+    def set(self, url, entry: CacheEntry):
+        resource, query = split_url(url)
+        path = self.get_path(resource)
+        with self.lock:
+            value = self.read(path) or dict(resource=resource, entries=dict())
+            value['entries'][query] = entry.as_dict()
+            self.write(path, value)
+
+    def invalidate(self, url, method='PUT'):
+        resource, query = split_url(url)
+        with self.lock:
+            for key in [resource] + get_ancestors(resource):
+                self.remove(self.get_path(key))
+            if method != 'POST':
+                for file_name in os.listdir(self.cache_dir):
+                    path = os.path.join(self.cache_dir, file_name)
+                    value = self.read(path) if file_name.endswith('.json') else None
+                    if value is not None and value['resource'].startswith(resource + '/'):
+                        self.remove(path)
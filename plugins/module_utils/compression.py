@@ -0,0 +1,88 @@
+# Copyright: (c) 2024, Benjamin Goetz <benjamin.goetz@ipa.fraunhofer.de>
+# Apache 2.0
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import gzip
+import threading
+import zlib
+
+COMPRESSION_ENCODINGS = ('gzip', 'deflate')
+ACCEPT_ENCODING = ', '.join(COMPRESSION_ENCODINGS)
+DEFAULT_COMPRESSION_THRESHOLD = 1024
+
+# Status code of a server that can not handle the Content-Encoding of a request body (Unsupported Media Type):
+COMPRESSION_REJECTED_STATUS_CODE = 415
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=6)
+    elif encoding == 'deflate':
+        return zlib.compress(body, 6)
+    raise ValueError(f'Unsupported content encoding: {encoding}')
+
+
+def is_compression_rejected(response) -> bool:
+    """Returns whether 'response' rejects the Content-Encoding of the request body, not the body itself.
+
+    Besides 415, some servers answer with 400 and an error message naming the encoding. Any other 400 is a
+    validation error of the body, which an uncompressed retry would only repeat.
+    """
+    if response.status_code == COMPRESSION_REJECTED_STATUS_CODE:
+        return True
+    if response.status_code != 400:
+        return False
+
+    try:
+        message = response.content.decode('utf-8', errors='replace').lower()
+    except AttributeError:
+        return False
+    return 'encoding' in message and any(
+        word in message for word in ('unsupported', 'not supported', 'unknown', 'invalid')
+    )
+
+
+def get_wire_bytes(response) -> int:
+    # urllib3 counts the (possibly compressed) bytes read from the socket, requests only exposes decoded content:
+    try:
+        return int(response.raw.tell())
+    except (AttributeError, TypeError, ValueError):
+        return len(response.content)
+
+
+class TransferStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.bytes_sent = 0
+        self.bytes_sent_uncompressed = 0
+        self.bytes_received = 0
+        self.bytes_received_uncompressed = 0
+        self.compression_fallbacks = 0
+
+    def record(self, response, bytes_sent=0, bytes_sent_uncompressed=0):
+        bytes_received_uncompressed = len(response.content)
+        bytes_received = get_wire_bytes(response)
+
+        with self.lock:
+            self.requests += 1
+            self.bytes_sent += bytes_sent
+            self.bytes_sent_uncompressed += bytes_sent_uncompressed
+            self.bytes_received += bytes_received
+            self.bytes_received_uncompressed += bytes_received_uncompressed
+
+    def record_fallback(self):
+        with self.lock:
+            self.compression_fallbacks += 1
+
+    def as_dict(self) -> dict:
+        with self.lock:
+            return dict(
+                requests=self.requests,
+                bytes_sent=self.bytes_sent,
+                bytes_sent_uncompressed=self.bytes_sent_uncompressed,
+                bytes_received=self.bytes_received,
+                bytes_received_uncompressed=self.bytes_received_uncompressed,
+                compression_fallbacks=self.compression_fallbacks,
+            )
@@ -0,0 +1,63 @@
+# Copyright: (c) 2024, Benjamin Goetz <benjamin.goetz@ipa.fraunhofer.de>
+# Apache 2.0
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import hashlib
+import json
+
+# Lists of descriptors whose order carries no meaning (unlike e.g. the keys of a reference):
+UNORDERED_LISTS = ('endpoints', 'submodelDescriptors')
+
+
+def get_canonical_json(value) -> str:
+    return json.dumps(value, sort_keys=True, separators=(',', ':'))
+
+
+def normalize_descriptor(value, key=None):
+    """Returns a copy of 'value' that can be compared structurally.
+
+    Empty values are dropped (registries differ in returning them or not) and lists listed in UNORDERED_LISTS
+    are sorted, so that e.g. a different order of endpoints is not considered a change.
+    """
+    if isinstance(value, dict):
+        normalized = dict()
+        for k, v in value.items():
+            v = normalize_descriptor(v, k)
+            if v is not None and v != [] and v != {}:
+                normalized[k] = v
+        return normalized
+    elif isinstance(value, list):
+        normalized = [normalize_descriptor(v) for v in value]
+        if key in UNORDERED_LISTS:
+            normalized.sort(key=get_canonical_json)
+        return normalized
+    return value
+
+
+def descriptors_equal(desired, existing) -> bool:
+    return normalize_descriptor(desired) == normalize_descriptor(existing)
+
+
+def get_descriptor_hash(descriptor) -> str:
+    return hashlib.sha256(
+        get_canonical_json(normalize_descriptor(descriptor)).encode('utf-8')
+    ).hexdigest()
+
+
+def register_descriptor(client, descriptor):
+    """Creates 'descriptor' or updates it if the registered one differs, returns status code and content.
+
+    'client' is a registry client with get_descriptor, create_descriptor and update_descriptor. An unchanged
+    descriptor is not sent again and returns the status code of the GET (200).
+    """
+    status_code, existing = client.get_descriptor(descriptor['id'])
+
+    if status_code == 404:
+        return client.create_descriptor(descriptor)
+    elif status_code != 200:
+        return status_code, existing
+    elif descriptors_equal(descriptor, existing):
+        return status_code, existing
+
+    return client.update_descriptor(descriptor)
@@ -0,0 +1,130 @@
+# Copyright: (c) 2024, Benjamin Goetz <benjamin.goetz@ipa.fraunhofer.de>
+# Apache 2.0
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import fcntl
+import hashlib
+import json
+import os
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.private_dir import ensure_private_dir, \
+        get_default_private_dir
+except ImportError:
+    from plugins.module_utils.private_dir import ensure_private_dir, get_default_private_dir
+
+DEFAULT_LIMITER_DIR = get_default_private_dir('slm-aas-limiter')
+
+# Seconds to wait before trying again to get a free in-flight slot:
+SLOT_POLL_INTERVAL = 0.01
+MAX_SLOT_POLL_INTERVAL = 0.25
+
+
+def get_limiter_argument_spec() -> dict:
+    return dict(
+        max_requests_per_second=dict(type='float', default=0),
+        max_in_flight=dict(type='int', default=0),
+        limiter_dir=dict(type='path', default=DEFAULT_LIMITER_DIR),
+    )
+
+
+def create_limiter(params):
+    if not params.get('max_requests_per_second') and not params.get('max_in_flight'):
+        return None
+    return RequestLimiter(
+        params['limiter_dir'],
+        params['max_requests_per_second'],
+        params['max_in_flight'],
+    )
+
+
+def get_endpoint(url) -> str:
+    parts = urlsplit(url)
+    return f'{parts.scheme}://{parts.netloc}'
+
+
+class RequestLimiter:
+    """Limits requests per second and requests in flight per endpoint (scheme, host and port).
+
+    The state is kept in lock files in 'limiter_dir', so the limits apply to all processes of the same user on the
+    same host that use the same directory, e.g. all forks running tasks delegated to the controller:
+    - requests per second: a token bucket (burst of one second) in a JSON file, updated under an exclusive lock
+    - requests in flight: 'max_in_flight' slot files, a request holds the lock of one slot while it is sent
+    Locks are released by the operating system if a process dies, so no slot is ever lost.
+    """
+
+    def __init__(self, limiter_dir=DEFAULT_LIMITER_DIR, max_requests_per_second=0, max_in_flight=0):
+        self.limiter_dir = limiter_dir
+        self.max_requests_per_second = max_requests_per_second or 0
+        self.max_in_flight = max_in_flight or 0
+        # A lock file planted by another user could block or slow down every request:
+        ensure_private_dir(limiter_dir)
+
+    def get_path(self, endpoint, suffix):
+        return os.path.join(self.limiter_dir, f'{hashlib.sha256(endpoint.encode("utf-8")).hexdigest()}.{suffix}')
+
+    def take_token(self, endpoint):
+        rate = self.max_requests_per_second
+        burst = max(rate, 1)
+
+        while True:
+            with open(self.get_path(endpoint, 'bucket'), 'a+') as fp:
+                fcntl.flock(fp, fcntl.LOCK_EX)
+                try:
+                    fp.seek(0)
+                    try:
+                        state = json.loads(fp.read())
+                    except ValueError:
+                        state = dict(tokens=burst, updated=time.time())
+
+                    now = time.time()
+                    tokens = min(burst, state['tokens'] + (now - state['updated']) * rate)
+                    if tokens >= 1:
+                        tokens -= 1
+                        wait = 0
+                    else:
+                        wait = (1 - tokens) / rate
+
+                    fp.seek(0)
+                    fp.truncate()
+                    fp.write(json.dumps(dict(tokens=tokens, updated=now)))
+                    fp.flush()
+                finally:
+                    fcntl.flock(fp, fcntl.LOCK_UN)
+
+            if wait == 0:
+                return
+            time.sleep(wait)
+
+    def acquire_slot(self, endpoint):
+        interval = SLOT_POLL_INTERVAL
+
+        while True:
+            for slot in range(self.max_in_flight):
+                fp = open(self.get_path(endpoint, f'slot{slot}'), 'a')
+                try:
+                    fcntl.flock(fp, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    return fp
+                except OSError:
+                    fp.close()
+
+            time.sleep(interval)
+            interval = min(interval * 2, MAX_SLOT_POLL_INTERVAL)
+
+    @contextmanager
+    def acquire(self, url):
+        endpoint = get_endpoint(url)
+
+        slot = self.acquire_slot(endpoint) if self.max_in_flight > 0 else None
+        try:
+            if self.max_requests_per_second > 0:
+                self.take_token(endpoint)
+            yield
+        finally:
+            if slot is not None:
+                fcntl.flock(slot, fcntl.LOCK_UN)
+                slot.close()
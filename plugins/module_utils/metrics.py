@@ -0,0 +1,155 @@
+# Copyright: (c) 2024, Benjamin Goetz <benjamin.goetz@ipa.fraunhofer.de>
+# Apache 2.0
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+try:
+    import resource
+    HAS_RESOURCE = True
+except ImportError:
+    HAS_RESOURCE = False
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.compression import get_wire_bytes
+except ImportError:
+    from plugins.module_utils.compression import get_wire_bytes
+
+SERVER_TIMING_DURATION = re.compile(r'dur=([0-9.]+)')
+
+
+def get_metrics_argument_spec() -> dict:
+    return dict(
+        metrics=dict(type='bool', default=False),
+    )
+
+
+def create_metrics(params):
+    if not params.get('metrics'):
+        return None
+    return Metrics()
+
+
+def measure(metrics, phase):
+    """Measures the enclosed block as 'phase' of 'metrics', does nothing without metrics."""
+    if metrics is None:
+        return nullcontext()
+    return metrics.measure(phase)
+
+
+def get_process_wall_time():
+    # Seconds since the process was started (start time in clock ticks since boot, Linux only):
+    try:
+        with open('/proc/self/stat') as fp:
+            start_ticks = int(fp.read().rsplit(')', 1)[1].split()[19])
+        return time.clock_gettime(time.CLOCK_BOOTTIME) - start_ticks / os.sysconf('SC_CLK_TCK')
+    except (OSError, AttributeError, IndexError, ValueError):
+        return None
+
+
+def get_peak_rss():
+    if not HAS_RESOURCE:
+        return None
+    # ru_maxrss is in KiB on Linux:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def get_bytes_sent(request) -> int:
+    try:
+        return len(request.body or b'')
+    except TypeError:
+        return 0
+
+
+def get_bytes_received(response) -> int:
+    # Streamed bodies are not read yet, only the announced size is known:
+    if not response._content_consumed:
+        return int(response.headers.get('Content-Length') or 0)
+    return get_wire_bytes(response)
+
+
+def get_server_time(response):
+    match = SERVER_TIMING_DURATION.search(response.headers.get('Server-Timing', ''))
+    return float(match.group(1)) / 1000 if match else None
+
+
+class Metrics:
+    """Wall and CPU time per phase and request counters of one module run.
+
+    Phase 'import' is the time from process start until the metrics are created (interpreter startup, imports and
+    argument parsing), 'network' the time spent sending requests and reading their responses (no CPU time, requests
+    may run in parallel) and 'total' the time from creating the metrics until as_dict().
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.phases = {'import': dict(wall=get_process_wall_time(), cpu=time.process_time())}
+        self.requests = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.retries = 0
+        self.cache_hits = 0
+        self.server_time = None
+
+    def add(self, phase, wall, cpu=None):
+        with self.lock:
+            entry = self.phases.setdefault(phase, dict(wall=0.0))
+            entry['wall'] += wall
+            if cpu is not None:
+                entry['cpu'] = entry.get('cpu', 0.0) + cpu
+
+    @contextmanager
+    def measure(self, phase):
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            self.add(phase, time.perf_counter() - wall, time.thread_time() - cpu)
+
+    def record_request(self, request, response, duration):
+        bytes_sent = get_bytes_sent(request)
+        bytes_received = get_bytes_received(response)
+        server_time = get_server_time(response)
+
+        self.add('network', duration)
+        with self.lock:
+            self.requests += 1
+            self.bytes_sent += bytes_sent
+            self.bytes_received += bytes_received
+            if server_time is not None:
+                self.server_time = (self.server_time or 0.0) + server_time
+
+    def record_retry(self):
+        with self.lock:
+            self.retries += 1
+
+    def record_cache_hit(self):
+        with self.lock:
+            self.cache_hits += 1
+
+    def as_dict(self) -> dict:
+        with self.lock:
+            phases = {
+                phase: {key: round(value, 6) if value is not None else None for key, value in entry.items()}
+                for phase, entry in self.phases.items()
+            }
+            phases['total'] = dict(
+                wall=round(time.perf_counter() - self.started, 6),
+                cpu=round(time.process_time() - self.phases['import']['cpu'], 6),
+            )
+            return dict(
+                phases=phases,
+                requests=self.requests,
+                bytes_sent=self.bytes_sent,
+                bytes_received=self.bytes_received,
+                retries=self.retries,
+                cache_hits=self.cache_hits,
+                server_time=round(self.server_time, 6) if self.server_time is not None else None,
+                peak_rss=get_peak_rss(),
+            )
@@ -0,0 +1,53 @@
+# Copyright: (c) 2024, Benjamin Goetz <benjamin.goetz@ipa.fraunhofer.de>
+# Apache 2.0
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+import uuid
+
+
+class MultipartFileStream:
+    """File-like multipart/form-data body with a single file field.
+
+    The file is read in chunks while the request is sent, instead of encoding the whole body in memory like the
+    'files' argument of requests does.
+    """
+
+    def __init__(self, fp, field_name, file_name, content_type='application/octet-stream'):
+        self.fp = fp
+        self.boundary = uuid.uuid4().hex
+        self.head = (
+            f'--{self.boundary}\r\n'
+            f'Content-Disposition: form-data; name="{field_name}"; filename="{file_name}"\r\n'
+            f'Content-Type: {content_type}\r\n\r\n'
+        ).encode('utf-8')
+        self.tail = f'\r\n--{self.boundary}--\r\n'.encode('utf-8')
+
+        self.fp.seek(0, os.SEEK_END)
+        self.file_size = self.fp.tell()
+        self.fp.seek(0)
+        self.position = 0
+
+    @property
+    def content_type(self) -> str:
+        return f'multipart/form-data; boundary={self.boundary}'
+
+    def __len__(self):
+        return len(self.head) + self.file_size + len(self.tail)
+
+    def read(self, size=-1) -> bytes:
+        if size is None or size < 0:
+            size = len(self) - self.position
+
+        chunk = b''
+        if self.position < len(self.head):
+            chunk += self.head[self.position:self.position + size]
+        if len(chunk) < size:
+            chunk += self.fp.read(size - len(chunk))
+        if len(chunk) < size:
+            tail_position = max(self.position + len(chunk) - len(self.head) - self.file_size, 0)
+            chunk += self.tail[tail_position:tail_position + size - len(chunk)]
+
+        self.position += len(chunk)
+        return chunk
@@ -0,0 +1,82 @@
+# Copyright: (c) 2024, Benjamin Goetz <benjamin.goetz@ipa.fraunhofer.de>
+# Apache 2.0
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+
+try:
+    import ijson
+    from ijson.common import ObjectBuilder
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
+
+DEFAULT_PAGE_SIZE = 100
+
+
+def get_paging_params(limit=None, cursor=None) -> dict:
+    params = dict()
+    if limit is not None:
+        params['limit'] = limit
+    if cursor:
+        params['cursor'] = cursor
+    return params
+
+
+def iter_page_stream(response, page):
+    """Yields the items of 'result' while the response body is still being read.
+
+    The cursor of the next page is stored in page['cursor'].
+    """
+    response.raw.decode_content = True
+    builder = None
+
+    for prefix, event, value in ijson.parse(response.raw, use_float=True):
+        if prefix == 'paging_metadata.cursor':
+            page['cursor'] = value
+        elif prefix == 'result.item' and builder is None:
+            if event not in ('start_map', 'start_array'):
+                yield value
+                continue
+            builder = ObjectBuilder()
+
+        if builder is not None:
+            builder.event(event, value)
+            if prefix == 'result.item' and event in ('end_map', 'end_array'):
+                yield builder.value
+                builder = None
+
+
+def iter_page(response, page):
+    content = json.loads(response.content)
+    page['cursor'] = content.get('paging_metadata', {}).get('cursor')
+    yield from content.get('result', [])
+
+
+def iter_paged(get, url, limit=DEFAULT_PAGE_SIZE, stream=False):
+    """Yields all items of a paged AAS API collection (e.g. '/submodels').
+
+    'get' is a requests compatible get function (requests.get or Session.get). Pages are requested with 'limit'
+    and followed via the cursor in 'paging_metadata' until the server returns no further cursor. With 'stream'
+    and ijson installed, items are parsed from the response stream instead of loading the whole page at once.
+    """
+    stream = stream and HAS_IJSON
+    cursor = None
+
+    while True:
+        page = dict(cursor=None)
+        response = get(url=url, params=get_paging_params(limit, cursor), stream=stream)
+        try:
+            response.raise_for_status()
+
+            if stream:
+                yield from iter_page_stream(response, page)
+            else:
+                yield from iter_page(response, page)
+        finally:
+            response.close()
+
+        if not page['cursor'] or page['cursor'] == cursor:
+            return
+        cursor = page['cursor']
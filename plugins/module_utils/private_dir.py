@@ -0,0 +1,44 @@
+# Copyright: (c) 2024, Benjamin Goetz <benjamin.goetz@ipa.fraunhofer.de>
+# Apache 2.0
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+import stat
+
+# Per-user directory Ansible itself uses for temporary files of the controller and remote hosts:
+PRIVATE_ROOT_DIR = os.path.join('~', '.ansible', 'tmp')
+
+
+def get_default_private_dir(name) -> str:
+    """Returns directory 'name' below ~/.ansible/tmp of the user running the module or plugin."""
+    return os.path.expanduser(os.path.join(PRIVATE_ROOT_DIR, name))
+
+
+def ensure_private_dir(path) -> str:
+    """Creates directory 'path' with mode 0700 if it does not exist yet and returns it.
+
+    Raises PermissionError if 'path' is owned by another user or writable by group or others, a directory
+    shared like this would let other users read and plant cached responses or lock files.
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+
+    status = os.stat(path)
+    if status.st_uid != os.getuid():
+        raise PermissionError(f'Refusing to use {path}, it is owned by uid {status.st_uid} and not by the current user')
+    if status.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        raise PermissionError(
+            f'Refusing to use {path}, it is writable by group or others (mode {oct(status.st_mode & 0o777)})'
+        )
+    return path
+
+
+def create_or_fail(module, factory, result):
+    """Returns factory(module.params), the module fails with 'result' if the private directory is refused.
+
+    'factory' is create_cache or create_limiter, both raise PermissionError for an unsafe directory.
+    """
+    try:
+        return factory(module.params)
+    except PermissionError as e:
+        module.fail_json(msg=str(e), **result)
@@ -0,0 +1,110 @@
+# Copyright: (c) 2024, Benjamin Goetz <benjamin.goetz@ipa.fraunhofer.de>
+# Apache 2.0
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import base64
+import json
+from json import JSONDecodeError
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.pagination import DEFAULT_PAGE_SIZE, get_paging_params, \
+        iter_paged
+except ImportError:
+    from plugins.module_utils.pagination import DEFAULT_PAGE_SIZE, get_paging_params, iter_paged
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.descriptor import register_descriptor
+except ImportError:
+    from plugins.module_utils.descriptor import register_descriptor
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.session import create_session
+except ImportError:
+    from plugins.module_utils.session import create_session
+
+
+class RegistryClient:
+    """Client of the descriptors at 'path' of a shell or submodel registry.
+
+    Clients of several services can share one 'session' (see create_session), otherwise each creates its own.
+    """
+    path = ''
+
+    def __init__(self, url, page_size=DEFAULT_PAGE_SIZE, cache=None, limiter=None, metrics=None, tracer=None,
+                 session=None):
+        self.url = url
+        self.page_size = page_size
+        if session is None:
+            session = create_session(cache=cache, limiter=limiter, metrics=metrics, tracer=tracer)
+        self.session = session
+
+    # region UTILS
+    def get_encrypted_id(self, decoded_id: str) -> str:
+        return base64.b64encode(bytes(decoded_id, 'utf-8')).decode('ascii')
+
+    def return_response(self, response):
+        try:
+            return response.status_code, json.loads(response.content)
+        except JSONDecodeError:
+            return response.status_code, ''
+    # endregion
+
+    # region CRUD
+    def get_descriptors(self, limit=None, cursor=None):
+        return self.return_response(
+            self.session.get(
+                url=f'{self.url}{self.path}',
+                params=get_paging_params(limit, cursor)
+            )
+        )
+
+    def iter_descriptors(self, page_size=None, stream=False):
+        return iter_paged(
+            self.session.get,
+            f'{self.url}{self.path}',
+            limit=page_size or self.page_size,
+            stream=stream
+        )
+
+    def get_descriptor(self, descriptor_id):
+        return self.return_response(
+            self.session.get(
+                url=f'{self.url}{self.path}/{self.get_encrypted_id(descriptor_id)}'
+            )
+        )
+
+    def create_descriptor(self, descriptor):
+        return self.return_response(
+            self.session.post(
+                url=f'{self.url}{self.path}',
+                json=descriptor
+            )
+        )
+
+    def update_descriptor(self, descriptor):
+        return self.return_response(
+            self.session.put(
+                url=f'{self.url}{self.path}/{self.get_encrypted_id(descriptor["id"])}',
+                json=descriptor
+            )
+        )
+
+    def register_descriptor(self, descriptor):
+        return register_descriptor(self, descriptor)
+
+    def delete_descriptor(self, descriptor_id):
+        return self.return_response(
+            self.session.delete(
+                url=f'{self.url}{self.path}/{self.get_encrypted_id(descriptor_id)}'
+            )
+        )
+    # endregion
+
+
+class ShellRegistryClient(RegistryClient):
+    path = '/shell-descriptors'
+
+
+class SubmodelRegistryClient(RegistryClient):
+    path = '/submodel-descriptors'
@@ -0,0 +1,146 @@
+# Copyright: (c) 2024, Benjamin Goetz <benjamin.goetz@ipa.fraunhofer.de>
+# Apache 2.0
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.cache import WRITE_METHODS, CacheEntry
+except ImportError:
+    from plugins.module_utils.cache import WRITE_METHODS, CacheEntry
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.metrics import get_bytes_received, get_bytes_sent, measure
+except ImportError:
+    from plugins.module_utils.metrics import get_bytes_received, get_bytes_sent, measure
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.aas_json import JSON_CONTENT_TYPE, encode_json
+except ImportError:
+    from plugins.module_utils.aas_json import JSON_CONTENT_TYPE, encode_json
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.tracing import SPAN_KIND_CLIENT
+except ImportError:
+    from plugins.module_utils.tracing import SPAN_KIND_CLIENT
+
+# Response headers kept in cache entries:
+CACHED_HEADERS = ('Content-Type', 'ETag')
+
+
+class AasSession(requests.Session):
+    """Session used by all clients of the collection.
+
+    With a 'cache', GET responses are served from the cache while fresh and revalidated via ETag once stale.
+    Writes through this session invalidate the cached resource, its parents and (except for POST) its children.
+    With a 'limiter', every request sent over the network first waits for the limiter of its endpoint.
+    With 'metrics', requests sent over the network and cache hits are recorded.
+    With a 'tracer', every request sent over the network is recorded as client span.
+    'json' bodies are encoded with encode_json().
+    """
+
+    def __init__(self, cache=None, limiter=None, metrics=None, tracer=None):
+        super().__init__()
+        self.cache = cache
+        self.limiter = limiter
+        self.metrics = metrics
+        self.tracer = tracer
+
+    def send(self, request, **kwargs):
+        if self.tracer is None:
+            return self.send_limited(request, **kwargs)
+
+        with self.tracer.span(f'{request.method} {urlsplit(request.url).path}', SPAN_KIND_CLIENT) as span:
+            span.set_attribute('http.request.method', request.method)
+            span.set_attribute('url.full', request.url)
+            span.set_attribute('http.request.body.size', get_bytes_sent(request))
+
+            response = self.send_limited(request, **kwargs)
+
+            span.set_attribute('http.response.status_code', response.status_code)
+            span.set_attribute('http.response.body.size', get_bytes_received(response))
+            if response.status_code >= 400:
+                span.set_error(response.reason or '')
+            return response
+
+    def send_limited(self, request, **kwargs):
+        start = time.perf_counter()
+        if self.limiter is None:
+            response = super().send(request, **kwargs)
+        else:
+            with self.limiter.acquire(request.url):
+                start = time.perf_counter()
+                response = super().send(request, **kwargs)
+
+        if self.metrics is not None:
+            self.metrics.record_request(request, response, time.perf_counter() - start)
+        return response
+
+    def request(self, method, url, *args, **kwargs):
+        method = method.upper()
+        if kwargs.get('json') is not None:
+            with measure(self.metrics, 'serialization'):
+                kwargs['data'] = encode_json(kwargs.pop('json'))
+            kwargs['headers'] = {'Content-Type': JSON_CONTENT_TYPE, **(kwargs.get('headers') or {})}
+
+        if self.cache is None or kwargs.get('stream'):
+            return super().request(method, url, *args, **kwargs)
+
+        if method in WRITE_METHODS:
+            response = super().request(method, url, *args, **kwargs)
+            self.cache.invalidate(url, method)
+            return response
+        elif method != 'GET':
+            return super().request(method, url, *args, **kwargs)
+
+        key = requests.Request(method, url, params=kwargs.get('params')).prepare().url
+        entry = self.cache.get(key)
+
+        if entry is not None and entry.is_fresh(self.cache.ttl):
+            if self.metrics is not None:
+                self.metrics.record_cache_hit()
+            return self.get_cached_response(key, entry)
+
+        if entry is not None and entry.etag:
+            headers = dict(kwargs.pop('headers', None) or {}, **{'If-None-Match': entry.etag})
+            response = super().request(method, url, *args, headers=headers, **kwargs)
+            if response.status_code == 304:
+                entry = CacheEntry(entry.status_code, entry.headers, entry.content)
+                self.cache.set(key, entry)
+                return self.get_cached_response(key, entry)
+        else:
+            response = super().request(method, url, *args, **kwargs)
+
+        if response.status_code == 200:
+            self.cache.set(key, CacheEntry(
+                response.status_code,
+                {header: response.headers[header] for header in CACHED_HEADERS if header in response.headers},
+                response.content
+            ))
+
+        return response
+
+    def get_cached_response(self, url, entry: CacheEntry):
+        response = requests.Response()
+        response.status_code = entry.status_code
+        response.headers = CaseInsensitiveDict(entry.headers)
+        response._content = entry.content
+        response._content_consumed = True
+        response.url = url
+        response.encoding = 'utf-8'
+        return response
+
+
+def create_session(pool_maxsize=1, pool_connections=1, cache=None, limiter=None, metrics=None,
+                   tracer=None) -> AasSession:
+    session = AasSession(cache, limiter, metrics, tracer)
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=max(pool_maxsize, 1))
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
@@ -0,0 +1,166 @@
+# Copyright: (c) 2024, Benjamin Goetz <benjamin.goetz@ipa.fraunhofer.de>
+# Apache 2.0
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.aas_json import encode_json, get_model_reference
+except ImportError:
+    from plugins.module_utils.aas_json import encode_json, get_model_reference
+
+SHARD_OF_EXTENSION = 'slm.aas.shardOf'
+SHARD_MANIFEST_EXTENSION = 'slm.aas.shardManifest'
+SHARDS_ID_SHORT = 'Shards'
+SHARD_SUBMODEL_ID_SHORT = 'Submodel'
+SHARD_ELEMENTS_ID_SHORT = 'Elements'
+
+# Keys of a submodel copied to its manifest and shards, the elements are split:
+SHARED_KEYS = ('semanticId', 'supplementalSemanticIds', 'administration', 'kind', 'category')
+
+
+def get_sharding_argument_spec() -> dict:
+    return dict(
+        shard_max_bytes=dict(type='int', default=0),
+    )
+
+
+def get_shard_id(sm_id: str, index: int) -> str:
+    return f'{sm_id}/shards/{index}'
+
+
+def get_extension(name, value) -> dict:
+    return dict(name=name, valueType='xs:string', value=str(value))
+
+
+def get_extension_value(submodel, name):
+    for extension in submodel.get('extensions') or []:
+        if extension.get('name') == name:
+            return extension.get('value')
+    return None
+
+
+def is_manifest(submodel) -> bool:
+    return get_extension_value(submodel, SHARD_MANIFEST_EXTENSION) == 'true'
+
+
+def group_elements(elements, sizes, max_bytes) -> list:
+    """Splits top-level elements into consecutive groups of at most 'max_bytes' (sum of their encoded 'sizes').
+
+    An element larger than 'max_bytes' forms a group of its own, elements are never split.
+    """
+    groups = []
+    group, group_bytes = [], 0
+    for element, size in zip(elements, sizes):
+        if group and group_bytes + size > max_bytes:
+            groups.append(group)
+            group, group_bytes = [], 0
+        group.append(element)
+        group_bytes += size
+    if group:
+        groups.append(group)
+    return groups
+
+
+def get_shard(submodel, index, elements) -> dict:
+    shard = {key: submodel[key] for key in SHARED_KEYS if key in submodel}
+    shard.update(
+        modelType='Submodel',
+        id=get_shard_id(submodel['id'], index),
+        extensions=[get_extension(SHARD_OF_EXTENSION, submodel['id'])],
+        submodelElements=elements,
+    )
+    if submodel.get('idShort'):
+        shard['idShort'] = f'{submodel["idShort"]}_shard{index}'
+    return shard
+
+
+def get_manifest(submodel, shards) -> dict:
+    """Submodel with the id of the sharded submodel, listing its shards and the idShorts of their elements."""
+    manifest = {key: submodel[key] for key in SHARED_KEYS + ('idShort',) if key in submodel}
+    manifest.update(
+        modelType='Submodel',
+        id=submodel['id'],
+        extensions=(submodel.get('extensions') or []) + [get_extension(SHARD_MANIFEST_EXTENSION, 'true')],
+        submodelElements=[dict(
+            modelType='SubmodelElementList',
+            idShort=SHARDS_ID_SHORT,
+            typeValueListElement='SubmodelElementCollection',
+            value=[
+                dict(modelType='SubmodelElementCollection', value=[
+                    dict(
+                        modelType='ReferenceElement',
+                        idShort=SHARD_SUBMODEL_ID_SHORT,
+                        value=get_model_reference(shard['id']),
+                    ),
+                    dict(
+                        modelType='SubmodelElementList',
+                        idShort=SHARD_ELEMENTS_ID_SHORT,
+                        typeValueListElement='Property',
+                        valueTypeListElement='xs:string',
+                        value=[
+                            dict(modelType='Property', valueType='xs:string', value=element.get('idShort'))
+                            for element in shard['submodelElements']
+                        ],
+                    ),
+                ])
+                for shard in shards
+            ],
+        )],
+    )
+    return manifest
+
+
+def shard_submodel(submodel, max_bytes) -> list:
+    """Returns the manifest and shards of 'submodel', or only 'submodel' if it needs no sharding.
+
+    A submodel is sharded if its elements exceed 'max_bytes' (encoded JSON) and there is more than one top-level
+    element. Each shard gets consecutive top-level elements up to 'max_bytes'. The manifest keeps the id of the
+    submodel, so references to it stay valid, and lists the shards with the idShorts of their elements.
+    """
+    elements = submodel.get('submodelElements') or []
+    if not max_bytes or len(elements) < 2:
+        return [submodel]
+
+    sizes = [len(encode_json(element)) for element in elements]
+    if sum(sizes) <= max_bytes:
+        return [submodel]
+
+    shards = [
+        get_shard(submodel, index, group)
+        for index, group in enumerate(group_elements(elements, sizes, max_bytes))
+    ]
+    return [get_manifest(submodel, shards)] + shards
+
+
+def get_manifest_shards(manifest) -> list:
+    """Returns (shard id, idShorts of its elements) for each shard listed in 'manifest'."""
+    result = []
+    for element in manifest.get('submodelElements') or []:
+        if element.get('idShort') != SHARDS_ID_SHORT:
+            continue
+        for shard in element.get('value') or []:
+            values = {value.get('idShort'): value for value in shard.get('value') or []}
+            result.append((
+                values[SHARD_SUBMODEL_ID_SHORT]['value']['keys'][0]['value'],
+                [item.get('value') for item in values[SHARD_ELEMENTS_ID_SHORT].get('value') or []],
+            ))
+    return result
+
+
+def merge_shards(manifest, shards) -> dict:
+    """Reassembles the sharded submodel of 'manifest' from its 'shards' (submodels in any order)."""
+    shards_by_id = {shard['id']: shard for shard in shards}
+
+    submodel = {key: value for key, value in manifest.items() if key not in ('extensions', 'submodelElements')}
+    extensions = [
+        extension for extension in manifest.get('extensions') or []
+        if extension.get('name') != SHARD_MANIFEST_EXTENSION
+    ]
+    if extensions:
+        submodel['extensions'] = extensions
+    submodel['submodelElements'] = [
+        element
+        for shard_id, id_shorts in get_manifest_shards(manifest)
+        for element in shards_by_id[shard_id].get('submodelElements') or []
+    ]
+    return submodel
@@ -0,0 +1,236 @@
+# Copyright: (c) 2024, Benjamin Goetz <benjamin.goetz@ipa.fraunhofer.de>
+# Apache 2.0
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import base64
+import json
+from concurrent.futures import ThreadPoolExecutor
+from json import JSONDecodeError
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.pagination import DEFAULT_PAGE_SIZE, get_paging_params, \
+        iter_paged
+except ImportError:
+    from plugins.module_utils.pagination import DEFAULT_PAGE_SIZE, get_paging_params, iter_paged
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.session import create_session
+except ImportError:
+    from plugins.module_utils.session import create_session
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.aas_json import is_basyx_instance, to_json_dict
+except ImportError:
+    from plugins.module_utils.aas_json import is_basyx_instance, to_json_dict
+
+
+class ShellRepoClient:
+    def __init__(self, url, page_size=DEFAULT_PAGE_SIZE, max_workers=4, cache=None, limiter=None, metrics=None,
+                 tracer=None, session=None):
+        self.url = url
+        self.page_size = page_size
+        self.max_workers = max_workers
+        if session is None:
+            session = create_session(
+                pool_maxsize=max_workers, cache=cache, limiter=limiter, metrics=metrics, tracer=tracer
+            )
+        self.session = session
+
+    # region UTILS
+    def return_response(self, response):
+        try:
+            return response.status_code, json.loads(response.content)
+        except JSONDecodeError:
+            return response.status_code, ''
+
+    def cast_to_dict(self, value) -> dict:
+        return to_json_dict(value)
+
+    def get_encrypted_id(self, decoded_id: str) -> str:
+        return base64.b64encode(bytes(decoded_id, 'utf-8')).decode('ascii')
+
+    def sm_id_exists_in_keys(self, sm_id, submodel_ref):
+        return any(sm_id == key['value'] for key in submodel_ref['keys'])
+
+    def get_sm_id_from_reference(self, submodel_reference) -> str:
+        if is_basyx_instance(submodel_reference, 'ModelReference'):
+            submodel_reference = self.cast_to_dict(submodel_reference)
+        return submodel_reference['keys'][0]['value']
+
+    def run_concurrently(self, function, items, max_workers=None):
+        if max_workers is None:
+            max_workers = self.max_workers
+
+        with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+            return list(executor.map(function, items))
+    # endregion
+
+    # region CRUD
+    def get_shells(self, limit=None, cursor=None):
+        path = '/shells'
+
+        return self.return_response(
+            self.session.get(
+                url=f'{self.url}{path}',
+                params=get_paging_params(limit, cursor)
+            )
+        )
+
+    def iter_shells(self, page_size=None, stream=False):
+        path = '/shells'
+
+        return iter_paged(
+            self.session.get,
+            f'{self.url}{path}',
+            limit=page_size or self.page_size,
+            stream=stream
+        )
+
+    def get_shell(self, shell_id):
+        path = f'/shells/{self.get_encrypted_id(shell_id)}'
+
+        return self.return_response(
+            self.session.get(
+                url=f'{self.url}{path}'
+            )
+        )
+
+    def get_submodel_references(self, shell_id):
+        path = f'/shells/{self.get_encrypted_id(shell_id)}/submodel-refs'
+
+        return self.return_response(
+            self.session.get(
+                url=f'{self.url}{path}'
+            )
+        )
+
+    def iter_submodel_references(self, shell_id, page_size=None):
+        path = f'/shells/{self.get_encrypted_id(shell_id)}/submodel-refs'
+
+        return iter_paged(
+            self.session.get,
+            f'{self.url}{path}',
+            limit=page_size or self.page_size
+        )
+
+    def get_submodel_reference_ids(self, shell_id) -> set:
+        return {
+            key['value']
+            for submodel_ref in self.iter_submodel_references(shell_id)
+            for key in submodel_ref['keys']
+        }
+
+    def create_shell(self, shell):
+        path = '/shells'
+
+        # basyx shells are encoded by the session without casting them to a dict first:
+        return self.return_response(
+            self.session.post(
+                url=f'{self.url}{path}',
+                json=shell
+            )
+        )
+
+    def update_shell(self, shell):
+        shell = self.cast_to_dict(shell) if is_basyx_instance(shell, 'AssetAdministrationShell') else shell
+        path = f'/shells/{self.get_encrypted_id(shell["id"])}'
+
+        return self.return_response(
+            self.session.put(
+                url=f'{self.url}{path}',
+                json=shell
+            )
+        )
+
+    def delete_shell(self, shell_id):
+        path = f'/shells/{self.get_encrypted_id(shell_id)}'
+
+        return self.return_response(
+            self.session.delete(
+                url=f'{self.url}{path}'
+            )
+        )
+
+    def add_submodel_reference(self, shell_id, submodel_reference):
+        path = f'/shells/{self.get_encrypted_id(shell_id)}/submodel-refs'
+
+        if is_basyx_instance(submodel_reference, 'ModelReference'):
+            submodel_reference = self.cast_to_dict(submodel_reference)
+
+        code, shell = self.get_shell(shell_id)
+        if shell is not None and 'submodels' in shell:
+            sm_id_to_be_created = submodel_reference['keys'][0]['value']
+            if any(self.sm_id_exists_in_keys(sm_id_to_be_created, submodel) for submodel in shell['submodels']):
+                return 200, submodel_reference
+
+        return self.return_response(
+            self.session.post(
+                url=f'{self.url}{path}',
+                json=submodel_reference
+            )
+        )
+
+    def add_submodel_references(self, shell_id, submodel_references, max_workers=None):
+        path = f'/shells/{self.get_encrypted_id(shell_id)}/submodel-refs'
+
+        submodel_references = [
+            self.cast_to_dict(submodel_reference) if is_basyx_instance(submodel_reference, 'ModelReference')
+            else submodel_reference
+            for submodel_reference in submodel_references
+        ]
+
+        # Fetch the existing references once and only post the missing ones:
+        existing_sm_ids = self.get_submodel_reference_ids(shell_id)
+        missing = dict()
+        for submodel_reference in submodel_references:
+            sm_id = self.get_sm_id_from_reference(submodel_reference)
+            if sm_id not in existing_sm_ids:
+                missing.setdefault(sm_id, submodel_reference)
+
+        responses = dict(zip(
+            missing.keys(),
+            self.run_concurrently(
+                lambda submodel_reference: self.return_response(
+                    self.session.post(
+                        url=f'{self.url}{path}',
+                        json=submodel_reference
+                    )
+                ),
+                missing.values(),
+                max_workers
+            )
+        ))
+
+        # Each missing reference is posted once, references given more than once get the result of that post:
+        return [
+            responses.get(self.get_sm_id_from_reference(submodel_reference), (200, submodel_reference))
+            for submodel_reference in submodel_references
+        ]
+
+    def delete_submodel_reference(self, shell_id, submodel_id):
+        path = f'/shells/{self.get_encrypted_id(shell_id)}/submodel-refs/{self.get_encrypted_id(submodel_id)}'
+
+        return self.return_response(
+            self.session.delete(
+                url=f'{self.url}{path}'
+            )
+        )
+
+    def delete_submodel_references(self, shell_id, submodel_ids, max_workers=None):
+        # Fetch the existing references once and only delete the ones still present:
+        existing_sm_ids = self.get_submodel_reference_ids(shell_id)
+        present = list(dict.fromkeys(sm_id for sm_id in submodel_ids if sm_id in existing_sm_ids))
+
+        responses = dict(zip(
+            present,
+            self.run_concurrently(
+                lambda sm_id: self.delete_submodel_reference(shell_id, sm_id),
+                present,
+                max_workers
+            )
+        ))
+
+        # Each id is deleted once, ids given more than once get the result of that deletion:
+        return [responses.get(sm_id, (404, '')) for sm_id in submodel_ids]
+    # endregion
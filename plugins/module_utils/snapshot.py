@@ -0,0 +1,43 @@
+# Copyright: (c) 2024, Benjamin Goetz <benjamin.goetz@ipa.fraunhofer.de>
+# Apache 2.0
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import gzip
+import json
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.aas_json import encode_json
+except ImportError:
+    from plugins.module_utils.aas_json import encode_json
+
+# Service and path of each collection in a snapshot, in the order they are restored:
+SNAPSHOT_COLLECTIONS = dict(
+    submodels=('repository', '/submodels'),
+    shells=('repository', '/shells'),
+    submodel_descriptors=('submodel_registry', '/submodel-descriptors'),
+    shell_descriptors=('shell_registry', '/shell-descriptors'),
+)
+
+
+def get_snapshot_line(collection: str, item) -> bytes:
+    # One JSON object per line, the collection it was exported from and the item itself:
+    return encode_json(dict(collection=collection, item=item)) + b'\n'
+
+
+def open_snapshot(path, mode='rb', compression_level=6):
+    """Opens snapshot file 'path', gzip compressed snapshots are detected by their magic number when reading."""
+    if 'w' in mode:
+        return gzip.open(path, mode, compresslevel=compression_level) if compression_level else open(path, mode)
+
+    with open(path, 'rb') as fp:
+        compressed = fp.read(2) == b'\x1f\x8b'
+    return gzip.open(path, mode) if compressed else open(path, mode)
+
+
+def iter_snapshot(fp):
+    """Yields (collection, item) of each line of the opened snapshot 'fp', one line at a time."""
+    for line in fp:
+        if line.strip():
+            entry = json.loads(line)
+            yield entry['collection'], entry['item']
@@ -0,0 +1,232 @@
+# Copyright: (c) 2024, Benjamin Goetz <benjamin.goetz@ipa.fraunhofer.de>
+# Apache 2.0
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import base64
+import json
+from concurrent.futures import ThreadPoolExecutor
+from json import JSONDecodeError
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.pagination import DEFAULT_PAGE_SIZE, get_paging_params, \
+        iter_paged
+except ImportError:
+    from plugins.module_utils.pagination import DEFAULT_PAGE_SIZE, get_paging_params, iter_paged
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.compression import ACCEPT_ENCODING, \
+        COMPRESSION_ENCODINGS, DEFAULT_COMPRESSION_THRESHOLD, \
+        TransferStats, compress, is_compression_rejected
+except ImportError:
+    from plugins.module_utils.compression import ACCEPT_ENCODING, \
+        COMPRESSION_ENCODINGS, DEFAULT_COMPRESSION_THRESHOLD, \
+        TransferStats, compress, is_compression_rejected
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.session import create_session
+except ImportError:
+    from plugins.module_utils.session import create_session
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.metrics import measure
+except ImportError:
+    from plugins.module_utils.metrics import measure
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.tracing import trace
+except ImportError:
+    from plugins.module_utils.tracing import trace
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.aas_json import JSON_CONTENT_TYPE, encode_json, \
+        get_model_reference
+except ImportError:
+    from plugins.module_utils.aas_json import JSON_CONTENT_TYPE, encode_json, get_model_reference
+
+
+class SmRepoClient:
+    def __init__(self, url, max_workers=4, page_size=DEFAULT_PAGE_SIZE,
+                 compression=None, compression_threshold=DEFAULT_COMPRESSION_THRESHOLD, cache=None, limiter=None,
+                 metrics=None, tracer=None, session=None):
+        if compression is not None and compression not in COMPRESSION_ENCODINGS:
+            raise ValueError(f'Unsupported compression: {compression}')
+
+        self.url = url
+        self.max_workers = max_workers
+        self.page_size = page_size
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+        self.transfer_stats = TransferStats()
+        self.metrics = metrics
+        self.tracer = tracer
+
+        # One pooled session per client, sized for the bulk upload thread pool, unless a shared 'session' is given:
+        if session is None:
+            session = create_session(
+                pool_maxsize=max_workers, cache=cache, limiter=limiter, metrics=metrics, tracer=tracer
+            )
+        self.session = session
+        self.session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+
+    # region UTILS:
+    def encode(self, submodel) -> bytes:
+        with measure(self.metrics, 'serialization'):
+            return encode_json(submodel)
+
+    def get_sm_id(self, submodel) -> str:
+        return submodel['id'] if isinstance(submodel, dict) else submodel.id
+
+    def get_encrypted_sm_id_from_submodel(self, submodel) -> str:
+        return self.get_encrypted_sm_id_from_id(self.get_sm_id(submodel))
+
+    def get_encrypted_sm_id_from_id(self, sm_id: str) -> str:
+        return base64.b64encode(bytes(sm_id, 'utf-8')).decode('ascii')
+
+    def return_response(self, response):
+        try:
+            return response.status_code, json.loads(response.content)
+        except JSONDecodeError:
+            return response.status_code, ''
+
+    def send_json(self, method, url, body: bytes):
+        # 'body' is encoded once by the caller and sent as it is, also on retries:
+        headers = {'Content-Type': JSON_CONTENT_TYPE}
+
+        encoding = self.compression
+        if encoding is None or len(body) < self.compression_threshold:
+            response = self.session.request(method, url, data=body, headers=headers)
+            self.transfer_stats.record(response, len(body), len(body))
+            return response
+
+        with measure(self.metrics, 'compression'):
+            data = compress(body, encoding)
+        response = self.session.request(method, url, data=data, headers={**headers, 'Content-Encoding': encoding})
+        self.transfer_stats.record(response, len(data), len(body))
+
+        if is_compression_rejected(response):
+            # Server does not accept the encoding, resend only this body uncompressed:
+            self.transfer_stats.record_fallback()
+            if self.metrics is not None:
+                self.metrics.record_retry()
+            with trace(self.tracer, 'retry', reason='compression rejected'):
+                response = self.session.request(method, url, data=body, headers=headers)
+            self.transfer_stats.record(response, len(body), len(body))
+
+        return response
+
+    # endregion
+
+    # region CRUD
+    def create(self, submodel, force=False):
+        path = '/submodels'
+
+        with trace(self.tracer, 'create_submodel', **{'aas.submodel.id': self.get_sm_id(submodel)}):
+            body = self.encode(submodel)
+            r = self.send_json(
+                'POST',
+                f'{self.url}{path}',
+                body,
+            )
+
+            if r.status_code == 409 and force:
+                return self.update(submodel, body)
+
+            return self.return_response(r)
+
+    def update(self, submodel, body=None):
+        path = f'/submodels/{self.get_encrypted_sm_id_from_submodel(submodel)}'
+
+        return self.return_response(
+            self.send_json(
+                'PUT',
+                f'{self.url}{path}',
+                body if body is not None else self.encode(submodel),
+            )
+        )
+
+    def create_many(self, submodels, force=False, max_workers=None):
+        if max_workers is None:
+            max_workers = self.max_workers
+
+        with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+            # map() keeps the order of 'submodels' and re-raises the first exception:
+            return list(executor.map(lambda submodel: self.create(submodel, force), submodels))
+
+    def get_all(self, limit=None, cursor=None):
+        path = '/submodels'
+
+        return self.return_response(
+            self.session.get(
+                url=f'{self.url}{path}',
+                params=get_paging_params(limit, cursor)
+            )
+        )
+
+    def iter_all(self, page_size=None, stream=False):
+        path = '/submodels'
+
+        return iter_paged(
+            self.session.get,
+            f'{self.url}{path}',
+            limit=page_size or self.page_size,
+            stream=stream
+        )
+
+    def get_one(self, sm_id: str):
+        path = f'/submodels/{self.get_encrypted_sm_id_from_id(sm_id)}'
+
+        return self.return_response(
+            self.session.get(
+                url=f'{self.url}{path}'
+            )
+        )
+
+    def get_metadata(self, sm_id: str):
+        path = f'/submodels/{self.get_encrypted_sm_id_from_id(sm_id)}/$metadata'
+
+        return self.return_response(
+            self.session.get(
+                url=f'{self.url}{path}'
+            )
+        )
+
+    def get_value(self, sm_id: str, level=None):
+        path = f'/submodels/{self.get_encrypted_sm_id_from_id(sm_id)}/$value'
+
+        return self.return_response(
+            self.session.get(
+                url=f'{self.url}{path}',
+                params=dict(level=level) if level else None
+            )
+        )
+
+    def delete(self, sm_id: str):
+        path = f'/submodels/{self.get_encrypted_sm_id_from_id(sm_id)}'
+
+        return self.return_response(
+            self.session.delete(
+                url=f'{self.url}{path}'
+            )
+        )
+    # endregion
+
+
+def get_reference(sm_id: str) -> dict:
+    return get_model_reference(sm_id)
+
+
+def get_submodel_descriptor(sm_repo_url: str, sm_id: str, sm_id_enc: str) -> dict:
+    sm_url = f'{sm_repo_url}/{sm_id_enc}'
+
+    return {
+        "id": sm_id,
+        "endpoints": [
+            {
+                "interface": "http",
+                "protocolInformation": {
+                    "href": sm_url
+                }
+            }
+        ]
+    }
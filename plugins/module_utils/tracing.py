@@ -0,0 +1,176 @@
+# Copyright: (c) 2024, Benjamin Goetz <benjamin.goetz@ipa.fraunhofer.de>
+# Apache 2.0
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import atexit
+import fcntl
+import json
+import os
+import re
+import socket
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+SERVICE_NAME = 'slm.aas'
+
+# Span kinds and status codes of the OpenTelemetry protocol (OTLP):
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_CLIENT = 3
+STATUS_CODE_OK = 1
+STATUS_CODE_ERROR = 2
+
+
+def get_tracing_argument_spec() -> dict:
+    return dict(
+        trace_dir=dict(type='path', default=None),
+        trace_host=dict(type='str', default=None),
+    )
+
+
+def create_tracer(params, name):
+    if not params.get('trace_dir'):
+        return None
+    return Tracer(params['trace_dir'], name, params.get('trace_host'))
+
+
+def trace(tracer, name, **attributes):
+    """Records the enclosed block as span 'name' of 'tracer', does nothing without tracer."""
+    if tracer is None:
+        return nullcontext()
+    return tracer.span(name, **attributes)
+
+
+def get_attribute_value(value) -> dict:
+    if isinstance(value, bool):
+        return dict(boolValue=value)
+    elif isinstance(value, int):
+        # int64 values are strings in OTLP JSON:
+        return dict(intValue=str(value))
+    elif isinstance(value, float):
+        return dict(doubleValue=value)
+    return dict(stringValue=str(value))
+
+
+class Span:
+    def __init__(self, trace_id, name, parent=None, kind=SPAN_KIND_INTERNAL, attributes=None):
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = parent.span_id if parent is not None else ''
+        self.name = name
+        self.kind = kind
+        self.attributes = dict(attributes or {})
+        self.status_code = STATUS_CODE_OK
+        self.status_message = ''
+        self.start_time = time.time_ns()
+        self.end_time = None
+
+    def set_attribute(self, key, value):
+        if value is not None:
+            self.attributes[key] = value
+
+    def set_error(self, message):
+        self.status_code = STATUS_CODE_ERROR
+        self.status_message = message
+
+    def end(self):
+        if self.end_time is None:
+            self.end_time = time.time_ns()
+
+    def as_dict(self) -> dict:
+        return dict(
+            traceId=self.trace_id,
+            spanId=self.span_id,
+            parentSpanId=self.parent_span_id,
+            name=self.name,
+            kind=self.kind,
+            startTimeUnixNano=str(self.start_time),
+            endTimeUnixNano=str(self.end_time),
+            attributes=[dict(key=key, value=get_attribute_value(value)) for key, value in self.attributes.items()],
+            status=dict(code=self.status_code, message=self.status_message),
+        )
+
+
+class Tracer:
+    """Records the spans of one module run and appends them to '<trace_dir>/<trace_host>.jsonl'.
+
+    Each line of the file is one OTLP JSON trace export (as written by the file exporter of the OpenTelemetry
+    collector), so the files can be loaded into a trace viewer without a collector. The spans are written when the
+    process exits, i.e. also if the module fails.
+    """
+
+    def __init__(self, trace_dir, name, trace_host=None):
+        self.trace_dir = trace_dir
+        self.trace_host = trace_host or socket.gethostname()
+        self.trace_id = os.urandom(16).hex()
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.spans = []
+        self.exported = False
+
+        self.root = Span(self.trace_id, name, attributes={'host.name': self.trace_host})
+        atexit.register(self.export)
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.trace_dir, re.sub(r'[^\w.-]', '_', self.trace_host) + '.jsonl')
+
+    def get_stack(self) -> list:
+        if not hasattr(self.local, 'stack'):
+            self.local.stack = []
+        return self.local.stack
+
+    def get_current_span(self) -> Span:
+        # Spans of worker threads without an open span are children of the root span:
+        stack = self.get_stack()
+        return stack[-1] if stack else self.root
+
+    @contextmanager
+    def span(self, name, kind=SPAN_KIND_INTERNAL, **attributes):
+        span = Span(self.trace_id, name, self.get_current_span(), kind, attributes)
+        stack = self.get_stack()
+        stack.append(span)
+        try:
+            yield span
+        except Exception as e:
+            span.set_error(f'{type(e).__name__}: {e}')
+            raise
+        finally:
+            stack.pop()
+            span.end()
+            with self.lock:
+                self.spans.append(span)
+
+    def as_dict(self) -> dict:
+        with self.lock:
+            spans = [self.root] + self.spans
+        return dict(resourceSpans=[dict(
+            resource=dict(attributes=[
+                dict(key='service.name', value=get_attribute_value(SERVICE_NAME)),
+                dict(key='host.name', value=get_attribute_value(self.trace_host)),
+            ]),
+            scopeSpans=[dict(
+                scope=dict(name=SERVICE_NAME),
+                spans=[span.as_dict() for span in spans],
+            )],
+        )])
+
+    def export(self):
+        if self.exported:
+            return
+        self.exported = True
+        self.root.end()
+
+        line = json.dumps(self.as_dict(), separators=(',', ':')) + '\n'
+        try:
+            os.makedirs(self.trace_dir, exist_ok=True)
+            with open(self.path, 'a') as fp:
+                # Forks of a play may write traces of the same host at the same time:
+                fcntl.flock(fp, fcntl.LOCK_EX)
+                try:
+                    fp.write(line)
+                finally:
+                    fcntl.flock(fp, fcntl.LOCK_UN)
+        except OSError:
+            pass
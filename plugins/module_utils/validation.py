@@ -0,0 +1,366 @@
+# Copyright: (c) 2024, Benjamin Goetz <benjamin.goetz@ipa.fraunhofer.de>
+# Apache 2.0
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import re
+
+DEFAULT_MAX_ERRORS = 20
+
+# Constraint AASd-002 of the metamodel (V3.0.1) as stated there, it requires at least two characters:
+ID_SHORT = re.compile(r'^[a-zA-Z][a-zA-Z0-9_-]*[a-zA-Z0-9_]+$')
+ID_SHORT_MAX_LENGTH = 128
+
+INTEGER = re.compile(r'^[+-]?[0-9]+$')
+DECIMAL = re.compile(r'^[+-]?(?:[0-9]+(?:\.[0-9]*)?|\.[0-9]+)$')
+DOUBLE = re.compile(r'^(?:[+-]?(?:[0-9]+(?:\.[0-9]*)?|\.[0-9]+)(?:[eE][+-]?[0-9]+)?|[+-]?INF|NaN)$')
+TIMEZONE = r'(?:Z|[+-][0-9]{2}:[0-9]{2})?'
+DATE = re.compile(rf'^-?[0-9]{{4,}}-[0-9]{{2}}-[0-9]{{2}}{TIMEZONE}$')
+TIME = re.compile(rf'^[0-9]{{2}}:[0-9]{{2}}:[0-9]{{2}}(?:\.[0-9]+)?{TIMEZONE}$')
+DATE_TIME = re.compile(rf'^-?[0-9]{{4,}}-[0-9]{{2}}-[0-9]{{2}}T[0-9]{{2}}:[0-9]{{2}}:[0-9]{{2}}(?:\.[0-9]+)?{TIMEZONE}$')
+BOOLEAN = re.compile(r'^(?:true|false|1|0)$')
+HEX_BINARY = re.compile(r'^(?:[0-9a-fA-F]{2})*$')
+
+# Bounds of the integer types, None is unbounded:
+INTEGER_RANGES = {
+    'xs:integer': (None, None),
+    'xs:long': (-2 ** 63, 2 ** 63 - 1),
+    'xs:int': (-2 ** 31, 2 ** 31 - 1),
+    'xs:short': (-2 ** 15, 2 ** 15 - 1),
+    'xs:byte': (-2 ** 7, 2 ** 7 - 1),
+    'xs:unsignedLong': (0, 2 ** 64 - 1),
+    'xs:unsignedInt': (0, 2 ** 32 - 1),
+    'xs:unsignedShort': (0, 2 ** 16 - 1),
+    'xs:unsignedByte': (0, 2 ** 8 - 1),
+    'xs:positiveInteger': (1, None),
+    'xs:nonNegativeInteger': (0, None),
+    'xs:negativeInteger': (None, -1),
+    'xs:nonPositiveInteger': (None, 0),
+}
+
+VALUE_PATTERNS = {
+    'xs:boolean': BOOLEAN,
+    'xs:decimal': DECIMAL,
+    'xs:double': DOUBLE,
+    'xs:float': DOUBLE,
+    'xs:date': DATE,
+    'xs:time': TIME,
+    'xs:dateTime': DATE_TIME,
+    'xs:hexBinary': HEX_BINARY,
+}
+
+DATA_TYPES = frozenset(list(INTEGER_RANGES) + list(VALUE_PATTERNS) + [
+    'xs:anyURI', 'xs:base64Binary', 'xs:duration', 'xs:gDay', 'xs:gMonth', 'xs:gMonthDay', 'xs:gYear',
+    'xs:gYearMonth', 'xs:string',
+])
+
+SUBMODEL_ELEMENT_TYPES = frozenset([
+    'AnnotatedRelationshipElement', 'BasicEventElement', 'Blob', 'Capability', 'Entity', 'File',
+    'MultiLanguageProperty', 'Operation', 'Property', 'Range', 'ReferenceElement', 'RelationshipElement',
+    'SubmodelElementCollection', 'SubmodelElementList',
+])
+DATA_ELEMENT_TYPES = frozenset([
+    'Blob', 'File', 'MultiLanguageProperty', 'Property', 'Range', 'ReferenceElement',
+])
+# 'typeValueListElement' may also name one of the abstract types:
+LIST_ELEMENT_TYPES = SUBMODEL_ELEMENT_TYPES | {'DataElement', 'EventElement', 'SubmodelElement'}
+ABSTRACT_LIST_ELEMENT_TYPES = {
+    'DataElement': DATA_ELEMENT_TYPES,
+    'EventElement': frozenset(['BasicEventElement']),
+    'SubmodelElement': SUBMODEL_ELEMENT_TYPES,
+}
+
+OPERATION_VARIABLES = ('inputVariables', 'outputVariables', 'inoutputVariables')
+
+
+def get_validation_argument_spec() -> dict:
+    return dict(
+        validate=dict(type='bool', default=False),
+    )
+
+
+def get_value_error(value, value_type):
+    """Returns why 'value' is no valid lexical value of 'value_type', or None."""
+    # YAML scalars of module arguments may be bools or numbers, they are checked in their lexical form:
+    if isinstance(value, bool):
+        value = 'true' if value else 'false'
+    value = str(value)
+
+    if value_type in INTEGER_RANGES:
+        if not INTEGER.match(value):
+            return f'{value!r} is no {value_type}'
+        minimum, maximum = INTEGER_RANGES[value_type]
+        number = int(value)
+        if (minimum is not None and number < minimum) or (maximum is not None and number > maximum):
+            return f'{value!r} is out of range of {value_type}'
+    elif value_type in VALUE_PATTERNS and not VALUE_PATTERNS[value_type].match(value):
+        return f'{value!r} is no {value_type}'
+    return None
+
+
+class TooManyErrors(Exception):
+    pass
+
+
+class Validator:
+    """Collects the errors of one AAS document (submodel or descriptor) in a single pass.
+
+    Validation stops after 'max_errors' errors, so the report of a large broken document stays short. Errors are
+    'path: message', where path is the JSON path of the offending value.
+    """
+
+    def __init__(self, max_errors=DEFAULT_MAX_ERRORS):
+        self.max_errors = max(max_errors, 1)
+        self.errors = []
+        self.truncated = False
+        self.element_validators = {
+            'AnnotatedRelationshipElement': self.validate_annotated_relationship_element,
+            'Entity': self.validate_entity,
+            'MultiLanguageProperty': self.validate_multi_language_property,
+            'Operation': self.validate_operation,
+            'Property': self.validate_property,
+            'Range': self.validate_range,
+            'SubmodelElementCollection': self.validate_submodel_element_collection,
+            'SubmodelElementList': self.validate_submodel_element_list,
+        }
+
+    def add(self, path, message):
+        if len(self.errors) >= self.max_errors:
+            self.truncated = True
+            raise TooManyErrors()
+        self.errors.append(f'{path}: {message}')
+
+    def get_errors(self) -> list:
+        if self.truncated:
+            return self.errors + [f'Validation stopped after {self.max_errors} errors']
+        return list(self.errors)
+
+    def run(self, validate, document) -> list:
+        try:
+            validate(document, '$')
+        except TooManyErrors:
+            pass
+        return self.get_errors()
+
+    # region COMMON
+    def check_object(self, value, path) -> bool:
+        if not isinstance(value, dict):
+            self.add(path, 'must be an object')
+            return False
+        return True
+
+    def check_list(self, value, path) -> bool:
+        if not isinstance(value, list):
+            self.add(path, 'must be a list')
+            return False
+        return True
+
+    def check_id(self, document, path):
+        if not isinstance(document.get('id'), str) or not document['id']:
+            self.add(f'{path}.id', 'is required and must be a non-empty string')
+
+    def check_id_short(self, id_short, path):
+        if not isinstance(id_short, str) or not ID_SHORT.match(id_short):
+            self.add(path, f'{id_short!r} is no valid idShort (a letter followed by at least one letter, digit, _ '
+                           f'or -, not ending with -)')
+        elif len(id_short) > ID_SHORT_MAX_LENGTH:
+            self.add(path, f'idShort is longer than {ID_SHORT_MAX_LENGTH} characters')
+
+    def check_value_type(self, value_type, path) -> bool:
+        if value_type not in DATA_TYPES:
+            self.add(path, f'{value_type!r} is no valid data type')
+            return False
+        return True
+
+    def check_value(self, value, value_type, path):
+        if value is None:
+            return
+        error = get_value_error(value, value_type)
+        if error is not None:
+            self.add(path, error)
+    # endregion
+
+    # region SUBMODEL
+    def validate_submodel(self, submodel, path):
+        if not self.check_object(submodel, path):
+            return
+        if submodel.get('modelType', 'Submodel') != 'Submodel':
+            self.add(f'{path}.modelType', f'must be Submodel, not {submodel["modelType"]!r}')
+        self.check_id(submodel, path)
+        if submodel.get('idShort') is not None:
+            self.check_id_short(submodel['idShort'], f'{path}.idShort')
+
+        # Elements still to check: (element, path, list element type or None if no list element):
+        stack = []
+        self.push_elements(stack, submodel.get('submodelElements'), f'{path}.submodelElements')
+        while stack:
+            self.validate_element(stack, *stack.pop())
+
+    def push_elements(self, stack, elements, path, list_element=None):
+        if elements is None or not self.check_list(elements, path):
+            return
+
+        id_shorts = set()
+        for index, element in enumerate(elements):
+            element_path = f'{path}[{index}]'
+            if list_element is None and isinstance(element, dict):
+                # Namespaces need unique idShorts (constraint AASd-022):
+                id_short = element.get('idShort')
+                if id_short is not None and id_short in id_shorts:
+                    self.add(f'{element_path}.idShort', f'duplicate idShort {id_short!r}')
+                id_shorts.add(id_short)
+            stack.append((element, element_path, list_element))
+
+        # Elements are popped from the end, reverse them to report errors in document order:
+        stack[len(stack) - len(elements):] = reversed(stack[len(stack) - len(elements):])
+
+    def validate_element(self, stack, element, path, list_element):
+        if not self.check_object(element, path):
+            return
+
+        model_type = element.get('modelType')
+        if model_type not in SUBMODEL_ELEMENT_TYPES:
+            self.add(f'{path}.modelType', f'{model_type!r} is no submodel element type')
+            return
+
+        if list_element is None:
+            if element.get('idShort') is None:
+                self.add(f'{path}.idShort', 'is required for elements which are not in a SubmodelElementList')
+            else:
+                self.check_id_short(element['idShort'], f'{path}.idShort')
+        else:
+            self.validate_list_element(element, path, list_element)
+
+        validate = self.element_validators.get(model_type)
+        if validate is not None:
+            validate(stack, element, path)
+
+    def validate_list_element(self, element, path, list_element):
+        type_value, value_type = list_element
+        if element.get('idShort') is not None:
+            # Constraint AASd-120:
+            self.add(f'{path}.idShort', 'must not be set for elements of a SubmodelElementList')
+
+        model_type = element['modelType']
+        if model_type not in ABSTRACT_LIST_ELEMENT_TYPES.get(type_value, {type_value}):
+            self.add(f'{path}.modelType', f'{model_type} does not match typeValueListElement {type_value}')
+        elif value_type is not None and model_type in ('Property', 'Range') \
+                and element.get('valueType') != value_type:
+            # Constraint AASd-109:
+            self.add(f'{path}.valueType', f'{element.get("valueType")!r} does not match valueTypeListElement '
+                                          f'{value_type}')
+
+    def validate_property(self, stack, element, path):
+        if self.check_value_type(element.get('valueType'), f'{path}.valueType'):
+            self.check_value(element.get('value'), element['valueType'], f'{path}.value')
+
+    def validate_range(self, stack, element, path):
+        if self.check_value_type(element.get('valueType'), f'{path}.valueType'):
+            self.check_value(element.get('min'), element['valueType'], f'{path}.min')
+            self.check_value(element.get('max'), element['valueType'], f'{path}.max')
+
+    def validate_multi_language_property(self, stack, element, path):
+        value = element.get('value')
+        if value is None or not self.check_list(value, f'{path}.value'):
+            return
+        for index, text in enumerate(value):
+            if not isinstance(text, dict) or not text.get('language') or not isinstance(text.get('text'), str):
+                self.add(f'{path}.value[{index}]', 'must be an object with language and text')
+
+    def validate_submodel_element_collection(self, stack, element, path):
+        self.push_elements(stack, element.get('value'), f'{path}.value')
+
+    def validate_submodel_element_list(self, stack, element, path):
+        type_value = element.get('typeValueListElement')
+        if type_value not in LIST_ELEMENT_TYPES:
+            self.add(f'{path}.typeValueListElement', f'{type_value!r} is no submodel element type')
+            return
+
+        value_type = element.get('valueTypeListElement')
+        if value_type is not None and not self.check_value_type(value_type, f'{path}.valueTypeListElement'):
+            return
+        self.push_elements(stack, element.get('value'), f'{path}.value', (type_value, value_type))
+
+    def validate_entity(self, stack, element, path):
+        if element.get('entityType') not in ('CoManagedEntity', 'SelfManagedEntity'):
+            self.add(f'{path}.entityType', f'{element.get("entityType")!r} is no entity type')
+        self.push_elements(stack, element.get('statements'), f'{path}.statements')
+
+    def validate_annotated_relationship_element(self, stack, element, path):
+        annotations = element.get('annotations')
+        if annotations is None or not self.check_list(annotations, f'{path}.annotations'):
+            return
+        for index, annotation in enumerate(annotations):
+            if isinstance(annotation, dict) and annotation.get('modelType') not in DATA_ELEMENT_TYPES:
+                self.add(f'{path}.annotations[{index}].modelType', 'annotations must be data elements')
+        self.push_elements(stack, annotations, f'{path}.annotations')
+
+    def validate_operation(self, stack, element, path):
+        for name in OPERATION_VARIABLES:
+            variables = element.get(name)
+            if variables is None or not self.check_list(variables, f'{path}.{name}'):
+                continue
+            for index, variable in enumerate(variables):
+                if not isinstance(variable, dict) or 'value' not in variable:
+                    self.add(f'{path}.{name}[{index}]', 'must be an object with value')
+                else:
+                    stack.append((variable['value'], f'{path}.{name}[{index}].value', None))
+    # endregion
+
+    # region DESCRIPTORS
+    def validate_endpoints(self, descriptor, path, required):
+        endpoints = descriptor.get('endpoints')
+        if endpoints is None or endpoints == []:
+            if required:
+                self.add(f'{path}.endpoints', 'at least one endpoint is required')
+            return
+        if not self.check_list(endpoints, f'{path}.endpoints'):
+            return
+
+        for index, endpoint in enumerate(endpoints):
+            endpoint_path = f'{path}.endpoints[{index}]'
+            if not self.check_object(endpoint, endpoint_path):
+                continue
+            if not isinstance(endpoint.get('interface'), str) or not endpoint['interface']:
+                self.add(f'{endpoint_path}.interface', 'is required')
+            protocol_information = endpoint.get('protocolInformation')
+            if not isinstance(protocol_information, dict) or not protocol_information.get('href'):
+                self.add(f'{endpoint_path}.protocolInformation.href', 'is required')
+
+    def validate_submodel_descriptor(self, descriptor, path):
+        if not self.check_object(descriptor, path):
+            return
+        self.check_id(descriptor, path)
+        if descriptor.get('idShort') is not None:
+            self.check_id_short(descriptor['idShort'], f'{path}.idShort')
+        self.validate_endpoints(descriptor, path, required=True)
+
+    def validate_aas_descriptor(self, descriptor, path):
+        if not self.check_object(descriptor, path):
+            return
+        self.check_id(descriptor, path)
+        if descriptor.get('idShort') is not None:
+            self.check_id_short(descriptor['idShort'], f'{path}.idShort')
+        self.validate_endpoints(descriptor, path, required=False)
+
+        submodel_descriptors = descriptor.get('submodelDescriptors')
+        if submodel_descriptors is None or not self.check_list(submodel_descriptors, f'{path}.submodelDescriptors'):
+            return
+        for index, submodel_descriptor in enumerate(submodel_descriptors):
+            self.validate_submodel_descriptor(submodel_descriptor, f'{path}.submodelDescriptors[{index}]')
+    # endregion
+
+
+def validate_submodel(submodel, max_errors=DEFAULT_MAX_ERRORS) -> list:
+    validator = Validator(max_errors)
+    return validator.run(validator.validate_submodel, submodel)
+
+
+def validate_aas_descriptor(descriptor, max_errors=DEFAULT_MAX_ERRORS) -> list:
+    validator = Validator(max_errors)
+    return validator.run(validator.validate_aas_descriptor, descriptor)
+
+
+def validate_submodel_descriptor(descriptor, max_errors=DEFAULT_MAX_ERRORS) -> list:
+    validator = Validator(max_errors)
+    return validator.run(validator.validate_submodel_descriptor, descriptor)
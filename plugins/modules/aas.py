@@ -42,10 +42,10 @@ options:
         description: The id of the Shell that shall be deleted
         required: false
         type: str
-# Specify this value according to your collection
-# in format of namespace.collection.doc_fragment_name
-# extends_documentation_fragment:
-#     - my_namespace.my_collection.my_doc_fragment_name
+extends_documentation_fragment:
+    - slm.aas.limiter
+    - slm.aas.metrics
+    - slm.aas.tracing
 
 author:
     - Benjamin Goetz (@ipa-big)
@@ -70,83 +70,44 @@ EXAMPLES = r'''
     shell_id: aas-shell-id
 '''
 
-RETURN = r''''''
+RETURN = r'''
+metrics:
+    description: Time per phase, request counters and peak RSS of the module, if 'metrics' is enabled.
+    type: dict
+    returned: when metrics is true
+'''
 try:
     from ansible.module_utils.basic import AnsibleModule
 except ModuleNotFoundError as e:
     print(e)
     print("Skip import of AnsibleModule (for Testing only)")
 
-import base64
-import json
-from json import JSONDecodeError
-
-import requests
-from basyx.aas.adapter.json import AASToJsonEncoder
-from basyx.aas.model import AssetAdministrationShell
-
-
-class ShellRepoClient:
-    def __init__(self, url):
-        self.url = url
-
-    # region UTILS
-    def return_response(self, response):
-        try:
-            return response.status_code, json.loads(response.content)
-        except JSONDecodeError:
-            return response.status_code, ''
-
-    def cast_to_dict(self, shell: AssetAdministrationShell) -> dict:
-        return json.loads(
-            json.dumps(shell, cls=AASToJsonEncoder)
-        )
-
-    def get_encrypted_id(self, decoded_id: str) -> str:
-        return base64.b64encode(bytes(decoded_id, 'utf-8')).decode('ascii')
-    # endregion
-
-    # region CRUD
-    def get_shells(self):
-        path = '/shells'
-
-        return self.return_response(
-            requests.get(
-                url=f'{self.url}{path}'
-            )
-        )
-
-    def get_shell(self, shell_id):
-        path = f'/shells/{self.get_encrypted_id(shell_id)}'
-
-        return self.return_response(
-            requests.get(
-                url=f'{self.url}{path}'
-            )
-        )
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.shell_repository import ShellRepoClient
+except ImportError:
+    from plugins.module_utils.shell_repository import ShellRepoClient
 
-    def create_shell(self, shell):
-        path = '/shells'
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.limiter import create_limiter, get_limiter_argument_spec
+except ImportError:
+    from plugins.module_utils.limiter import create_limiter, get_limiter_argument_spec
 
-        if isinstance(shell, AssetAdministrationShell):
-            shell = self.cast_to_dict(shell)
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.private_dir import create_or_fail
+except ImportError:
+    from plugins.module_utils.private_dir import create_or_fail
 
-        return self.return_response(
-            requests.post(
-                url=f'{self.url}{path}',
-                json=shell
-            )
-        )
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.metrics import create_metrics, get_metrics_argument_spec
+except ImportError:
+    from plugins.module_utils.metrics import create_metrics, get_metrics_argument_spec
 
-    def delete_shell(self, shell_id):
-        path = f'/shells/{self.get_encrypted_id(shell_id)}'
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.tracing import create_tracer, get_tracing_argument_spec
+except ImportError:
+    from plugins.module_utils.tracing import create_tracer, get_tracing_argument_spec
 
-        return self.return_response(
-            requests.delete(
-                url=f'{self.url}{path}'
-            )
-        )
-    # endregion
+import requests
 
 
 def run_module():
@@ -156,7 +117,10 @@ def run_module():
         port=dict(type='str', default='8081'),
         state=dict(type='str', choices=['present', 'absent'], default='present'),
         shell=dict(type='dict', required=False),
-        shell_id=dict(type='str', required=False)
+        shell_id=dict(type='str', required=False),
+        **get_limiter_argument_spec(),
+        **get_metrics_argument_spec(),
+        **get_tracing_argument_spec()
     )
 
     result = dict(
@@ -169,7 +133,14 @@ def run_module():
     )
 
     shell_repo_url = f'{module.params["scheme"]}://{module.params["host"]}:{module.params["port"]}'
-    client = ShellRepoClient(shell_repo_url)
+    metrics = create_metrics(module.params)
+    tracer = create_tracer(module.params, 'aas')
+    client = ShellRepoClient(
+        shell_repo_url,
+        limiter=create_or_fail(module, create_limiter, result),
+        metrics=metrics,
+        tracer=tracer
+    )
 
     try:
         if module.params['state'] == 'present':
@@ -185,6 +156,9 @@ def run_module():
     except requests.exceptions.ConnectionError as e:
         module.fail_json(msg=f'Failed to connect to {shell_repo_url}. {e}', **result)
 
+    if metrics is not None:
+        result['metrics'] = metrics.as_dict()
+
     module.exit_json(**result)
 
 
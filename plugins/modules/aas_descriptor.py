@@ -40,10 +40,19 @@ options:
     shell_id:
         description: shell id when descriptor shall be deleted
         type: str
-# Specify this value according to your collection
-# in format of namespace.collection.doc_fragment_name
-# extends_documentation_fragment:
-#     - my_namespace.my_collection.my_doc_fragment_name
+    update:
+        description:
+            - Fetch the registered descriptor first and compare it with 'aas_descriptor' (endpoint order is ignored)
+            - The descriptor is created if missing and only updated if it differs, otherwise nothing is written
+        required: false
+        type: bool
+        default: false
+extends_documentation_fragment:
+    - slm.aas.cache
+    - slm.aas.limiter
+    - slm.aas.metrics
+    - slm.aas.tracing
+    - slm.aas.validation
 
 author:
     - Benjamin Goetz (@ipa-big)
@@ -58,75 +67,69 @@ EXAMPLES = r'''
     port: 8080
     state: present
     aas_descriptor: {{ aas_descriptor }}
+
+- name: Register or update shell Descriptor only if it differs
+  slm.aas.aas_descriptor:
+    host: localhost
+    port: 8082
+    aas_descriptor: {{ aas_descriptor }}
+    update: true
 '''
 
-RETURN = r''''''
+RETURN = r'''
+validation_errors:
+    description: Errors of the invalid document (JSON path and message), if 'validate' is enabled.
+    type: list
+    elements: str
+    returned: when validation fails
+metrics:
+    description: Time per phase, request counters and peak RSS of the module, if 'metrics' is enabled.
+    type: dict
+    returned: when metrics is true
+'''
 try:
     from ansible.module_utils.basic import AnsibleModule
 except ModuleNotFoundError as e:
     print(e)
     print("Skip import of AnsibleModule (for Testing only)")
 
-import base64
-import json
-from json import JSONDecodeError
-
-import requests
-
-
-class SmRegistryClient:
-    def __init__(self, url):
-        self.url = url
-
-    # region UTILS
-    def get_encrypted_id(self, decoded_id: str) -> str:
-        return base64.b64encode(bytes(decoded_id, 'utf-8')).decode('ascii')
-
-    def return_response(self, response):
-        try:
-            return response.status_code, json.loads(response.content)
-        except JSONDecodeError:
-            return response.status_code, ''
-    # endregion
-
-    # region CRUD
-    def get_descriptors(self):
-        path = '/shell-descriptors'
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.registry import ShellRegistryClient as SmRegistryClient
+except ImportError:
+    from plugins.module_utils.registry import ShellRegistryClient as SmRegistryClient
 
-        return self.return_response(
-            requests.get(
-                url=f'{self.url}{path}'
-            )
-        )
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.cache import create_cache, get_cache_argument_spec
+except ImportError:
+    from plugins.module_utils.cache import create_cache, get_cache_argument_spec
 
-    def get_descriptor(self, shell_id):
-        path = f'/shell-descriptors/{self.get_encrypted_id(shell_id)}'
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.private_dir import create_or_fail
+except ImportError:
+    from plugins.module_utils.private_dir import create_or_fail
 
-        return self.return_response(
-            requests.get(
-                url=f'{self.url}{path}'
-            )
-        )
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.limiter import create_limiter, get_limiter_argument_spec
+except ImportError:
+    from plugins.module_utils.limiter import create_limiter, get_limiter_argument_spec
 
-    def create_descriptor(self, aas_descriptor):
-        path = '/shell-descriptors'
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.metrics import create_metrics, get_metrics_argument_spec
+except ImportError:
+    from plugins.module_utils.metrics import create_metrics, get_metrics_argument_spec
 
-        return self.return_response(
-            requests.post(
-                url=f'{self.url}{path}',
-                json=aas_descriptor
-            )
-        )
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.tracing import create_tracer, get_tracing_argument_spec
+except ImportError:
+    from plugins.module_utils.tracing import create_tracer, get_tracing_argument_spec
 
-    def delete_descriptor(self, shell_id):
-        path = f'/shell-descriptors/{self.get_encrypted_id(shell_id)}'
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.validation import get_validation_argument_spec, \
+        validate_aas_descriptor
+except ImportError:
+    from plugins.module_utils.validation import get_validation_argument_spec, validate_aas_descriptor
 
-        return self.return_response(
-            requests.delete(
-                url=f'{self.url}{path}'
-            )
-        )
-    # endregion
+import requests
 
 
 def run_module():
@@ -136,7 +139,13 @@ def run_module():
         port=dict(type='str', default='8082'),
         state=dict(type='str', choices=['present', 'absent'], default='present'),
         shell_id=dict(type='str'),
-        aas_descriptor=dict(type='dict')
+        aas_descriptor=dict(type='dict'),
+        update=dict(type='bool', default=False),
+        **get_cache_argument_spec(),
+        **get_limiter_argument_spec(),
+        **get_metrics_argument_spec(),
+        **get_tracing_argument_spec(),
+        **get_validation_argument_spec()
     )
 
     result = dict(
@@ -149,21 +158,46 @@ def run_module():
         required_if=[('state', 'present', ['aas_descriptor']), ('state', 'absent', ['shell_id'])],
     )
 
+    if module.params['state'] == 'present' and module.params['validate']:
+        validation_errors = validate_aas_descriptor(module.params['aas_descriptor'])
+        if validation_errors:
+            module.fail_json(
+                msg=f'AAS descriptor {module.params["aas_descriptor"].get("id")} is invalid. {validation_errors[0]}',
+                validation_errors=validation_errors,
+                **result
+            )
+
     sm_registry_url = f'{module.params["scheme"]}://{module.params["host"]}:{module.params["port"]}'
-    client = SmRegistryClient(sm_registry_url)
+    metrics = create_metrics(module.params)
+    tracer = create_tracer(module.params, 'aas_descriptor')
+    client = SmRegistryClient(
+        sm_registry_url,
+        cache=create_or_fail(module, create_cache, result),
+        limiter=create_or_fail(module, create_limiter, result),
+        metrics=metrics,
+        tracer=tracer
+    )
 
     try:
         if module.params['state'] == 'present':
-            status_code, content = client.create_descriptor(
-                aas_descriptor=module.params['aas_descriptor']
-            )
-            if status_code == 201:
+            if module.params['update']:
+                status_code, content = client.register_descriptor(
+                    module.params['aas_descriptor']
+                )
+            else:
+                status_code, content = client.create_descriptor(
+                    module.params['aas_descriptor']
+                )
+            if status_code in [201, 204]:
                 result['changed'] = True
         else:
             client.delete_descriptor(module.params['shell_id'])
     except requests.exceptions.ConnectionError as e:
         module.fail_json(msg=f'Failed to connect to {sm_registry_url}. {e}', **result)
 
+    if metrics is not None:
+        result['metrics'] = metrics.as_dict()
+
     module.exit_json(**result)
 
 
@@ -5,8 +5,6 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
-from email.policy import default
-
 DOCUMENTATION = r'''
 ---
 module: convert_to_sm
@@ -36,10 +34,17 @@ options:
         description: Add a ConceptDescription to the submodel
         required: true
         type: str
-# Specify this value according to your collection
-# in format of namespace.collection.doc_fragment_name
-# extends_documentation_fragment:
-#     - my_namespace.my_collection.my_doc_fragment_name
+    shard_max_bytes:
+        description:
+            - Shard the submodel if its elements are larger than this many bytes (encoded JSON), 0 disables sharding
+            - If sharded, 'submodel' is the manifest listing the shards and 'submodels' is returned with the
+              manifest and the shards, see the 'shard_max_bytes' option of M(slm.aas.submodel)
+        required: false
+        type: int
+        default: 0
+extends_documentation_fragment:
+    - slm.aas.metrics
+    - slm.aas.tracing
 
 author:
     - Benjamin Goetz (@ipa-big)
@@ -53,6 +58,18 @@ EXAMPLES = r'''
   slm.aas.convert_to_sm:
     facts: {{ ansible_facts }}
     id: submodel_id
+
+- name: Convert ansible facts to a submodel sharded into parts of up to 256 KB
+  slm.aas.convert_to_sm:
+    facts: {{ ansible_facts }}
+    id: submodel_id
+    shard_max_bytes: 262144
+  register: convert_result
+
+- name: Upload the manifest and shards
+  slm.aas.submodel:
+    host: localhost
+    submodels: "{{ convert_result.submodels | default([convert_result.submodel]) }}"
 '''
 
 RETURN = r'''
@@ -62,6 +79,15 @@ submodel:
     type: dict
     returned: always
     sample: 'hello world'
+submodels:
+    description: The manifest of the submodel followed by its shards.
+    type: list
+    elements: dict
+    returned: when the submodel was sharded
+metrics:
+    description: Time per phase and peak RSS of the module, if 'metrics' is enabled.
+    type: dict
+    returned: when metrics is true
 '''
 try:
     from ansible.module_utils.basic import AnsibleModule
@@ -69,218 +95,25 @@ except ModuleNotFoundError as e:
     print(e)
     print("Skip import of AnsibleModule (for Testing only)")
 
-import inspect
-import json
-import logging
-import re
-
-import basyx
-from basyx.aas import model
-from basyx.aas.adapter.json import AASToJsonEncoder
-from basyx.aas.model import Property, AASConstraintViolation
-from basyx.aas.model.datatypes import String
-
-logger = logging.getLogger(__name__)
-
-
-def get_id_short(id_short, level_key=''):
-    if id_short is None:
-        return id_short
-
-    if level_key is None:
-        level_key = ''
-
-    no_special_chars = re.sub('[^a-zA-Z0-9_]', '', id_short)
-    no_letter_at_start_pattern = re.compile('^[^a-zA-Z].*$')
-
-    # if id short has no letter as first char and level_key is defined:
-    if no_letter_at_start_pattern.match(no_special_chars) and len(level_key) > 0:
-        # append level key to idshort
-        return f'{level_key}_{no_special_chars}'
-    else:
-        # replace all chars not being a letter:
-        return re.sub(r'^[^a-zA-Z]*', '', no_special_chars)
-
-
-class PropertySetElement(Property):
-    def __key(self):
-        return self.id_short
-
-    def __hash__(self):
-        return hash(self.__key())
-
-    def __eq__(self, other):
-        return self.__key() == other.__key()
-
-    def get_property(self):
-        return Property(
-            id_short=self.id_short,
-            value=self.value,
-            value_type=self.value_type
-        )
-
-
-def process_dict(element_key, element_value):
-    logger.debug(f'{inspect.stack()[0][3]}: {element_key}, {element_value}')
-    smece = process_level(element_value, element_key)
-    element_key = get_id_short(element_key)
-    return model.SubmodelElementCollection(
-        id_short=element_key,
-        value=smece
-    )
-
-
-def convert_submodel_elements_to_string(submodel_elements):
-    casted_submodel_elements = []
-    for se in submodel_elements:
-        casted_submodel_elements.append(
-            process_property(None, str(se.value), '').get_property()
-        )
-
-    return casted_submodel_elements
-
-
-def create_submodel_element_list(id_short, submodel_elements):
-    try:
-        submodel_element_list = model.SubmodelElementList(
-            id_short=id_short,
-            value=submodel_elements,
-            type_value_list_element=type(submodel_elements[0]),
-            value_type_list_element=submodel_elements[0].value_type
-        )
-    except AASConstraintViolation as e:
-        if e.constraint_id == 109:
-            smele = convert_submodel_elements_to_string(submodel_elements)
-            submodel_element_list = model.SubmodelElementList(
-                id_short=id_short,
-                value=smele,
-                type_value_list_element=type(smele[0]),
-                value_type_list_element=smele[0].value_type
-            )
-        else:
-            raise e
-
-    return submodel_element_list
-
-
-def process_list(element_key, element_value):
-    logger.debug(f'{inspect.stack()[0][3]}: {element_key}, {element_value}')
-    smele = list(process_level(element_value, element_key))
-
-    if len(smele) > 0:
-        if isinstance(smele[0], model.SubmodelElementCollection):
-            return model.SubmodelElementList(
-                id_short=element_key,
-                value=smele,
-                type_value_list_element=type(smele[0])
-            )
-        else:
-            return create_submodel_element_list(
-                id_short=element_key,
-                submodel_elements=smele
-            )
-    else:
-        return model.SubmodelElementList(
-            id_short=element_key,
-            value=smele,
-            type_value_list_element=Property,
-            value_type_list_element=String
-        )
-
-
-def process_property(key, value, level_key) -> PropertySetElement:
-    logger.debug(f'{inspect.stack()[0][3]}: {key}, {value}')
-    try:
-        if isinstance(value, bool):
-            value_type = basyx.aas.model.datatypes.Boolean
-        elif isinstance(value, int):
-            value_type = basyx.aas.model.datatypes.Integer
-        elif isinstance(value, float):
-            value_type = basyx.aas.model.datatypes.Float
-        else:
-            value_type = basyx.aas.model.datatypes.String
-
-        id_short = get_id_short(key, level_key)
-
-        if id_short == '':
-            return None
-
-        prop = PropertySetElement(
-            id_short=id_short,
-            value_type=value_type,
-            value=value
-        )
-
-        return prop
-    except basyx.aas.model.base.AASConstraintViolation as e:
-        print(e)
-
-
-def process_level_element(element_key, element_value, level_key):
-    logger.debug(f'{inspect.stack()[0][3]}: {element_key}, {element_value}')
-    if isinstance(element_value, dict):
-        return process_dict(element_key, element_value)
-    elif isinstance(element_value, list):
-        return process_list(element_key, element_value)
-    else:
-        try:
-            return process_property(element_key, element_value, level_key)
-        except AttributeError as e:
-            print(e)
-
-
-def process_level(level_elements, level_key):
-    submodel_elements = set()
-    return_submodel_elements = []
-
-    # Process Lists:
-    if isinstance(level_elements, list):
-        for index, element_value in enumerate(level_elements):
-            element_key = None
-            level_element = process_level_element(element_key, element_value, level_key)
-            if level_element is not None:
-                if isinstance(level_element, PropertySetElement):
-                    submodel_element = level_element.get_property()
-                else:
-                    submodel_element = level_element
-                submodel_elements.add(submodel_element)
-    # Process Properties / Dicts:
-    else:
-        for element_key in level_elements:
-            element_value = level_elements[element_key]
-            submodel_element = process_level_element(element_key, element_value, level_key)
-            if submodel_element is not None:
-                submodel_elements.add(submodel_element)
-
-    # Convert PropertySetElement to Property:
-    for submodel_element in submodel_elements:
-        if isinstance(submodel_element, PropertySetElement):
-            return_submodel_elements.append(submodel_element.get_property())
-        else:
-            return_submodel_elements.append(submodel_element)
-
-    return return_submodel_elements
-
-
-def convert_to_submodel(sm_id, facts, semantic=None, sm_id_short=None):
-    submodel = model.Submodel(sm_id)
-
-    if sm_id_short is not None:
-        submodel.id_short = get_id_short(sm_id_short)
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.convert import convert_to_submodel
+except ImportError:
+    from plugins.module_utils.convert import convert_to_submodel
 
-    if semantic is not None:
-        submodel.semantic_id = model.ExternalReference(
-            (model.Key(
-                type_=model.KeyTypes.GLOBAL_REFERENCE,
-                value=semantic
-            ),)
-        )
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.metrics import create_metrics, get_metrics_argument_spec
+except ImportError:
+    from plugins.module_utils.metrics import create_metrics, get_metrics_argument_spec
 
-    submodel.submodel_element = process_level(facts, "")
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.sharding import get_sharding_argument_spec, shard_submodel
+except ImportError:
+    from plugins.module_utils.sharding import get_sharding_argument_spec, shard_submodel
 
-    return json.loads(
-        json.dumps(submodel, cls=AASToJsonEncoder)
-    )
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.tracing import create_tracer, get_tracing_argument_spec
+except ImportError:
+    from plugins.module_utils.tracing import create_tracer, get_tracing_argument_spec
 
 
 def run_module():
@@ -289,6 +122,9 @@ def run_module():
         id_short=dict(type='str', required=False),
         facts=dict(type='dict', required=True),
         semantic=dict(type='str', default=None),
+        **get_metrics_argument_spec(),
+        **get_tracing_argument_spec(),
+        **get_sharding_argument_spec()
     )
 
     result = dict(
@@ -301,12 +137,23 @@ def run_module():
         supports_check_mode=False
     )
 
-    result['submodel'] = convert_to_submodel(
+    metrics = create_metrics(module.params)
+    tracer = create_tracer(module.params, 'convert_to_sm')
+    submodel = convert_to_submodel(
         sm_id=module.params['id'],
         facts=module.params['facts'],
         semantic=module.params['semantic'],
-        sm_id_short=module.params['id_short']
+        sm_id_short=module.params['id_short'],
+        metrics=metrics,
+        tracer=tracer
     )
+    submodels = shard_submodel(submodel, module.params['shard_max_bytes'])
+    result['submodel'] = submodels[0]
+    if len(submodels) > 1:
+        result['submodels'] = submodels
+
+    if metrics is not None:
+        result['metrics'] = metrics.as_dict()
 
     module.exit_json(**result)
 
@@ -0,0 +1,402 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2024, Benjamin Goetz <benjamin.goetz@ipa.fraunhofer.de>
+# Apache 2.0
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: decommission
+
+short_description: Deletes shells with their submodels and descriptors in one step
+
+# If this is part of a collection, you need to use semantic versioning,
+# i.e. the version is of the form "2.5.0" and not "2.4".
+version_added: "1.0.0"
+
+description:
+    - The module is the counterpart of 'publish' and replaces separate 'aas', 'submodel', 'submodel_descriptor'
+      and 'aas_descriptor' calls with 'state: absent'.
+    - The submodel references of each shell are listed first (paged). Then the referenced submodels, their submodel
+      descriptors, the shell descriptor and the shell (with its references) are deleted concurrently over pooled
+      connections.
+    - Submodels which are also referenced by shells that are not decommissioned are kept with their descriptors,
+      unless 'delete_shared_submodels' is set. Finding them pages through all shells of the repository once.
+    - Resources which are already gone are counted as absent, so the module can be run again after a partial
+      failure. Supports check mode, which only lists the submodel references.
+
+options:
+    scheme:
+        description: Scheme of the connection urls
+        required: false
+        type: str
+        default: http
+    repository_host:
+        description: Hostname of the host which runs the submodel and shell repository
+        required: true
+        type: str
+    repository_port:
+        description: Port of the submodel and shell repository
+        required: false
+        type: str
+        default: 8081
+    shell_registry_host:
+        description: Hostname of the host which runs the shell registry (defaults to 'repository_host')
+        required: false
+        type: str
+    shell_registry_port:
+        description: Port of the shell registry
+        required: false
+        type: str
+        default: 8082
+    submodel_registry_host:
+        description: Hostname of the host which runs the submodel registry (defaults to 'repository_host')
+        required: false
+        type: str
+    submodel_registry_port:
+        description: Port of the submodel registry
+        required: false
+        type: str
+        default: 8083
+    shell_id:
+        description: The id of the shell that shall be deleted with its submodels and descriptors
+        required: false
+        type: str
+    shell_ids:
+        description: Ids of shells that shall be deleted with their submodels and descriptors (bulk mode)
+        required: false
+        type: list
+        elements: str
+    delete_submodels:
+        description: Delete the referenced submodels and their descriptors, otherwise only shells and shell descriptors
+        required: false
+        type: bool
+        default: true
+    delete_shared_submodels:
+        description: Also delete submodels which are referenced by shells that are not decommissioned
+        required: false
+        type: bool
+        default: false
+    concurrency:
+        description: Maximum number of parallel requests
+        required: false
+        type: int
+        default: 8
+    page_size:
+        description: Number of submodel references requested per page when listing a shell
+        required: false
+        type: int
+        default: 100
+extends_documentation_fragment:
+    - slm.aas.limiter
+    - slm.aas.metrics
+    - slm.aas.tracing
+
+author:
+    - Benjamin Goetz (@ipa-big)
+'''
+
+EXAMPLES = r'''
+- name: Decommission the shell of a host
+  slm.aas.decommission:
+    repository_host: localhost
+    shell_id: "{{ shell.id }}"
+
+- name: Decommission the shells of all removed hosts at once
+  slm.aas.decommission:
+    repository_host: localhost
+    shell_ids: "{{ removed_hosts | map('extract', hostvars, ['shell', 'id']) }}"
+    concurrency: 16
+'''
+
+RETURN = r'''
+submodel_ids:
+    description: Ids of the submodels referenced by each shell, shells which do not exist have none.
+    type: dict
+    returned: always
+shared_submodel_ids:
+    description: Ids of the kept submodels, which are referenced by shells that are not decommissioned.
+    type: list
+    returned: always
+counts:
+    description: Number of deleted, absent (already gone) and failed resources.
+    type: dict
+    returned: always
+failures:
+    description: Deletions that did not succeed (id, target, status_code).
+    type: list
+    returned: always
+metrics:
+    description: Time per phase, request counters and peak RSS of the module, if 'metrics' is enabled.
+    type: dict
+    returned: when metrics is true
+'''
+try:
+    from ansible.module_utils.basic import AnsibleModule
+except ModuleNotFoundError as e:
+    print(e)
+    print("Skip import of AnsibleModule (for Testing only)")
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.pagination import DEFAULT_PAGE_SIZE
+except ImportError:
+    from plugins.module_utils.pagination import DEFAULT_PAGE_SIZE
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.submodel_repository import SmRepoClient
+except ImportError:
+    from plugins.module_utils.submodel_repository import SmRepoClient
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.shell_repository import ShellRepoClient
+except ImportError:
+    from plugins.module_utils.shell_repository import ShellRepoClient
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.registry import ShellRegistryClient, SubmodelRegistryClient
+except ImportError:
+    from plugins.module_utils.registry import ShellRegistryClient, SubmodelRegistryClient
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.session import create_session
+except ImportError:
+    from plugins.module_utils.session import create_session
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.limiter import create_limiter, get_limiter_argument_spec
+except ImportError:
+    from plugins.module_utils.limiter import create_limiter, get_limiter_argument_spec
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.private_dir import create_or_fail
+except ImportError:
+    from plugins.module_utils.private_dir import create_or_fail
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.metrics import create_metrics, get_metrics_argument_spec
+except ImportError:
+    from plugins.module_utils.metrics import create_metrics, get_metrics_argument_spec
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.tracing import create_tracer, get_tracing_argument_spec
+except ImportError:
+    from plugins.module_utils.tracing import create_tracer, get_tracing_argument_spec
+
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+DELETED_STATUS_CODES = [200, 204]
+ABSENT_STATUS_CODES = [404]
+
+
+class DecommissionClient:
+    """Composes the clients of the repository and the registries, all of them share one session."""
+
+    def __init__(self, repository_url, shell_registry_url, submodel_registry_url, max_workers=8,
+                 page_size=DEFAULT_PAGE_SIZE, limiter=None, metrics=None, tracer=None):
+        self.max_workers = max_workers
+
+        # One session for all services, with a connection pool per host:
+        self.session = create_session(
+            pool_maxsize=max_workers, pool_connections=3, limiter=limiter, metrics=metrics, tracer=tracer
+        )
+
+        self.submodel_repository = SmRepoClient(
+            repository_url, max_workers=max_workers, page_size=page_size, session=self.session
+        )
+        self.shell_repository = ShellRepoClient(
+            repository_url, page_size=page_size, max_workers=max_workers, session=self.session
+        )
+        self.shell_registry = ShellRegistryClient(shell_registry_url, page_size=page_size, session=self.session)
+        self.submodel_registry = SubmodelRegistryClient(
+            submodel_registry_url, page_size=page_size, session=self.session
+        )
+
+        # Deletion of each kind of resource:
+        self.targets = dict(
+            submodel=self.submodel_repository.delete,
+            submodel_descriptor=self.submodel_registry.delete_descriptor,
+            shell_descriptor=self.shell_registry.delete_descriptor,
+            shell=self.shell_repository.delete_shell,
+        )
+
+    # region DELETION
+    def get_submodel_ids(self, shell_id):
+        """Returns the ids of the submodels referenced by shell 'shell_id', or None if the shell does not exist."""
+        try:
+            return list(dict.fromkeys(
+                key['value']
+                for reference in self.shell_repository.iter_submodel_references(shell_id)
+                for key in reference['keys'] if key['type'] == 'Submodel'
+            ))
+        except requests.exceptions.HTTPError as e:
+            if e.response is not None and e.response.status_code in ABSENT_STATUS_CODES:
+                return None
+            raise
+
+    def get_shared_submodel_ids(self, submodel_ids) -> list:
+        """Returns the ids of 'submodel_ids' (shell id -> ids) which are referenced by other shells as well."""
+        sm_ids = {sm_id for ids in submodel_ids.values() for sm_id in ids or []}
+        if not sm_ids:
+            return []
+
+        shared = set()
+        for shell in self.shell_repository.iter_shells():
+            if shell['id'] in submodel_ids:
+                continue
+            shared.update(
+                key['value']
+                for reference in shell.get('submodels') or []
+                for key in reference['keys'] if key['type'] == 'Submodel' and key['value'] in sm_ids
+            )
+        return sorted(shared)
+
+    def delete(self, target, item_id) -> dict:
+        status_code, content = self.targets[target](item_id)
+
+        return dict(
+            id=item_id,
+            target=target,
+            status_code=status_code
+        )
+
+    def get_operations(self, submodel_ids, delete_submodels=True, kept_submodel_ids=()) -> list:
+        """Returns (target, id) of everything that is deleted for the shells in 'submodel_ids' (shell id -> ids)."""
+        operations = []
+        for shell_id, sm_ids in submodel_ids.items():
+            if delete_submodels:
+                sm_ids = [sm_id for sm_id in sm_ids or [] if sm_id not in kept_submodel_ids]
+                operations += [('submodel', sm_id) for sm_id in sm_ids]
+                operations += [('submodel_descriptor', sm_id) for sm_id in sm_ids]
+            operations += [('shell_descriptor', shell_id), ('shell', shell_id)]
+
+        # Submodels referenced by more than one of the shells are deleted once:
+        return list(dict.fromkeys(operations))
+
+    def decommission(self, shell_ids, delete_submodels=True, delete_shared_submodels=False, dry_run=False):
+        """Deletes shells 'shell_ids' with their submodels and descriptors.
+
+        Returns the submodel ids per shell, the results of the deletions and the ids of the kept submodels, which
+        other shells reference as well (unless 'delete_shared_submodels'). The submodel references of all shells
+        are listed before anything is deleted, the deletions of all shells are sent concurrently. With 'dry_run'
+        nothing is deleted.
+        """
+        shell_ids = list(dict.fromkeys(shell_ids))
+
+        with ThreadPoolExecutor(max_workers=max(self.max_workers, 1)) as executor:
+            submodel_ids = dict(zip(shell_ids, executor.map(self.get_submodel_ids, shell_ids)))
+            shared_submodel_ids = []
+            if delete_submodels and not delete_shared_submodels:
+                shared_submodel_ids = self.get_shared_submodel_ids(submodel_ids)
+            if dry_run:
+                return submodel_ids, [], shared_submodel_ids
+
+            operations = self.get_operations(submodel_ids, delete_submodels, set(shared_submodel_ids))
+            return (
+                submodel_ids,
+                list(executor.map(lambda operation: self.delete(*operation), operations)),
+                shared_submodel_ids
+            )
+    # endregion
+
+
+def run_module():
+    module_args = dict(
+        scheme=dict(type='str', choices=['http', 'https'], default='http'),
+        repository_host=dict(type='str', required=True),
+        repository_port=dict(type='str', default='8081'),
+        shell_registry_host=dict(type='str', required=False),
+        shell_registry_port=dict(type='str', default='8082'),
+        submodel_registry_host=dict(type='str', required=False),
+        submodel_registry_port=dict(type='str', default='8083'),
+        shell_id=dict(type='str', required=False),
+        shell_ids=dict(type='list', elements='str', required=False),
+        delete_submodels=dict(type='bool', default=True),
+        delete_shared_submodels=dict(type='bool', default=False),
+        concurrency=dict(type='int', default=8),
+        page_size=dict(type='int', default=DEFAULT_PAGE_SIZE),
+        **get_limiter_argument_spec(),
+        **get_metrics_argument_spec(),
+        **get_tracing_argument_spec()
+    )
+
+    result = dict(
+        changed=False,
+        submodel_ids=dict(),
+        shared_submodel_ids=[],
+        counts=dict(deleted=0, absent=0, failed=0),
+        failures=[],
+    )
+
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True,
+        required_one_of=[('shell_id', 'shell_ids')],
+        mutually_exclusive=[('shell_id', 'shell_ids')],
+    )
+
+    params = module.params
+    scheme = params['scheme']
+    repository_url = f'{scheme}://{params["repository_host"]}:{params["repository_port"]}'
+    shell_registry_url = f'{scheme}://{params["shell_registry_host"] or params["repository_host"]}:{params["shell_registry_port"]}'
+    submodel_registry_url = f'{scheme}://{params["submodel_registry_host"] or params["repository_host"]}:{params["submodel_registry_port"]}'
+    metrics = create_metrics(params)
+    tracer = create_tracer(params, 'decommission')
+    client = DecommissionClient(
+        repository_url,
+        shell_registry_url,
+        submodel_registry_url,
+        max_workers=params['concurrency'],
+        page_size=params['page_size'],
+        limiter=create_or_fail(module, create_limiter, result),
+        metrics=metrics,
+        tracer=tracer
+    )
+
+    shell_ids = params['shell_ids'] if params['shell_ids'] is not None else [params['shell_id']]
+    try:
+        submodel_ids, operations, shared_submodel_ids = client.decommission(
+            shell_ids,
+            delete_submodels=params['delete_submodels'],
+            delete_shared_submodels=params['delete_shared_submodels'],
+            dry_run=module.check_mode
+        )
+    except requests.exceptions.ConnectionError as e:
+        module.fail_json(msg=f'Failed to connect. {e}', **result)
+    except requests.exceptions.HTTPError as e:
+        module.fail_json(msg=f'Failed to get submodel references. {e}', **result)
+
+    result['submodel_ids'] = submodel_ids
+    result['shared_submodel_ids'] = shared_submodel_ids
+    for operation in operations:
+        if operation['status_code'] in DELETED_STATUS_CODES:
+            result['counts']['deleted'] += 1
+        elif operation['status_code'] in ABSENT_STATUS_CODES:
+            result['counts']['absent'] += 1
+        else:
+            result['counts']['failed'] += 1
+            result['failures'].append(operation)
+
+    if module.check_mode:
+        # Only existing shells are known to be deleted, descriptors are not looked up:
+        result['changed'] = any(sm_ids is not None for sm_ids in submodel_ids.values())
+    else:
+        result['changed'] = result['counts']['deleted'] > 0
+
+    if metrics is not None:
+        result['metrics'] = metrics.as_dict()
+
+    if result['failures']:
+        module.fail_json(msg=f'Failed to delete {len(result["failures"])} resources', **result)
+
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
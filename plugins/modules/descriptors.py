@@ -0,0 +1,322 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2024, Benjamin Goetz <benjamin.goetz@ipa.fraunhofer.de>
+# Apache 2.0
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: descriptors
+
+short_description: Reconciles shell or submodel descriptors of a registry with a desired set
+
+# If this is part of a collection, you need to use semantic versioning,
+# i.e. the version is of the form "2.5.0" and not "2.4".
+version_added: "1.0.0"
+
+description:
+    - The module takes the full desired set of shell or submodel descriptors and lists the registry once (paged).
+    - Descriptors are compared by hash, only missing ones are created and differing ones updated. With 'prune'
+      descriptors not in the desired set are deleted as well. The delta is applied concurrently.
+    - Supports check mode, which only computes the delta.
+
+options:
+    scheme:
+        description: Scheme of the connection url for the registry
+        required: false
+        type: str
+        default: http
+    host:
+        description: Hostname of the host which runs the registry
+        required: true
+        type: str
+    port:
+        description: Port of the registry, defaults to 8082 for the shell registry and 8083 for the submodel registry
+        required: false
+        type: str
+    registry:
+        description: Type of the registry, shell registry ('/shell-descriptors') or submodel registry ('/submodel-descriptors')
+        required: false
+        type: str
+        choices: ['shell', 'submodel']
+        default: shell
+    descriptors:
+        description: The full desired set of descriptors
+        required: true
+        type: list
+        elements: dict
+    prune:
+        description:
+            - Delete registered descriptors which are not part of 'descriptors'
+            - Only enable it if 'descriptors' is really the full set, e.g. all hosts of the inventory and not a limit
+        required: false
+        type: bool
+        default: false
+    concurrency:
+        description: Maximum number of parallel requests when applying the delta
+        required: false
+        type: int
+        default: 8
+    page_size:
+        description: Number of descriptors requested per page when listing the registry
+        required: false
+        type: int
+        default: 100
+extends_documentation_fragment:
+    - slm.aas.limiter
+    - slm.aas.tracing
+
+author:
+    - Benjamin Goetz (@ipa-big)
+'''
+
+EXAMPLES = r'''
+- name: Reconcile shell descriptors, delete those of removed hosts
+  slm.aas.descriptors:
+    host: localhost
+    registry: shell
+    descriptors: "{{ groups['all'] | map('extract', hostvars, 'aas_descriptor') }}"
+    prune: true
+
+- name: Register missing or changed submodel descriptors, keep all others
+  slm.aas.descriptors:
+    host: localhost
+    registry: submodel
+    descriptors: "{{ submodel_descriptors }}"
+'''
+
+RETURN = r'''
+counts:
+    description: Number of created, updated, deleted, unchanged and failed descriptors.
+    type: dict
+    returned: always
+timings:
+    description: Duration in seconds of listing the registry, computing and applying the delta.
+    type: dict
+    returned: always
+failures:
+    description: Operations that did not succeed (id, operation, status_code).
+    type: list
+    returned: always
+'''
+try:
+    from ansible.module_utils.basic import AnsibleModule
+except ModuleNotFoundError as e:
+    print(e)
+    print("Skip import of AnsibleModule (for Testing only)")
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.pagination import DEFAULT_PAGE_SIZE
+except ImportError:
+    from plugins.module_utils.pagination import DEFAULT_PAGE_SIZE
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.registry import ShellRegistryClient, SubmodelRegistryClient
+except ImportError:
+    from plugins.module_utils.registry import ShellRegistryClient, SubmodelRegistryClient
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.descriptor import get_descriptor_hash
+except ImportError:
+    from plugins.module_utils.descriptor import get_descriptor_hash
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.session import create_session
+except ImportError:
+    from plugins.module_utils.session import create_session
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.limiter import create_limiter, get_limiter_argument_spec
+except ImportError:
+    from plugins.module_utils.limiter import create_limiter, get_limiter_argument_spec
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.private_dir import create_or_fail
+except ImportError:
+    from plugins.module_utils.private_dir import create_or_fail
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.tracing import create_tracer, get_tracing_argument_spec
+except ImportError:
+    from plugins.module_utils.tracing import create_tracer, get_tracing_argument_spec
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+REGISTRY_CLIENTS = dict(
+    shell=ShellRegistryClient,
+    submodel=SubmodelRegistryClient,
+)
+
+REGISTRY_PORTS = dict(
+    shell='8082',
+    submodel='8083',
+)
+
+EXPECTED_STATUS_CODES = dict(
+    create=[201],
+    update=[200, 204],
+    delete=[200, 204],
+)
+
+
+class DescriptorReconciler:
+    """Reconciles the descriptors of a registry with the desired ones through a shell or submodel registry client."""
+
+    def __init__(self, registry, max_workers=8):
+        self.registry = registry
+        self.max_workers = max_workers
+
+    # region RECONCILIATION
+    def get_registered_hashes(self) -> dict:
+        # Only id and hash of each registered descriptor are kept, not the descriptors themselves:
+        return {
+            descriptor['id']: get_descriptor_hash(descriptor)
+            for descriptor in self.registry.iter_descriptors()
+        }
+
+    def apply(self, operation, item):
+        if operation == 'create':
+            status_code, content = self.registry.create_descriptor(item)
+            descriptor_id = item['id']
+        elif operation == 'update':
+            status_code, content = self.registry.update_descriptor(item)
+            descriptor_id = item['id']
+        else:
+            status_code, content = self.registry.delete_descriptor(item)
+            descriptor_id = item
+
+        return dict(
+            id=descriptor_id,
+            operation=operation,
+            status_code=status_code
+        )
+
+    def apply_delta(self, delta, max_workers=None):
+        if max_workers is None:
+            max_workers = self.max_workers
+
+        operations = [(operation, item) for operation in ['create', 'update', 'delete'] for item in delta[operation]]
+
+        with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+            return list(executor.map(lambda operation: self.apply(*operation), operations))
+    # endregion
+
+
+def get_delta(desired_descriptors, registered_hashes, prune=False) -> dict:
+    delta = dict(create=[], update=[], delete=[], unchanged=[])
+    desired_ids = set()
+
+    for descriptor in desired_descriptors:
+        descriptor_id = descriptor['id']
+        if descriptor_id in desired_ids:
+            continue
+        desired_ids.add(descriptor_id)
+
+        if descriptor_id not in registered_hashes:
+            delta['create'].append(descriptor)
+        elif registered_hashes[descriptor_id] != get_descriptor_hash(descriptor):
+            delta['update'].append(descriptor)
+        else:
+            delta['unchanged'].append(descriptor_id)
+
+    if prune:
+        delta['delete'] = [descriptor_id for descriptor_id in registered_hashes if descriptor_id not in desired_ids]
+
+    return delta
+
+
+def run_module():
+    module_args = dict(
+        scheme=dict(type='str', choices=['http', 'https'], default='http'),
+        host=dict(type='str', required=True),
+        port=dict(type='str', required=False),
+        registry=dict(type='str', choices=list(REGISTRY_CLIENTS), default='shell'),
+        descriptors=dict(type='list', elements='dict', required=True),
+        prune=dict(type='bool', default=False),
+        concurrency=dict(type='int', default=8),
+        page_size=dict(type='int', default=DEFAULT_PAGE_SIZE),
+        **get_limiter_argument_spec(),
+        **get_tracing_argument_spec()
+    )
+
+    result = dict(
+        changed=False,
+        counts=dict(created=0, updated=0, deleted=0, unchanged=0, failed=0),
+        timings=dict(),
+        failures=[],
+    )
+
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True
+    )
+
+    port = module.params['port'] or REGISTRY_PORTS[module.params['registry']]
+    registry_url = f'{module.params["scheme"]}://{module.params["host"]}:{port}'
+    tracer = create_tracer(module.params, 'descriptors')
+    session = create_session(
+        pool_maxsize=module.params['concurrency'],
+        limiter=create_or_fail(module, create_limiter, result),
+        tracer=tracer
+    )
+    registry = REGISTRY_CLIENTS[module.params['registry']](
+        registry_url,
+        page_size=module.params['page_size'],
+        session=session
+    )
+    client = DescriptorReconciler(registry, max_workers=module.params['concurrency'])
+
+    start = time.monotonic()
+    try:
+        registered_hashes = client.get_registered_hashes()
+        listed = time.monotonic()
+
+        delta = get_delta(module.params['descriptors'], registered_hashes, module.params['prune'])
+        compared = time.monotonic()
+
+        if module.check_mode:
+            operations = [
+                dict(id=item if operation == 'delete' else item['id'], operation=operation, status_code=None)
+                for operation in ['create', 'update', 'delete'] for item in delta[operation]
+            ]
+        else:
+            operations = client.apply_delta(delta)
+        applied = time.monotonic()
+    except requests.exceptions.ConnectionError as e:
+        module.fail_json(msg=f'Failed to connect to {registry_url}. {e}', **result)
+    except requests.exceptions.HTTPError as e:
+        module.fail_json(msg=f'Failed to list descriptors of {registry_url}. {e}', **result)
+
+    counters = dict(create='created', update='updated', delete='deleted')
+    for operation in operations:
+        if module.check_mode or operation['status_code'] in EXPECTED_STATUS_CODES[operation['operation']]:
+            result['counts'][counters[operation['operation']]] += 1
+        else:
+            result['counts']['failed'] += 1
+            result['failures'].append(operation)
+
+    result['counts']['unchanged'] = len(delta['unchanged'])
+    result['changed'] = any(result['counts'][counter] > 0 for counter in counters.values())
+    result['timings'] = dict(
+        list=round(listed - start, 3),
+        compare=round(compared - listed, 3),
+        apply=round(applied - compared, 3),
+        total=round(applied - start, 3),
+    )
+
+    if result['failures']:
+        module.fail_json(msg=f'Failed to apply {len(result["failures"])} descriptor operations', **result)
+
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
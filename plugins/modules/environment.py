@@ -0,0 +1,278 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2024, Benjamin Goetz <benjamin.goetz@ipa.fraunhofer.de>
+# Apache 2.0
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: environment
+
+short_description: Uploads shells, submodels and concept descriptions as one AAS environment
+
+# If this is part of a collection, you need to use semantic versioning,
+# i.e. the version is of the form "2.5.0" and not "2.4".
+version_added: "1.0.0"
+
+description:
+    - The module builds an AAS environment of the given shells, submodels and concept descriptions and uploads it
+      with one request to the '/upload' endpoint of an AAS environment, instead of one request per object.
+    - The environment is written to a spooled temporary file (kept in memory up to 8 MiB, on disk above) and
+      streamed from there. Format 'aasx' needs basyx to build the package and holds all objects in memory once.
+
+options:
+    scheme:
+        description: Scheme of the connection url for the AAS environment
+        required: false
+        type: str
+        default: http
+    host:
+        description: Hostname of the host which runs the AAS environment
+        required: true
+        type: str
+    port:
+        description: Port of the AAS environment
+        required: false
+        type: str
+        default: 8081
+    shells:
+        description: Shells that shall be uploaded
+        required: false
+        type: list
+        elements: dict
+        default: []
+    submodels:
+        description: Submodels that shall be uploaded
+        required: false
+        type: list
+        elements: dict
+        default: []
+    concept_descriptions:
+        description: Concept descriptions that shall be uploaded
+        required: false
+        type: list
+        elements: dict
+        default: []
+    format:
+        description: Serialization of the uploaded environment
+        required: false
+        type: str
+        choices: ['json', 'aasx']
+        default: json
+extends_documentation_fragment:
+    - slm.aas.limiter
+    - slm.aas.tracing
+
+author:
+    - Benjamin Goetz (@ipa-big)
+'''
+
+EXAMPLES = r'''
+- name: Upload environment of all hosts
+  slm.aas.environment:
+    host: localhost
+    port: 8081
+    shells: "{{ groups['all'] | map('extract', hostvars, 'shell') }}"
+    submodels: "{{ groups['all'] | map('extract', hostvars, 'facts_submodel') }}"
+    format: aasx
+'''
+
+RETURN = r'''
+status_code:
+    description: Status code of the upload request.
+    type: int
+    returned: always
+bytes_sent:
+    description: Size of the uploaded file.
+    type: int
+    returned: always
+'''
+try:
+    from ansible.module_utils.basic import AnsibleModule
+except ModuleNotFoundError as e:
+    print(e)
+    print("Skip import of AnsibleModule (for Testing only)")
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.multipart import MultipartFileStream
+except ImportError:
+    from plugins.module_utils.multipart import MultipartFileStream
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.session import create_session
+except ImportError:
+    from plugins.module_utils.session import create_session
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.limiter import create_limiter, get_limiter_argument_spec
+except ImportError:
+    from plugins.module_utils.limiter import create_limiter, get_limiter_argument_spec
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.private_dir import create_or_fail
+except ImportError:
+    from plugins.module_utils.private_dir import create_or_fail
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.tracing import create_tracer, get_tracing_argument_spec
+except ImportError:
+    from plugins.module_utils.tracing import create_tracer, get_tracing_argument_spec
+
+import io
+import json
+import tempfile
+from json import JSONDecodeError
+
+import requests
+
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+FORMATS = dict(
+    json=('environment.json', 'application/json'),
+    aasx=('environment.aasx', 'application/asset-administration-shell-package'),
+)
+
+
+class EnvironmentClient:
+    def __init__(self, url, cache=None, limiter=None, tracer=None):
+        self.url = url
+        self.session = create_session(cache=cache, limiter=limiter, tracer=tracer)
+
+    # region UTILS
+    def return_response(self, response):
+        try:
+            return response.status_code, json.loads(response.content)
+        except JSONDecodeError:
+            return response.status_code, ''
+    # endregion
+
+    def upload(self, fp, file_name, content_type):
+        path = '/upload'
+        body = MultipartFileStream(fp, 'file', file_name, content_type)
+
+        return self.return_response(
+            self.session.post(
+                url=f'{self.url}{path}',
+                data=body,
+                headers={'Content-Type': body.content_type}
+            )
+        )
+
+
+def write_json_environment(fp, shells=(), submodels=(), concept_descriptions=()):
+    """Writes the objects as JSON environment to 'fp', object by object."""
+    collections = [
+        ('assetAdministrationShells', shells),
+        ('submodels', submodels),
+        ('conceptDescriptions', concept_descriptions),
+    ]
+
+    fp.write(b'{')
+    for index, (key, objects) in enumerate(collections):
+        if index > 0:
+            fp.write(b',')
+        fp.write(json.dumps(key).encode('utf-8') + b':[')
+        for object_index, aas_object in enumerate(objects):
+            if object_index > 0:
+                fp.write(b',')
+            fp.write(json.dumps(aas_object).encode('utf-8'))
+        fp.write(b']')
+    fp.write(b'}')
+
+
+def write_aasx_environment(fp, json_fp):
+    from basyx.aas.adapter import aasx
+    from basyx.aas.adapter.json import read_aas_json_file
+
+    json_fp.seek(0)
+    text_fp = io.TextIOWrapper(json_fp, encoding='utf-8')
+    try:
+        object_store = read_aas_json_file(text_fp, failsafe=False)
+    finally:
+        text_fp.detach()
+
+    writer = aasx.AASXWriter(fp)
+    try:
+        writer.write_all_aas_objects(
+            '/aasx/data.json',
+            object_store,
+            aasx.DictSupplementaryFileContainer(),
+            write_json=True
+        )
+    finally:
+        writer.close()
+
+
+def build_environment(fp, file_format, shells=(), submodels=(), concept_descriptions=()):
+    if file_format == 'json':
+        write_json_environment(fp, shells, submodels, concept_descriptions)
+        return
+
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as json_fp:
+        write_json_environment(json_fp, shells, submodels, concept_descriptions)
+        write_aasx_environment(fp, json_fp)
+
+
+def run_module():
+    module_args = dict(
+        scheme=dict(type='str', choices=['http', 'https'], default='http'),
+        host=dict(type='str', required=True),
+        port=dict(type='str', default='8081'),
+        shells=dict(type='list', elements='dict', default=[]),
+        submodels=dict(type='list', elements='dict', default=[]),
+        concept_descriptions=dict(type='list', elements='dict', default=[]),
+        format=dict(type='str', choices=list(FORMATS), default='json'),
+        **get_limiter_argument_spec(),
+        **get_tracing_argument_spec()
+    )
+
+    result = dict(
+        changed=False,
+        status_code=None,
+        bytes_sent=0,
+    )
+
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=False
+    )
+
+    aas_env_url = f'{module.params["scheme"]}://{module.params["host"]}:{module.params["port"]}'
+    tracer = create_tracer(module.params, 'environment')
+    client = EnvironmentClient(aas_env_url, limiter=create_or_fail(module, create_limiter, result), tracer=tracer)
+    file_name, content_type = FORMATS[module.params['format']]
+
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as fp:
+        try:
+            build_environment(
+                fp,
+                module.params['format'],
+                module.params['shells'],
+                module.params['submodels'],
+                module.params['concept_descriptions']
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            module.fail_json(msg=f'Failed to build AAS environment. {e}', **result)
+
+        result['bytes_sent'] = fp.tell()
+
+        try:
+            status_code, content = client.upload(fp, file_name, content_type)
+        except requests.exceptions.ConnectionError as e:
+            module.fail_json(msg=f'Failed to connect to {aas_env_url}. {e}', **result)
+
+    result['status_code'] = status_code
+    if status_code not in [200, 201, 204]:
+        module.fail_json(msg=f'Upload to {aas_env_url} failed with status code {status_code}. {content}', **result)
+
+    result['changed'] = True
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,293 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2024, Benjamin Goetz <benjamin.goetz@ipa.fraunhofer.de>
+# Apache 2.0
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: publish
+
+short_description: Publishes a submodel with its shell reference and descriptors in one step
+
+# If this is part of a collection, you need to use semantic versioning,
+# i.e. the version is of the form "2.5.0" and not "2.4".
+version_added: "1.0.0"
+
+description:
+    - The module combines the modules 'submodel', 'submodel_reference', 'submodel_descriptor' and 'aas_descriptor'.
+    - It registers the submodel at the repository, its reference in the shell, the submodel descriptor at the
+      submodel registry and optionally the shell descriptor at the shell registry.
+    - The requests are independent of each other and are sent concurrently over pooled connections.
+
+options:
+    scheme:
+        description: Scheme of the connection urls
+        required: false
+        type: str
+        default: http
+    repository_host:
+        description: Hostname of the host which runs the submodel and shell repository
+        required: true
+        type: str
+    repository_port:
+        description: Port of the submodel and shell repository
+        required: false
+        type: str
+        default: 8081
+    shell_registry_host:
+        description: Hostname of the host which runs the shell registry (defaults to 'repository_host')
+        required: false
+        type: str
+    shell_registry_port:
+        description: Port of the shell registry
+        required: false
+        type: str
+        default: 8082
+    submodel_registry_host:
+        description: Hostname of the host which runs the submodel registry (defaults to 'repository_host')
+        required: false
+        type: str
+    submodel_registry_port:
+        description: Port of the submodel registry
+        required: false
+        type: str
+        default: 8083
+    submodel:
+        description: Submodel that shall be published (e.g. the result of 'convert_to_sm')
+        required: true
+        type: dict
+    shell_id:
+        description: The id of the Shell the submodel reference shall be registered in
+        required: true
+        type: str
+    aas_descriptor:
+        description: Shell Descriptor that shall be registered, skipped if not defined
+        required: false
+        type: dict
+    force:
+        description: Update the submodel if it is already registered
+        required: false
+        type: bool
+        default: true
+    update_descriptors:
+        description: Compare registered descriptors and only update them if they differ (see 'update' of 'aas_descriptor')
+        required: false
+        type: bool
+        default: false
+extends_documentation_fragment:
+    - slm.aas.cache
+    - slm.aas.limiter
+    - slm.aas.tracing
+
+author:
+    - Benjamin Goetz (@ipa-big)
+'''
+
+EXAMPLES = r'''
+- setup:
+
+- name: Convert ansible facts to submodel
+  slm.aas.convert_to_sm:
+    facts: "{{ ansible_facts }}"
+    id: "{{ inventory_hostname }}-facts"
+  register: convert_result
+
+- name: Publish submodel
+  slm.aas.publish:
+    repository_host: localhost
+    submodel: "{{ convert_result.submodel }}"
+    shell_id: "{{ shell.id }}"
+    aas_descriptor: "{{ aas_descriptor }}"
+'''
+
+RETURN = r'''
+reference:
+    description: The reference of the submodel (see 'submodel').
+    type: dict
+    returned: always
+submodel_descriptor:
+    description: The registered submodel descriptor (see 'submodel').
+    type: dict
+    returned: always
+steps:
+    description: Status code and changed flag of each step (submodel, submodel_reference, submodel_descriptor, aas_descriptor).
+    type: dict
+    returned: always
+'''
+try:
+    from ansible.module_utils.basic import AnsibleModule
+except ModuleNotFoundError as e:
+    print(e)
+    print("Skip import of AnsibleModule (for Testing only)")
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.registry import ShellRegistryClient, SubmodelRegistryClient
+except ImportError:
+    from plugins.module_utils.registry import ShellRegistryClient, SubmodelRegistryClient
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.session import create_session
+except ImportError:
+    from plugins.module_utils.session import create_session
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.cache import create_cache, get_cache_argument_spec
+except ImportError:
+    from plugins.module_utils.cache import create_cache, get_cache_argument_spec
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.private_dir import create_or_fail
+except ImportError:
+    from plugins.module_utils.private_dir import create_or_fail
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.limiter import create_limiter, get_limiter_argument_spec
+except ImportError:
+    from plugins.module_utils.limiter import create_limiter, get_limiter_argument_spec
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.tracing import create_tracer, get_tracing_argument_spec
+except ImportError:
+    from plugins.module_utils.tracing import create_tracer, get_tracing_argument_spec
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.submodel_repository import SmRepoClient, get_reference, \
+        get_submodel_descriptor
+except ImportError:
+    from plugins.module_utils.submodel_repository import SmRepoClient, get_reference, get_submodel_descriptor
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.shell_repository import ShellRepoClient
+except ImportError:
+    from plugins.module_utils.shell_repository import ShellRepoClient
+
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+# A forced update of an existing submodel is not reported as change, same as in 'submodel':
+CHANGED_STATUS_CODES = dict(
+    submodel=[201],
+    submodel_reference=[201],
+    submodel_descriptor=[201, 204],
+    aas_descriptor=[201, 204],
+)
+
+
+class PublishClient:
+    """Composes the clients of the repository and the registries, all of them share one session."""
+
+    def __init__(self, repository_url, shell_registry_url, submodel_registry_url, cache=None, limiter=None,
+                 tracer=None):
+        # One session for all steps, with a connection pool per host:
+        self.session = create_session(pool_maxsize=4, pool_connections=3, cache=cache, limiter=limiter, tracer=tracer)
+
+        self.submodel_repository = SmRepoClient(repository_url, tracer=tracer, session=self.session)
+        self.shell_repository = ShellRepoClient(repository_url, session=self.session)
+        self.shell_registry = ShellRegistryClient(shell_registry_url, session=self.session)
+        self.submodel_registry = SubmodelRegistryClient(submodel_registry_url, session=self.session)
+
+    # region STEPS
+    def create_submodel(self, submodel, force=True):
+        return self.submodel_repository.create(submodel, force)
+
+    def add_submodel_reference(self, shell_id, submodel_reference):
+        # Lists the references of the shell (paged) and only posts the reference if it is missing:
+        return self.shell_repository.add_submodel_references(shell_id, [submodel_reference])[0]
+
+    def register_descriptor(self, registry, descriptor, update=False):
+        if update:
+            return registry.register_descriptor(descriptor)
+        return registry.create_descriptor(descriptor)
+    # endregion
+
+
+def run_module():
+    module_args = dict(
+        scheme=dict(type='str', choices=['http', 'https'], default='http'),
+        repository_host=dict(type='str', required=True),
+        repository_port=dict(type='str', default='8081'),
+        shell_registry_host=dict(type='str', required=False),
+        shell_registry_port=dict(type='str', default='8082'),
+        submodel_registry_host=dict(type='str', required=False),
+        submodel_registry_port=dict(type='str', default='8083'),
+        submodel=dict(type='dict', required=True),
+        shell_id=dict(type='str', required=True),
+        aas_descriptor=dict(type='dict', required=False),
+        force=dict(type='bool', default=True),
+        update_descriptors=dict(type='bool', default=False),
+        **get_cache_argument_spec(),
+        **get_limiter_argument_spec(),
+        **get_tracing_argument_spec()
+    )
+
+    result = dict(
+        reference=dict(),
+        submodel_descriptor=dict(),
+        steps=dict(),
+        changed=False,
+    )
+
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=False
+    )
+
+    params = module.params
+    scheme = params['scheme']
+    repository_url = f'{scheme}://{params["repository_host"]}:{params["repository_port"]}'
+    shell_registry_url = f'{scheme}://{params["shell_registry_host"] or params["repository_host"]}:{params["shell_registry_port"]}'
+    submodel_registry_url = f'{scheme}://{params["submodel_registry_host"] or params["repository_host"]}:{params["submodel_registry_port"]}'
+    tracer = create_tracer(params, 'publish')
+    client = PublishClient(
+        repository_url,
+        shell_registry_url,
+        submodel_registry_url,
+        cache=create_or_fail(module, create_cache, result),
+        limiter=create_or_fail(module, create_limiter, result),
+        tracer=tracer
+    )
+
+    sm_id = params['submodel']['id']
+    result['reference'] = get_reference(sm_id)
+    result['submodel_descriptor'] = get_submodel_descriptor(repository_url, sm_id, client.submodel_repository.get_encrypted_sm_id_from_id(sm_id))
+
+    steps = dict(
+        submodel=lambda: client.create_submodel(params['submodel'], params['force']),
+        submodel_reference=lambda: client.add_submodel_reference(params['shell_id'], result['reference']),
+        submodel_descriptor=lambda: client.register_descriptor(
+            client.submodel_registry, result['submodel_descriptor'], params['update_descriptors']
+        ),
+    )
+    if params['aas_descriptor'] is not None:
+        steps['aas_descriptor'] = lambda: client.register_descriptor(
+            client.shell_registry, params['aas_descriptor'], params['update_descriptors']
+        )
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(steps)) as executor:
+            futures = {name: executor.submit(step) for name, step in steps.items()}
+            for name, future in futures.items():
+                status_code, content = future.result()
+                result['steps'][name] = dict(
+                    status_code=status_code,
+                    changed=status_code in CHANGED_STATUS_CODES[name]
+                )
+    except requests.exceptions.ConnectionError as e:
+        module.fail_json(msg=f'Failed to connect. {e}', **result)
+    except requests.exceptions.HTTPError as e:
+        module.fail_json(msg=f'Failed to get submodel references of shell {params["shell_id"]}. {e}', **result)
+
+    result['changed'] = any(step['changed'] for step in result['steps'].values())
+
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
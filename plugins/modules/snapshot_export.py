@@ -0,0 +1,384 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2024, Benjamin Goetz <benjamin.goetz@ipa.fraunhofer.de>
+# Apache 2.0
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: snapshot_export
+
+short_description: Exports shells, submodels and descriptors to a local snapshot file
+
+# If this is part of a collection, you need to use semantic versioning,
+# i.e. the version is of the form "2.5.0" and not "2.4".
+version_added: "1.0.0"
+
+description:
+    - The module pages through '/submodels', '/shells', '/submodel-descriptors' and '/shell-descriptors' and writes
+      every item as one line of a gzip compressed JSON lines file, e.g. as backup for 'snapshot_import'.
+    - The collections are fetched concurrently and their responses are parsed while being read (with ijson).
+      Items are written as soon as they arrive, at no time more than a few pages are held in memory.
+    - The snapshot is written to a temporary file next to 'path' which replaces 'path' once the export is complete,
+      so a failed export never leaves a truncated snapshot.
+
+options:
+    scheme:
+        description: Scheme of the connection urls
+        required: false
+        type: str
+        default: http
+    repository_host:
+        description: Hostname of the host which runs the submodel and shell repository
+        required: true
+        type: str
+    repository_port:
+        description: Port of the submodel and shell repository
+        required: false
+        type: str
+        default: 8081
+    shell_registry_host:
+        description: Hostname of the host which runs the shell registry (defaults to 'repository_host')
+        required: false
+        type: str
+    shell_registry_port:
+        description: Port of the shell registry
+        required: false
+        type: str
+        default: 8082
+    submodel_registry_host:
+        description: Hostname of the host which runs the submodel registry (defaults to 'repository_host')
+        required: false
+        type: str
+    submodel_registry_port:
+        description: Port of the submodel registry
+        required: false
+        type: str
+        default: 8083
+    path:
+        description: Snapshot file that shall be written, e.g. 'backup.jsonl.gz'
+        required: true
+        type: path
+    collections:
+        description: Collections that shall be exported
+        required: false
+        type: list
+        elements: str
+        choices: ['submodels', 'shells', 'submodel_descriptors', 'shell_descriptors']
+        default: ['submodels', 'shells', 'submodel_descriptors', 'shell_descriptors']
+    page_size:
+        description: Number of items requested per page
+        required: false
+        type: int
+        default: 100
+    compression_level:
+        description:
+            - gzip compression level of the snapshot, 0 writes an uncompressed JSON lines file
+            - Level 1 is several times faster than higher levels and JSON compresses well anyway
+        required: false
+        type: int
+        default: 1
+    progress_interval:
+        description: Seconds between two progress messages written to the log of the target host, 0 disables them
+        required: false
+        type: float
+        default: 10
+extends_documentation_fragment:
+    - slm.aas.limiter
+    - slm.aas.metrics
+    - slm.aas.tracing
+
+author:
+    - Benjamin Goetz (@ipa-big)
+'''
+
+EXAMPLES = r'''
+- name: Back up repository and registries
+  slm.aas.snapshot_export:
+    repository_host: localhost
+    path: /var/backups/aas/{{ ansible_date_time.iso8601_basic_short }}.jsonl.gz
+
+- name: Back up only the submodels
+  slm.aas.snapshot_export:
+    repository_host: localhost
+    path: /var/backups/aas/submodels.jsonl.gz
+    collections: [submodels]
+'''
+
+RETURN = r'''
+path:
+    description: The written snapshot file.
+    type: str
+    returned: always
+counts:
+    description: Number of exported items per collection.
+    type: dict
+    returned: always
+statistics:
+    description: Items, uncompressed and written bytes, duration in seconds, items and uncompressed bytes per second.
+    type: dict
+    returned: always
+metrics:
+    description: Time per phase, request counters and peak RSS of the module, if 'metrics' is enabled.
+    type: dict
+    returned: when metrics is true
+'''
+try:
+    from ansible.module_utils.basic import AnsibleModule
+except ModuleNotFoundError as e:
+    print(e)
+    print("Skip import of AnsibleModule (for Testing only)")
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.pagination import DEFAULT_PAGE_SIZE, iter_paged
+except ImportError:
+    from plugins.module_utils.pagination import DEFAULT_PAGE_SIZE, iter_paged
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.snapshot import SNAPSHOT_COLLECTIONS, get_snapshot_line, \
+        open_snapshot
+except ImportError:
+    from plugins.module_utils.snapshot import SNAPSHOT_COLLECTIONS, get_snapshot_line, open_snapshot
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.session import create_session
+except ImportError:
+    from plugins.module_utils.session import create_session
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.limiter import create_limiter, get_limiter_argument_spec
+except ImportError:
+    from plugins.module_utils.limiter import create_limiter, get_limiter_argument_spec
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.private_dir import create_or_fail
+except ImportError:
+    from plugins.module_utils.private_dir import create_or_fail
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.metrics import create_metrics, get_metrics_argument_spec
+except ImportError:
+    from plugins.module_utils.metrics import create_metrics, get_metrics_argument_spec
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.tracing import create_tracer, get_tracing_argument_spec
+except ImportError:
+    from plugins.module_utils.tracing import create_tracer, get_tracing_argument_spec
+
+import os
+import queue
+import tempfile
+import threading
+import time
+
+import requests
+
+# Lines waiting to be written, bounds the memory used if the network is faster than the disk:
+MAX_QUEUED_LINES = 1024
+# Lines are written in chunks, compressing every line on its own is slow:
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+class SnapshotExportClient:
+    def __init__(self, repository_url, shell_registry_url, submodel_registry_url, page_size=DEFAULT_PAGE_SIZE,
+                 limiter=None, metrics=None, tracer=None):
+        self.urls = dict(
+            repository=repository_url,
+            shell_registry=shell_registry_url,
+            submodel_registry=submodel_registry_url,
+        )
+        self.page_size = page_size
+
+        # One session for all collections, two of them are fetched from the repository at the same time:
+        self.session = create_session(
+            pool_maxsize=2, pool_connections=3, limiter=limiter, metrics=metrics, tracer=tracer
+        )
+
+    def iter_collection(self, collection):
+        service, path = SNAPSHOT_COLLECTIONS[collection]
+
+        return iter_paged(
+            self.session.get,
+            f'{self.urls[service]}{path}',
+            limit=self.page_size,
+            stream=True
+        )
+
+    def fetch(self, collection, lines, stop):
+        # Runs in a thread per collection, ends with None (or the exception) so the writer knows it is done:
+        try:
+            for item in self.iter_collection(collection):
+                if stop.is_set():
+                    break
+                lines.put((collection, get_snapshot_line(collection, item)))
+        except Exception as e:
+            lines.put((collection, e))
+        else:
+            lines.put((collection, None))
+
+    def export(self, path, collections, compression_level=1, progress=None, progress_interval=0) -> dict:
+        """Writes all items of 'collections' to snapshot 'path', returns the statistics of the export.
+
+        'progress' is called with the statistics so far at most every 'progress_interval' seconds.
+        """
+        start = time.monotonic()
+        statistics = dict(counts={collection: 0 for collection in collections}, items=0, bytes=0)
+        lines = queue.Queue(maxsize=MAX_QUEUED_LINES)
+        stop = threading.Event()
+
+        threads = [
+            threading.Thread(target=self.fetch, args=(collection, lines, stop), daemon=True)
+            for collection in collections
+        ]
+        for thread in threads:
+            thread.start()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f'.{os.path.basename(path)}.', suffix='.tmp')
+        os.close(fd)
+        try:
+            with open_snapshot(temp_path, 'wb', compression_level) as fp:
+                buffer = bytearray()
+                running = len(threads)
+                last_progress = start
+
+                while running:
+                    collection, line = lines.get()
+                    if line is None:
+                        running -= 1
+                        continue
+                    if isinstance(line, Exception):
+                        raise line
+
+                    buffer += line
+                    statistics['counts'][collection] += 1
+                    statistics['items'] += 1
+                    statistics['bytes'] += len(line)
+                    if len(buffer) >= WRITE_BUFFER_SIZE:
+                        fp.write(buffer)
+                        buffer.clear()
+
+                    now = time.monotonic()
+                    if progress is not None and progress_interval and now - last_progress >= progress_interval:
+                        last_progress = now
+                        progress(get_statistics(statistics, start, temp_path))
+                fp.write(buffer)
+
+            os.replace(temp_path, path)
+        except BaseException:
+            stop.set()
+            # Unblock the fetching threads, they end after their current item:
+            while any(thread.is_alive() for thread in threads):
+                try:
+                    lines.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            os.remove(temp_path)
+            raise
+
+        return get_statistics(statistics, start, path)
+
+
+def get_statistics(statistics, start, path) -> dict:
+    duration = max(time.monotonic() - start, 1e-9)
+
+    return dict(
+        counts=dict(statistics['counts']),
+        items=statistics['items'],
+        bytes=statistics['bytes'],
+        file_bytes=os.path.getsize(path),
+        duration=round(duration, 3),
+        items_per_second=round(statistics['items'] / duration, 1),
+        bytes_per_second=round(statistics['bytes'] / duration),
+    )
+
+
+def run_module():
+    module_args = dict(
+        scheme=dict(type='str', choices=['http', 'https'], default='http'),
+        repository_host=dict(type='str', required=True),
+        repository_port=dict(type='str', default='8081'),
+        shell_registry_host=dict(type='str', required=False),
+        shell_registry_port=dict(type='str', default='8082'),
+        submodel_registry_host=dict(type='str', required=False),
+        submodel_registry_port=dict(type='str', default='8083'),
+        path=dict(type='path', required=True),
+        collections=dict(type='list', elements='str', choices=list(SNAPSHOT_COLLECTIONS),
+                         default=list(SNAPSHOT_COLLECTIONS)),
+        page_size=dict(type='int', default=DEFAULT_PAGE_SIZE),
+        compression_level=dict(type='int', default=1, choices=list(range(10))),
+        progress_interval=dict(type='float', default=10),
+        **get_limiter_argument_spec(),
+        **get_metrics_argument_spec(),
+        **get_tracing_argument_spec()
+    )
+
+    result = dict(
+        changed=False,
+        path='',
+        counts=dict(),
+        statistics=dict(),
+    )
+
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=False
+    )
+
+    params = module.params
+    scheme = params['scheme']
+    repository_url = f'{scheme}://{params["repository_host"]}:{params["repository_port"]}'
+    shell_registry_url = f'{scheme}://{params["shell_registry_host"] or params["repository_host"]}:{params["shell_registry_port"]}'
+    submodel_registry_url = f'{scheme}://{params["submodel_registry_host"] or params["repository_host"]}:{params["submodel_registry_port"]}'
+    metrics = create_metrics(params)
+    tracer = create_tracer(params, 'snapshot_export')
+    client = SnapshotExportClient(
+        repository_url,
+        shell_registry_url,
+        submodel_registry_url,
+        page_size=params['page_size'],
+        limiter=create_or_fail(module, create_limiter, result),
+        metrics=metrics,
+        tracer=tracer
+    )
+
+    def log_progress(statistics):
+        module.log(
+            f'snapshot_export {params["path"]}: {statistics["items"]} items, {statistics["bytes"]} bytes, '
+            f'{statistics["items_per_second"]} items/s'
+        )
+
+    try:
+        statistics = client.export(
+            params['path'],
+            list(dict.fromkeys(params['collections'])),
+            compression_level=params['compression_level'],
+            progress=log_progress,
+            progress_interval=params['progress_interval']
+        )
+    except requests.exceptions.HTTPError as e:
+        module.fail_json(msg=f'Failed to list items. {e}', **result)
+    except requests.exceptions.RequestException as e:
+        # Before OSError, which requests' exceptions derive from:
+        module.fail_json(msg=f'Failed to connect. {e}', **result)
+    except OSError as e:
+        module.fail_json(msg=f'Failed to write {params["path"]}. {e}', **result)
+
+    result['changed'] = True
+    result['path'] = params['path']
+    result['counts'] = statistics.pop('counts')
+    result['statistics'] = statistics
+
+    if metrics is not None:
+        result['metrics'] = metrics.as_dict()
+
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
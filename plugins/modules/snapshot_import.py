@@ -0,0 +1,524 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2024, Benjamin Goetz <benjamin.goetz@ipa.fraunhofer.de>
+# Apache 2.0
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: snapshot_import
+
+short_description: Imports shells, submodels and descriptors from a local snapshot file
+
+# If this is part of a collection, you need to use semantic versioning,
+# i.e. the version is of the form "2.5.0" and not "2.4".
+version_added: "1.0.0"
+
+description:
+    - The module reads a snapshot written by 'snapshot_export' line by line and creates every item in the
+      repository or registry it was exported from, items which already exist are updated (see 'force').
+    - Up to 'concurrency' items are uploaded at the same time, only those are held in memory.
+    - Progress is saved to a checkpoint file. An interrupted or failed import resumes from the checkpoint, items
+      which were already imported are not uploaded again, failed ones are retried. The checkpoint is removed once
+      all items are imported.
+
+options:
+    scheme:
+        description: Scheme of the connection urls
+        required: false
+        type: str
+        default: http
+    repository_host:
+        description: Hostname of the host which runs the submodel and shell repository
+        required: true
+        type: str
+    repository_port:
+        description: Port of the submodel and shell repository
+        required: false
+        type: str
+        default: 8081
+    shell_registry_host:
+        description: Hostname of the host which runs the shell registry (defaults to 'repository_host')
+        required: false
+        type: str
+    shell_registry_port:
+        description: Port of the shell registry
+        required: false
+        type: str
+        default: 8082
+    submodel_registry_host:
+        description: Hostname of the host which runs the submodel registry (defaults to 'repository_host')
+        required: false
+        type: str
+    submodel_registry_port:
+        description: Port of the submodel registry
+        required: false
+        type: str
+        default: 8083
+    path:
+        description: Snapshot file that shall be imported (gzip compressed or not)
+        required: true
+        type: path
+    collections:
+        description: Collections that shall be imported, items of other collections are skipped
+        required: false
+        type: list
+        elements: str
+        choices: ['submodels', 'shells', 'submodel_descriptors', 'shell_descriptors']
+        default: ['submodels', 'shells', 'submodel_descriptors', 'shell_descriptors']
+    force:
+        description: Update items which already exist, otherwise they are counted as existing and left as they are
+        required: false
+        type: bool
+        default: true
+    concurrency:
+        description: Maximum number of parallel uploads
+        required: false
+        type: int
+        default: 8
+    checkpoint_path:
+        description: Checkpoint file of the import (defaults to 'path' with suffix '.checkpoint')
+        required: false
+        type: path
+    checkpoint_interval:
+        description: Seconds between two writes of the checkpoint file
+        required: false
+        type: float
+        default: 5
+    restart:
+        description: Ignore an existing checkpoint and import all items again
+        required: false
+        type: bool
+        default: false
+    progress_interval:
+        description: Seconds between two progress messages written to the log of the target host, 0 disables them
+        required: false
+        type: float
+        default: 10
+extends_documentation_fragment:
+    - slm.aas.limiter
+    - slm.aas.metrics
+    - slm.aas.tracing
+
+author:
+    - Benjamin Goetz (@ipa-big)
+'''
+
+EXAMPLES = r'''
+- name: Restore repository and registries, resuming a previous attempt
+  slm.aas.snapshot_import:
+    repository_host: localhost
+    path: /var/backups/aas/snapshot.jsonl.gz
+  retries: 3
+  register: import_result
+  until: import_result is succeeded
+
+- name: Migrate only the submodels to another repository without touching existing ones
+  slm.aas.snapshot_import:
+    repository_host: new-repository
+    path: /var/backups/aas/snapshot.jsonl.gz
+    collections: [submodels]
+    force: false
+'''
+
+RETURN = r'''
+counts:
+    description: Number of created, updated, existing (not updated), failed and resumed (done before) items.
+    type: dict
+    returned: always
+failures:
+    description: Items that could not be imported (line, collection, id, status_code), at most 100. Items without
+        an id are reported with id and status_code null.
+    type: list
+    returned: always
+statistics:
+    description: Imported items, duration in seconds and items per second.
+    type: dict
+    returned: always
+checkpoint_path:
+    description: The checkpoint file, it is kept if not all items were imported.
+    type: str
+    returned: always
+metrics:
+    description: Time per phase, request counters and peak RSS of the module, if 'metrics' is enabled.
+    type: dict
+    returned: when metrics is true
+'''
+try:
+    from ansible.module_utils.basic import AnsibleModule
+except ModuleNotFoundError as e:
+    print(e)
+    print("Skip import of AnsibleModule (for Testing only)")
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.snapshot import SNAPSHOT_COLLECTIONS, iter_snapshot, \
+        open_snapshot
+except ImportError:
+    from plugins.module_utils.snapshot import SNAPSHOT_COLLECTIONS, iter_snapshot, open_snapshot
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.session import create_session
+except ImportError:
+    from plugins.module_utils.session import create_session
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.limiter import create_limiter, get_limiter_argument_spec
+except ImportError:
+    from plugins.module_utils.limiter import create_limiter, get_limiter_argument_spec
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.private_dir import create_or_fail
+except ImportError:
+    from plugins.module_utils.private_dir import create_or_fail
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.metrics import create_metrics, get_metrics_argument_spec
+except ImportError:
+    from plugins.module_utils.metrics import create_metrics, get_metrics_argument_spec
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.tracing import create_tracer, get_tracing_argument_spec
+except ImportError:
+    from plugins.module_utils.tracing import create_tracer, get_tracing_argument_spec
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.submodel_repository import SmRepoClient
+except ImportError:
+    from plugins.module_utils.submodel_repository import SmRepoClient
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.shell_repository import ShellRepoClient
+except ImportError:
+    from plugins.module_utils.shell_repository import ShellRepoClient
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.registry import ShellRegistryClient, SubmodelRegistryClient
+except ImportError:
+    from plugins.module_utils.registry import ShellRegistryClient, SubmodelRegistryClient
+
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+
+CREATED_STATUS_CODES = [201]
+UPDATED_STATUS_CODES = [200, 204]
+EXISTING_STATUS_CODES = [409]
+
+MAX_REPORTED_FAILURES = 100
+
+
+class Checkpoint:
+    """Lines of a snapshot which were processed, saved to 'path' so an interrupted import can resume.
+
+    All lines before 'lines' and those in 'completed' were imported, lines in 'failed' need to be imported again.
+    Only lines uploaded concurrently are kept in 'completed', they are merged into 'lines' once all lines before
+    them are done. A checkpoint of a different snapshot (size or modification time changed) or of other
+    'collections' is ignored.
+    """
+
+    def __init__(self, path, snapshot_path, collections):
+        self.path = path
+        stat = os.stat(snapshot_path)
+        self.snapshot = dict(
+            path=os.path.abspath(snapshot_path),
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            collections=sorted(collections),
+        )
+        self.lines = 0
+        self.completed = set()
+        self.failed = set()
+
+    def load(self) -> bool:
+        try:
+            with open(self.path) as fp:
+                content = json.load(fp)
+        except (OSError, ValueError):
+            return False
+        if content.get('snapshot') != self.snapshot:
+            return False
+
+        self.lines = content['lines']
+        self.completed = set(content['completed'])
+        self.failed = set(content['failed'])
+        return True
+
+    def save(self):
+        content = dict(
+            snapshot=self.snapshot,
+            lines=self.lines,
+            completed=sorted(self.completed),
+            failed=sorted(self.failed),
+        )
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f'.{os.path.basename(self.path)}.', suffix='.tmp')
+        with os.fdopen(fd, 'w') as fp:
+            json.dump(content, fp)
+        os.replace(temp_path, self.path)
+
+    def remove(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def is_done(self, line) -> bool:
+        return (line < self.lines and line not in self.failed) or line in self.completed
+
+    def mark(self, line, failed=False):
+        if failed:
+            self.failed.add(line)
+        elif line < self.lines:
+            # A failed line which was retried:
+            self.failed.discard(line)
+        else:
+            self.completed.add(line)
+
+        # Failed lines count as processed as well, they are retried via 'failed':
+        while self.lines in self.completed or self.lines in self.failed:
+            self.completed.discard(self.lines)
+            self.lines += 1
+
+
+class SnapshotImportClient:
+    """Composes the clients of the repository and the registries, all of them share one session."""
+
+    def __init__(self, repository_url, shell_registry_url, submodel_registry_url, max_workers=8, force=True,
+                 limiter=None, metrics=None, tracer=None):
+        self.max_workers = max_workers
+        self.force = force
+
+        # One session for all collections, with a connection pool per host:
+        self.session = create_session(
+            pool_maxsize=max_workers, pool_connections=3, limiter=limiter, metrics=metrics, tracer=tracer
+        )
+
+        self.submodel_repository = SmRepoClient(repository_url, max_workers=max_workers, session=self.session)
+        self.shell_repository = ShellRepoClient(repository_url, max_workers=max_workers, session=self.session)
+        self.shell_registry = ShellRegistryClient(shell_registry_url, session=self.session)
+        self.submodel_registry = SubmodelRegistryClient(submodel_registry_url, session=self.session)
+
+        # Creation and update (of an existing item) per collection:
+        self.writers = dict(
+            shells=(self.shell_repository.create_shell, self.shell_repository.update_shell),
+            submodel_descriptors=(self.submodel_registry.create_descriptor, self.submodel_registry.update_descriptor),
+            shell_descriptors=(self.shell_registry.create_descriptor, self.shell_registry.update_descriptor),
+        )
+
+    # region IMPORT
+    def create(self, collection, item) -> int:
+        """Creates 'item' in 'collection' the same way the modules of the collection do, returns the status code."""
+        if collection == 'submodels':
+            # Encodes the submodel once, the PUT of an existing submodel sends the same bytes:
+            status_code, content = self.submodel_repository.create(item, force=self.force)
+            return status_code
+
+        create, update = self.writers[collection]
+        status_code, content = create(item)
+        if status_code == 409 and self.force:
+            status_code, content = update(item)
+        return status_code
+
+    def import_snapshot(self, path, checkpoint, collections, checkpoint_interval=5, progress=None,
+                        progress_interval=0) -> dict:
+        """Imports the items of snapshot 'path' not done in 'checkpoint', returns the statistics of the import.
+
+        Lines are read while uploading, at most twice 'max_workers' items are read ahead. 'checkpoint' is saved
+        every 'checkpoint_interval' seconds and when the import ends, also if it fails.
+        """
+        start = time.monotonic()
+        statistics = dict(counts=dict(created=0, updated=0, existing=0, failed=0, resumed=0), failures=[])
+        last_saved = last_progress = start
+        pending = dict()
+
+        def fail(line, collection, item_id, status_code):
+            statistics['counts']['failed'] += 1
+            if len(statistics['failures']) < MAX_REPORTED_FAILURES:
+                statistics['failures'].append(
+                    dict(line=line, collection=collection, id=item_id, status_code=status_code)
+                )
+            checkpoint.mark(line, failed=True)
+
+        def complete(future):
+            line, collection, item_id = pending.pop(future)
+            status_code = future.result()
+
+            if status_code in CREATED_STATUS_CODES:
+                statistics['counts']['created'] += 1
+            elif status_code in UPDATED_STATUS_CODES:
+                statistics['counts']['updated'] += 1
+            elif status_code in EXISTING_STATUS_CODES:
+                statistics['counts']['existing'] += 1
+            else:
+                fail(line, collection, item_id, status_code)
+                return
+            checkpoint.mark(line)
+
+        try:
+            with ThreadPoolExecutor(max_workers=max(self.max_workers, 1)) as executor, open_snapshot(path) as fp:
+                for line, (collection, item) in enumerate(iter_snapshot(fp)):
+                    if checkpoint.is_done(line):
+                        statistics['counts']['resumed'] += 1
+                        continue
+                    if collection not in collections:
+                        checkpoint.mark(line)
+                        continue
+                    if not isinstance(item, dict) or not item.get('id'):
+                        # Can not be created or updated, reported without a request:
+                        fail(line, collection, None, None)
+                        continue
+
+                    while len(pending) >= 2 * max(self.max_workers, 1):
+                        done, not_done = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            complete(future)
+                    pending[executor.submit(self.create, collection, item)] = (line, collection, item.get('id'))
+
+                    now = time.monotonic()
+                    if now - last_saved >= checkpoint_interval:
+                        last_saved = now
+                        checkpoint.save()
+                    if progress is not None and progress_interval and now - last_progress >= progress_interval:
+                        last_progress = now
+                        progress(get_statistics(statistics, start))
+
+                while pending:
+                    done, not_done = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        complete(future)
+        finally:
+            # Uploads which raised are not marked, they are retried on resume:
+            for future in list(pending):
+                if future.done() and future.exception() is None:
+                    complete(future)
+            checkpoint.save()
+
+        return get_statistics(statistics, start)
+    # endregion
+
+
+def get_statistics(statistics, start) -> dict:
+    duration = max(time.monotonic() - start, 1e-9)
+    imported = sum(statistics['counts'][counter] for counter in ('created', 'updated', 'existing'))
+
+    return dict(
+        counts=dict(statistics['counts']),
+        failures=list(statistics['failures']),
+        items=imported,
+        duration=round(duration, 3),
+        items_per_second=round(imported / duration, 1),
+    )
+
+
+def run_module():
+    module_args = dict(
+        scheme=dict(type='str', choices=['http', 'https'], default='http'),
+        repository_host=dict(type='str', required=True),
+        repository_port=dict(type='str', default='8081'),
+        shell_registry_host=dict(type='str', required=False),
+        shell_registry_port=dict(type='str', default='8082'),
+        submodel_registry_host=dict(type='str', required=False),
+        submodel_registry_port=dict(type='str', default='8083'),
+        path=dict(type='path', required=True),
+        collections=dict(type='list', elements='str', choices=list(SNAPSHOT_COLLECTIONS),
+                         default=list(SNAPSHOT_COLLECTIONS)),
+        force=dict(type='bool', default=True),
+        concurrency=dict(type='int', default=8),
+        checkpoint_path=dict(type='path', required=False),
+        checkpoint_interval=dict(type='float', default=5),
+        restart=dict(type='bool', default=False),
+        progress_interval=dict(type='float', default=10),
+        **get_limiter_argument_spec(),
+        **get_metrics_argument_spec(),
+        **get_tracing_argument_spec()
+    )
+
+    result = dict(
+        changed=False,
+        counts=dict(),
+        failures=[],
+        statistics=dict(),
+        checkpoint_path='',
+    )
+
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=False
+    )
+
+    params = module.params
+    scheme = params['scheme']
+    repository_url = f'{scheme}://{params["repository_host"]}:{params["repository_port"]}'
+    shell_registry_url = f'{scheme}://{params["shell_registry_host"] or params["repository_host"]}:{params["shell_registry_port"]}'
+    submodel_registry_url = f'{scheme}://{params["submodel_registry_host"] or params["repository_host"]}:{params["submodel_registry_port"]}'
+    metrics = create_metrics(params)
+    tracer = create_tracer(params, 'snapshot_import')
+    client = SnapshotImportClient(
+        repository_url,
+        shell_registry_url,
+        submodel_registry_url,
+        max_workers=params['concurrency'],
+        force=params['force'],
+        limiter=create_or_fail(module, create_limiter, result),
+        metrics=metrics,
+        tracer=tracer
+    )
+
+    result['checkpoint_path'] = params['checkpoint_path'] or f'{params["path"]}.checkpoint'
+    try:
+        checkpoint = Checkpoint(result['checkpoint_path'], params['path'], params['collections'])
+    except OSError as e:
+        module.fail_json(msg=f'Failed to read {params["path"]}. {e}', **result)
+    if not params['restart']:
+        checkpoint.load()
+
+    def log_progress(statistics):
+        module.log(
+            f'snapshot_import {params["path"]}: {statistics["items"]} items, {statistics["items_per_second"]} items/s'
+        )
+
+    try:
+        statistics = client.import_snapshot(
+            params['path'],
+            checkpoint,
+            collections=set(params['collections']),
+            checkpoint_interval=params['checkpoint_interval'],
+            progress=log_progress,
+            progress_interval=params['progress_interval']
+        )
+    except requests.exceptions.RequestException as e:
+        # Before OSError, which requests' exceptions derive from:
+        module.fail_json(msg=f'Failed to connect, resume with checkpoint {result["checkpoint_path"]}. {e}', **result)
+    except (OSError, ValueError) as e:
+        module.fail_json(msg=f'Failed to read {params["path"]}. {e}', **result)
+
+    result['counts'] = statistics.pop('counts')
+    result['failures'] = statistics.pop('failures')
+    result['statistics'] = statistics
+    result['changed'] = result['counts']['created'] + result['counts']['updated'] > 0
+
+    if metrics is not None:
+        result['metrics'] = metrics.as_dict()
+
+    if result['failures']:
+        module.fail_json(
+            msg=f'Failed to import {result["counts"]["failed"]} items, '
+                f'resume with checkpoint {result["checkpoint_path"]}',
+            **result
+        )
+
+    checkpoint.remove()
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
@@ -20,16 +20,60 @@ description: The module registers a given submodel at a submodel repository
 options:
     submodel:
         description: Facts that shall be converted into a submodel
-        required: true
+        required: false
         type: dict
+    submodels:
+        description: List of submodels that shall be registered in one invocation (instead of 'submodel')
+        required: false
+        type: list
+        elements: dict
+    concurrency:
+        description: Maximum number of parallel uploads when registering 'submodels'
+        required: false
+        type: int
+        default: 4
+    compression:
+        description: Content-Encoding of uploaded submodels. Falls back to uncompressed bodies if the server rejects them.
+        required: false
+        type: str
+        choices: ['none', 'gzip', 'deflate']
+        default: none
+    compression_threshold:
+        description: Minimum size in bytes of a request body before it gets compressed
+        required: false
+        type: int
+        default: 1024
     id:
         description: The id the submodel shall have
         required: true
         type: str
-# Specify this value according to your collection
-# in format of namespace.collection.doc_fragment_name
-# extends_documentation_fragment:
-#     - my_namespace.my_collection.my_doc_fragment_name
+    shard_max_bytes:
+        description:
+            - Shard submodels whose elements are larger than this many bytes (encoded JSON), 0 disables sharding
+            - The top-level elements are split into consecutive groups of up to 'shard_max_bytes', each uploaded
+              as submodel '<id>/shards/<n>' in parallel. A manifest with the id of the submodel lists the shards
+              and the idShorts of their elements, so references to the submodel stay valid.
+            - Shards left over from a previous, larger upload are not deleted, the manifest only lists current ones
+        required: false
+        type: int
+        default: 0
+    shell_id:
+        description: Shell to which references of the uploaded submodels (manifests and shards) are added if missing
+        required: false
+        type: str
+    shell_repository_host:
+        description: Hostname of the shell repository which stores 'shell_id' (defaults to 'host')
+        required: false
+        type: str
+    shell_repository_port:
+        description: Port of the shell repository which stores 'shell_id' (defaults to 'port')
+        required: false
+        type: str
+extends_documentation_fragment:
+    - slm.aas.limiter
+    - slm.aas.metrics
+    - slm.aas.tracing
+    - slm.aas.validation
 
 author:
     - Benjamin Goetz (@ipa-big)
@@ -43,6 +87,21 @@ EXAMPLES = r'''
   slm.aas.convert_to_sm:
     facts: {{ ansible_facts }}
     id: submodel_id
+
+- name: Upload large facts submodels as shards of up to 256 KB and reference them on the shell
+  slm.aas.submodel:
+    host: localhost
+    port: 8081
+    submodel: "{{ convert_result.submodel }}"
+    shard_max_bytes: 262144
+    shell_id: https://example.com/ids/aas/host1
+
+- name: Register multiple submodels at once
+  slm.aas.submodel:
+    host: localhost
+    port: 8081
+    submodels: "{{ converted_submodels }}"
+    concurrency: 8
 '''
 
 RETURN = r'''
@@ -52,6 +111,32 @@ submodel:
     type: dict
     returned: always
     sample: 'hello world'
+results:
+    description: Per submodel results when 'submodels' is used (id, status_code, changed, reference, submodel_descriptor).
+    type: list
+    returned: when submodels is defined
+shards:
+    description: Per shard results (id, status_code, changed, reference, submodel_descriptor) of a sharded submodel.
+        Also set on the items of 'results' whose submodel was sharded.
+    type: list
+    returned: when submodel was sharded
+shell_references:
+    description: Status code per submodel id of the references added to 'shell_id' (existing ones are skipped).
+    type: dict
+    returned: when shell_id is defined
+transfer:
+    description: Bytes on the wire (compressed) and uncompressed for requests sent to the submodel repository.
+    type: dict
+    returned: always
+validation_errors:
+    description: Errors of the invalid document (JSON path and message), if 'validate' is enabled.
+    type: list
+    elements: str
+    returned: when validation fails
+metrics:
+    description: Time per phase, request counters and peak RSS of the module, if 'metrics' is enabled.
+    type: dict
+    returned: when metrics is true
 '''
 try:
     from ansible.module_utils.basic import AnsibleModule
@@ -59,108 +144,65 @@ except ModuleNotFoundError as e:
     print(e)
     print("Skip import of AnsibleModule (for Testing only)")
 
-import base64
-import json
-from json import JSONDecodeError
-
-import requests
-from basyx.aas import model
-from basyx.aas.adapter.json import AASToJsonEncoder
-from basyx.aas.model import ModelReference, Key, KeyTypes
-
-
-class SmRepoClient:
-    def __init__(self, url):
-        self.url = url
-
-    # region UTILS:
-    def cast_sm_to_dict(self, submodel) -> dict:
-        return json.loads(
-            json.dumps(submodel, cls=AASToJsonEncoder)
-        )
-
-    def get_sm_as_dict(self, submodel) -> dict:
-        if isinstance(submodel, model.Submodel):
-            submodel = self.cast_sm_to_dict(submodel)
-        return submodel
-
-    def get_encrypted_sm_id_from_submodel(self, submodel) -> str:
-        if isinstance(submodel, dict):
-            return base64.b64encode(bytes(submodel['id'], 'utf-8')).decode('ascii')
-        else:
-            return base64.b64encode(bytes(submodel.id, 'utf-8')).decode('ascii')
-
-    def get_encrypted_sm_id_from_id(self, sm_id: str) -> str:
-        return base64.b64encode(bytes(sm_id, 'utf-8')).decode('ascii')
-
-    def return_response(self, response):
-        try:
-            return response.status_code, json.loads(response.content)
-        except JSONDecodeError:
-            return response.status_code, ''
-
-    # endregion
-
-    # region CRUD
-    def create(self, submodel, force=False):
-        path = '/submodels'
-
-        if isinstance(submodel, model.Submodel):
-            submodel = self.cast_sm_to_dict(submodel)
-
-        r = requests.post(
-            url=f'{self.url}{path}',
-            json=self.get_sm_as_dict(submodel),
-        )
-
-        if r.status_code == 409 and force:
-            return self.update(submodel)
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.compression import COMPRESSION_ENCODINGS, \
+        DEFAULT_COMPRESSION_THRESHOLD
+except ImportError:
+    from plugins.module_utils.compression import COMPRESSION_ENCODINGS, DEFAULT_COMPRESSION_THRESHOLD
 
-        return self.return_response(r)
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.limiter import create_limiter, get_limiter_argument_spec
+except ImportError:
+    from plugins.module_utils.limiter import create_limiter, get_limiter_argument_spec
 
-    def update(self, submodel):
-        path = f'/submodels/{self.get_encrypted_sm_id_from_submodel(submodel)}'
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.private_dir import create_or_fail
+except ImportError:
+    from plugins.module_utils.private_dir import create_or_fail
 
-        return self.return_response(
-            requests.put(
-                url=f'{self.url}{path}',
-                json=self.get_sm_as_dict(submodel),
-            )
-        )
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.metrics import create_metrics, get_metrics_argument_spec
+except ImportError:
+    from plugins.module_utils.metrics import create_metrics, get_metrics_argument_spec
 
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.tracing import create_tracer, get_tracing_argument_spec
+except ImportError:
+    from plugins.module_utils.tracing import create_tracer, get_tracing_argument_spec
 
-        try:
-            return r.status_code, json.loads(r.content)
-        except JSONDecodeError:
-            return r.status_code, ''
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.submodel_repository import SmRepoClient, get_reference, \
+        get_submodel_descriptor
+except ImportError:
+    from plugins.module_utils.submodel_repository import SmRepoClient, get_reference, get_submodel_descriptor
 
-    def get_all(self):
-        path = '/submodels'
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.shell_repository import ShellRepoClient
+except ImportError:
+    from plugins.module_utils.shell_repository import ShellRepoClient
 
-        return self.return_response(
-            requests.get(
-                url=f'{self.url}{path}'
-            )
-        )
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.sharding import get_sharding_argument_spec, shard_submodel
+except ImportError:
+    from plugins.module_utils.sharding import get_sharding_argument_spec, shard_submodel
 
-    def get_one(self, sm_id: str):
-        path = f'/submodels/{self.get_encrypted_sm_id_from_id(sm_id)}'
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.validation import get_validation_argument_spec, \
+        validate_submodel
+except ImportError:
+    from plugins.module_utils.validation import get_validation_argument_spec, validate_submodel
 
-        return self.return_response(
-            requests.get(
-                url=f'{self.url}{path}'
-            )
-        )
+import requests
 
-    def delete(self, sm_id: str):
-        path = f'/submodels/{self.get_encrypted_sm_id_from_id(sm_id)}'
 
-        return self.return_response(
-            requests.delete(
-                url=f'{self.url}{path}'
-            )
-        )
-    # endregion
+def get_upload_result(client, sm_repo_url: str, sm_id: str, status_code) -> dict:
+    return dict(
+        id=sm_id,
+        status_code=status_code,
+        changed=status_code == 201,
+        reference=get_reference(sm_id),
+        submodel_descriptor=get_submodel_descriptor(sm_repo_url, sm_id, client.get_encrypted_sm_id_from_id(sm_id))
+    )
 
 
 def run_module():
@@ -168,8 +210,20 @@ def run_module():
         scheme=dict(type='str', choices=['http', 'https'], default='http'),
         host=dict(type='str', required=True),
         port=dict(type='str', default='8081'),
-        submodel=dict(type='dict', required=True),
-        force=dict(type='bool', default=True)
+        submodel=dict(type='dict', required=False),
+        submodels=dict(type='list', elements='dict', required=False),
+        concurrency=dict(type='int', default=4),
+        compression=dict(type='str', choices=['none'] + list(COMPRESSION_ENCODINGS), default='none'),
+        compression_threshold=dict(type='int', default=DEFAULT_COMPRESSION_THRESHOLD),
+        force=dict(type='bool', default=True),
+        shell_id=dict(type='str', required=False),
+        shell_repository_host=dict(type='str', required=False),
+        shell_repository_port=dict(type='str', required=False),
+        **get_limiter_argument_spec(),
+        **get_metrics_argument_spec(),
+        **get_tracing_argument_spec(),
+        **get_validation_argument_spec(),
+        **get_sharding_argument_spec()
     )
 
     result = dict(
@@ -180,47 +234,92 @@ def run_module():
 
     module = AnsibleModule(
         argument_spec=module_args,
-        supports_check_mode=False
+        supports_check_mode=False,
+        required_one_of=[('submodel', 'submodels')],
+        mutually_exclusive=[('submodel', 'submodels')],
     )
 
+    if module.params['validate']:
+        # Invalid submodels fail before anything is uploaded:
+        for submodel in module.params['submodels'] or [module.params['submodel']]:
+            validation_errors = validate_submodel(submodel)
+            if validation_errors:
+                module.fail_json(
+                    msg=f'Submodel {submodel.get("id")} is invalid. {validation_errors[0]}',
+                    validation_errors=validation_errors,
+                    **result
+                )
+
     sm_repo_url = f'{module.params["scheme"]}://{module.params["host"]}:{module.params["port"]}'
-    client = SmRepoClient(sm_repo_url)
+    metrics = create_metrics(module.params)
+    tracer = create_tracer(module.params, 'submodel')
+    limiter = create_or_fail(module, create_limiter, result)
+    client = SmRepoClient(
+        sm_repo_url,
+        max_workers=module.params['concurrency'],
+        compression=None if module.params['compression'] == 'none' else module.params['compression'],
+        compression_threshold=module.params['compression_threshold'],
+        limiter=limiter,
+        metrics=metrics,
+        tracer=tracer
+    )
+
+    submodels = module.params['submodels'] or [module.params['submodel']]
+    # Each submodel is uploaded as it is or as its manifest followed by its shards:
+    parts = [shard_submodel(submodel, module.params['shard_max_bytes']) for submodel in submodels]
 
     try:
-        status_code, content = client.create(
-            module.params['submodel'],
-            module.params['force']
-        )
-        if status_code == 201:
-            result['changed'] = True
+        responses = iter(client.create_many([part for item in parts for part in item], module.params['force']))
     except requests.exceptions.ConnectionError as e:
         module.fail_json(msg=f'Failed to connect to {sm_repo_url}. {e}', **result)
 
-    sm_id = module.params['submodel']['id']
-    sm_id_enc = client.get_encrypted_sm_id_from_id(sm_id)
-    sm_url =  f'{sm_repo_url}/{sm_id_enc}'
-
-    result['reference'] = json.loads(
-        json.dumps(
-            ModelReference(
-                key=[Key(type_=KeyTypes.SUBMODEL, value=sm_id)],
-                type_=ModelReference.__name__
-            ),
-            cls=AASToJsonEncoder
-        )
-    )
-
-    result['submodel_descriptor'] = {
-        "id": sm_id,
-        "endpoints": [
-            {
-                "interface": "http",
-                "protocolInformation": {
-                    "href": sm_url
-                }
-            }
+    results = []
+    for item in parts:
+        upload_results = [
+            get_upload_result(client, sm_repo_url, part['id'], next(responses)[0])
+            for part in item
         ]
-    }
+        upload_result = upload_results[0]
+        if len(upload_results) > 1:
+            upload_result['shards'] = upload_results[1:]
+            upload_result['changed'] = any(shard['changed'] for shard in upload_results)
+        results.append(upload_result)
+
+    if module.params['submodels'] is not None:
+        result['results'] = results
+        result['changed'] = any(item['changed'] for item in results)
+    else:
+        result.update(results[0])
+        result.pop('id')
+        result.pop('status_code')
+
+    if module.params['shell_id'] is not None:
+        shell_repo_host = module.params['shell_repository_host'] or module.params['host']
+        shell_repo_port = module.params['shell_repository_port'] or module.params['port']
+        shell_repo_url = f'{module.params["scheme"]}://{shell_repo_host}:{shell_repo_port}'
+        shell_client = ShellRepoClient(
+            shell_repo_url,
+            max_workers=module.params['concurrency'],
+            limiter=limiter,
+            metrics=metrics,
+            tracer=tracer
+        )
+        sm_ids = [part['id'] for item in parts for part in item]
+        try:
+            responses = shell_client.add_submodel_references(
+                module.params['shell_id'], [get_reference(sm_id) for sm_id in sm_ids]
+            )
+        except (requests.exceptions.ConnectionError, requests.exceptions.HTTPError) as e:
+            module.fail_json(msg=f'Failed to add submodel references to {module.params["shell_id"]}. {e}', **result)
+        # Existing references are answered with 200 without a request:
+        result['shell_references'] = {
+            sm_id: status_code for sm_id, (status_code, content) in zip(sm_ids, responses) if status_code != 200
+        }
+        result['changed'] = result['changed'] or any(status_code == 201 for status_code, content in responses)
+
+    result['transfer'] = client.transfer_stats.as_dict()
+    if metrics is not None:
+        result['metrics'] = metrics.as_dict()
 
     module.exit_json(**result)
 
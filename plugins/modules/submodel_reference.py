@@ -35,17 +35,30 @@ options:
         required: true
         type: str
     submodel_reference:
-        description: Submodel Reference that shall be registered
-        required: true
+        description: Submodel Reference that shall be registered or deleted
+        required: false
         type: dict
+    submodel_references:
+        description:
+            - List of Submodel References that shall be registered or deleted (instead of 'submodel_reference')
+            - The references of the shell are fetched once, only missing (present) or existing (absent) ones are sent
+        required: false
+        type: list
+        elements: dict
+    concurrency:
+        description: Maximum number of parallel requests when using 'submodel_references'
+        required: false
+        type: int
+        default: 4
     shell_id:
         description: The id of the Shell the submodel reference shall be registered in
         required: true
         type: str
-# Specify this value according to your collection
-# in format of namespace.collection.doc_fragment_name
-# extends_documentation_fragment:
-#     - my_namespace.my_collection.my_doc_fragment_name
+extends_documentation_fragment:
+    - slm.aas.cache
+    - slm.aas.limiter
+    - slm.aas.metrics
+    - slm.aas.tracing
 
 author:
     - Benjamin Goetz (@ipa-big)
@@ -61,116 +74,77 @@ EXAMPLES = r'''
     state: present
     submodel_reference: {{ submodel_reference }}
     shell_id: aas-shell-id
+
+- name: Register multiple Submodel References
+  slm.aas.submodel_reference:
+    host: localhost
+    port: 8081
+    state: present
+    submodel_references: "{{ register_sm.results | map(attribute='reference') }}"
+    shell_id: aas-shell-id
+
+- name: Delete Submodel References
+  slm.aas.submodel_reference:
+    host: localhost
+    port: 8081
+    state: absent
+    submodel_references: "{{ submodel_references }}"
+    shell_id: aas-shell-id
 '''
 
-RETURN = r''''''
+RETURN = r'''
+results:
+    description: Per reference results when 'submodel_references' is used (submodel_id, status_code, changed).
+    type: list
+    returned: when submodel_references is defined
+metrics:
+    description: Time per phase, request counters and peak RSS of the module, if 'metrics' is enabled.
+    type: dict
+    returned: when metrics is true
+'''
 try:
     from ansible.module_utils.basic import AnsibleModule
 except ModuleNotFoundError as e:
     print(e)
     print("Skip import of AnsibleModule (for Testing only)")
 
-import base64
-import json
-from json import JSONDecodeError
-
-import requests
-from basyx.aas.adapter.json import AASToJsonEncoder
-from basyx.aas.model import AssetAdministrationShell, ModelReference
-
-
-class ShellRepoClient:
-    def __init__(self, url):
-        self.url = url
-
-    # region UTILS
-    def return_response(self, response):
-        try:
-            return response.status_code, json.loads(response.content)
-        except JSONDecodeError:
-            return response.status_code, ''
-
-    def cast_to_dict(self, shell: AssetAdministrationShell) -> dict:
-        return json.loads(
-            json.dumps(shell, cls=AASToJsonEncoder)
-        )
-
-    def get_encrypted_id(self, decoded_id: str) -> str:
-        return base64.b64encode(bytes(decoded_id, 'utf-8')).decode('ascii')
-
-    def sm_id_exists_in_keys(self, sm_id, submodel_ref):
-        return any(sm_id == key['value'] for key in submodel_ref['keys'])
-    # endregion
-
-    # region CRUD
-    def get_shells(self):
-        path = '/shells'
-
-        return self.return_response(
-            requests.get(
-                url=f'{self.url}{path}'
-            )
-        )
-
-    def get_shell(self, shell_id):
-        path = f'/shells/{self.get_encrypted_id(shell_id)}'
-
-        return self.return_response(
-            requests.get(
-                url=f'{self.url}{path}'
-            )
-        )
-
-    def get_submodel_references(self, shell_id):
-        path = f'/shells/{self.get_encrypted_id(shell_id)}/submodel-refs'
-
-        return self.return_response(
-            requests.get(
-                url=f'{self.url}{path}'
-            )
-        )
-
-    def create_shell(self, shell):
-        path = '/shells'
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.shell_repository import ShellRepoClient
+except ImportError:
+    from plugins.module_utils.shell_repository import ShellRepoClient
 
-        if isinstance(shell, AssetAdministrationShell):
-            shell = self.cast_to_dict(shell)
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.cache import create_cache, get_cache_argument_spec
+except ImportError:
+    from plugins.module_utils.cache import create_cache, get_cache_argument_spec
 
-        return self.return_response(
-            requests.post(
-                url=f'{self.url}{path}',
-                json=shell
-            )
-        )
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.private_dir import create_or_fail
+except ImportError:
+    from plugins.module_utils.private_dir import create_or_fail
 
-    def add_submodel_reference(self, shell_id, submodel_reference: ModelReference):
-        path = f'/shells/{self.get_encrypted_id(shell_id)}/submodel-refs'
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.limiter import create_limiter, get_limiter_argument_spec
+except ImportError:
+    from plugins.module_utils.limiter import create_limiter, get_limiter_argument_spec
 
-        if isinstance(submodel_reference, ModelReference):
-            submodel_reference = self.cast_to_dict(submodel_reference)
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.metrics import create_metrics, get_metrics_argument_spec
+except ImportError:
+    from plugins.module_utils.metrics import create_metrics, get_metrics_argument_spec
 
-        code, shell = self.get_shell(shell_id)
-        if shell is not None and 'submodels' in shell:
-            sm_id_to_be_created = submodel_reference['keys'][0]['value']
-            if any(self.sm_id_exists_in_keys(sm_id_to_be_created, submodel) for submodel in shell['submodels']):
-                return 200, self.cast_to_dict(submodel_reference)
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.tracing import create_tracer, get_tracing_argument_spec
+except ImportError:
+    from plugins.module_utils.tracing import create_tracer, get_tracing_argument_spec
 
-        return self.return_response(
-            requests.post(
-                url=f'{self.url}{path}',
-                json=self.cast_to_dict(submodel_reference)
-            )
-        )
+import requests
 
-    def delete_submodel_reference(self, shell_id, submodel_id):
-        path = f'/shells/{self.get_encrypted_id(shell_id)}/submodel-refs/{self.get_encrypted_id(submodel_id)}'
 
-        return self.return_response(
-            requests.delete(
-                url=f'{self.url}{path}'
-            )
-        )
-    # endregion
+def is_changed(state, status_code) -> bool:
+    if state == 'present':
+        return status_code == 201
+    return status_code in [200, 204]
 
 
 def run_module():
@@ -179,8 +153,14 @@ def run_module():
         host=dict(type='str', required=True),
         port=dict(type='str', default='8081'),
         state=dict(type='str', choices=['present', 'absent'], default='present'),
-        submodel_reference=dict(type='dict', required=True),
-        shell_id=dict(type='str', required=True)
+        submodel_reference=dict(type='dict', required=False),
+        submodel_references=dict(type='list', elements='dict', required=False),
+        concurrency=dict(type='int', default=4),
+        shell_id=dict(type='str', required=True),
+        **get_cache_argument_spec(),
+        **get_limiter_argument_spec(),
+        **get_metrics_argument_spec(),
+        **get_tracing_argument_spec()
     )
 
     result = dict(
@@ -189,22 +169,59 @@ def run_module():
 
     module = AnsibleModule(
         argument_spec=module_args,
-        supports_check_mode=False
+        supports_check_mode=False,
+        required_one_of=[('submodel_reference', 'submodel_references')],
+        mutually_exclusive=[('submodel_reference', 'submodel_references')],
     )
 
     shell_repo_url = f'{module.params["scheme"]}://{module.params["host"]}:{module.params["port"]}'
-    client = ShellRepoClient(shell_repo_url)
+    metrics = create_metrics(module.params)
+    tracer = create_tracer(module.params, 'submodel_reference')
+    client = ShellRepoClient(
+        shell_repo_url,
+        max_workers=module.params['concurrency'],
+        cache=create_or_fail(module, create_cache, result),
+        limiter=create_or_fail(module, create_limiter, result),
+        metrics=metrics,
+        tracer=tracer
+    )
+    shell_id = module.params['shell_id']
+    state = module.params['state']
 
     try:
-        status_code, content = client.add_submodel_reference(
-            shell_id=module.params['shell_id'],
-            submodel_reference=module.params['submodel_reference']
-        )
-
-        if status_code == 201:
-            result['changed'] = True
+        if module.params['submodel_references'] is not None:
+            submodel_references = module.params['submodel_references']
+            sm_ids = [client.get_sm_id_from_reference(submodel_reference) for submodel_reference in submodel_references]
+
+            if state == 'present':
+                responses = client.add_submodel_references(shell_id, submodel_references)
+            else:
+                responses = client.delete_submodel_references(shell_id, sm_ids)
+
+            result['results'] = [
+                dict(submodel_id=sm_id, status_code=status_code, changed=is_changed(state, status_code))
+                for sm_id, (status_code, content) in zip(sm_ids, responses)
+            ]
+            result['changed'] = any(item['changed'] for item in result['results'])
+        elif state == 'present':
+            status_code, content = client.add_submodel_reference(
+                shell_id=shell_id,
+                submodel_reference=module.params['submodel_reference']
+            )
+            result['changed'] = is_changed(state, status_code)
+        else:
+            status_code, content = client.delete_submodel_reference(
+                shell_id=shell_id,
+                submodel_id=client.get_sm_id_from_reference(module.params['submodel_reference'])
+            )
+            result['changed'] = is_changed(state, status_code)
     except requests.exceptions.ConnectionError as e:
         module.fail_json(msg=f'Failed to connect to {shell_repo_url}. {e}', **result)
+    except requests.exceptions.HTTPError as e:
+        module.fail_json(msg=f'Failed to get submodel references of shell {shell_id}. {e}', **result)
+
+    if metrics is not None:
+        result['metrics'] = metrics.as_dict()
 
     module.exit_json(**result)
 
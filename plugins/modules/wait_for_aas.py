@@ -0,0 +1,245 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2024, Benjamin Goetz <benjamin.goetz@ipa.fraunhofer.de>
+# Apache 2.0
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: wait_for_aas
+
+short_description: Waits until AAS repositories and registries are ready
+
+# If this is part of a collection, you need to use semantic versioning,
+# i.e. the version is of the form "2.5.0" and not "2.4".
+version_added: "1.0.0"
+
+description:
+    - The module probes the health endpoint of each of 'urls' concurrently, e.g. after the AAS environment and
+      registry containers were started.
+    - An endpoint is ready once it answers with 200 and, for a JSON body with a 'status' (Spring Boot actuator),
+      the status is 'UP'. Failed probes are repeated with exponential backoff.
+    - The module returns as soon as all endpoints are ready and fails if one is not ready within 'timeout'.
+
+options:
+    urls:
+        description: Base urls of the repositories and registries, e.g. 'http://localhost:8081'
+        required: true
+        type: list
+        elements: str
+    health_path:
+        description:
+            - Path probed on each url, e.g. '/swagger-ui/index.html' for components without actuator
+        required: false
+        type: str
+        default: /actuator/health
+    timeout:
+        description: Seconds to wait for all endpoints to become ready
+        required: false
+        type: float
+        default: 300
+    request_timeout:
+        description: Seconds to wait for the response of a single probe
+        required: false
+        type: float
+        default: 2
+    initial_interval:
+        description: Seconds to wait after the first failed probe, doubled after every further failed probe
+        required: false
+        type: float
+        default: 0.1
+    max_interval:
+        description: Maximum number of seconds to wait between two probes of an endpoint
+        required: false
+        type: float
+        default: 5
+extends_documentation_fragment:
+    - slm.aas.metrics
+    - slm.aas.tracing
+
+author:
+    - Benjamin Goetz (@ipa-big)
+'''
+
+EXAMPLES = r'''
+- name: Wait for AAS environment and registries
+  slm.aas.wait_for_aas:
+    urls:
+      - http://localhost:8081
+      - http://localhost:8082
+      - http://localhost:8083
+    timeout: 120
+
+- name: Wait for a component without actuator
+  slm.aas.wait_for_aas:
+    urls: [http://localhost:8081]
+    health_path: /swagger-ui/index.html
+'''
+
+RETURN = r'''
+endpoints:
+    description: Per url whether it is ready, the number of probes, seconds until it was ready and the last status
+        code or error.
+    type: dict
+    returned: always
+elapsed:
+    description: Seconds until all endpoints were ready (or the timeout was reached).
+    type: float
+    returned: always
+metrics:
+    description: Time per phase, request counters and peak RSS of the module, if 'metrics' is enabled.
+    type: dict
+    returned: when metrics is true
+'''
+try:
+    from ansible.module_utils.basic import AnsibleModule
+except ModuleNotFoundError as e:
+    print(e)
+    print("Skip import of AnsibleModule (for Testing only)")
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.session import create_session
+except ImportError:
+    from plugins.module_utils.session import create_session
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.metrics import create_metrics, get_metrics_argument_spec
+except ImportError:
+    from plugins.module_utils.metrics import create_metrics, get_metrics_argument_spec
+
+try:
+    from ansible_collections.slm.aas.plugins.module_utils.tracing import create_tracer, get_tracing_argument_spec
+except ImportError:
+    from plugins.module_utils.tracing import create_tracer, get_tracing_argument_spec
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from json import JSONDecodeError
+
+import requests
+
+DEFAULT_HEALTH_PATH = '/actuator/health'
+READY_STATUS = 'UP'
+
+
+class ReadinessProbe:
+    def __init__(self, health_path=DEFAULT_HEALTH_PATH, request_timeout=2, initial_interval=0.1, max_interval=5,
+                 max_workers=1, metrics=None, tracer=None):
+        self.health_path = health_path
+        self.request_timeout = request_timeout
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+
+        self.session = create_session(
+            pool_maxsize=1, pool_connections=max(max_workers, 1), metrics=metrics, tracer=tracer
+        )
+
+    def probe(self, url, timeout):
+        """Probes the health endpoint of 'url' once, returns whether it is ready and the status code or error."""
+        try:
+            response = self.session.get(url=f'{url.rstrip("/")}{self.health_path}', timeout=timeout)
+        except requests.exceptions.RequestException as e:
+            return False, type(e).__name__
+
+        if response.status_code != 200:
+            return False, response.status_code
+        try:
+            content = json.loads(response.content)
+        except (JSONDecodeError, UnicodeDecodeError):
+            return True, response.status_code
+        if isinstance(content, dict) and 'status' in content:
+            return content['status'] == READY_STATUS, response.status_code
+        return True, response.status_code
+
+    def wait(self, url, deadline) -> dict:
+        """Probes 'url' until it is ready or 'deadline' (time.monotonic()) has passed."""
+        start = time.monotonic()
+        interval = self.initial_interval
+        attempts = 0
+
+        while True:
+            remaining = deadline - time.monotonic()
+            attempts += 1
+            ready, status = self.probe(url, max(min(self.request_timeout, remaining), 0.001))
+
+            now = time.monotonic()
+            if ready or now >= deadline:
+                return dict(
+                    ready=ready,
+                    attempts=attempts,
+                    elapsed=round(now - start, 3),
+                    status=status,
+                )
+
+            # Backoff, but never sleep past the deadline, so the last probe is sent right before it:
+            time.sleep(min(interval, deadline - now))
+            interval = min(interval * 2, self.max_interval)
+
+    def wait_all(self, urls, timeout) -> dict:
+        urls = list(dict.fromkeys(urls))
+        deadline = time.monotonic() + timeout
+
+        with ThreadPoolExecutor(max_workers=max(len(urls), 1)) as executor:
+            return dict(zip(urls, executor.map(lambda url: self.wait(url, deadline), urls)))
+
+
+def run_module():
+    module_args = dict(
+        urls=dict(type='list', elements='str', required=True),
+        health_path=dict(type='str', default=DEFAULT_HEALTH_PATH),
+        timeout=dict(type='float', default=300),
+        request_timeout=dict(type='float', default=2),
+        initial_interval=dict(type='float', default=0.1),
+        max_interval=dict(type='float', default=5),
+        **get_metrics_argument_spec(),
+        **get_tracing_argument_spec()
+    )
+
+    result = dict(
+        changed=False,
+        endpoints=dict(),
+        elapsed=0,
+    )
+
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True
+    )
+
+    metrics = create_metrics(module.params)
+    tracer = create_tracer(module.params, 'wait_for_aas')
+    probe = ReadinessProbe(
+        health_path=module.params['health_path'],
+        request_timeout=module.params['request_timeout'],
+        initial_interval=module.params['initial_interval'],
+        max_interval=module.params['max_interval'],
+        max_workers=len(module.params['urls']),
+        metrics=metrics,
+        tracer=tracer
+    )
+
+    start = time.monotonic()
+    result['endpoints'] = probe.wait_all(module.params['urls'], module.params['timeout'])
+    result['elapsed'] = round(time.monotonic() - start, 3)
+
+    if metrics is not None:
+        result['metrics'] = metrics.as_dict()
+
+    not_ready = [url for url, endpoint in result['endpoints'].items() if not endpoint['ready']]
+    if not_ready:
+        module.fail_json(
+            msg=f'Not ready after {module.params["timeout"]} seconds: {", ".join(not_ready)}',
+            **result
+        )
+
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+"""Throughput benchmark of the client classes against a local fake AAS server.
+
+Run from the repository root, e.g.:
+
+    python -m tests.benchmark.benchmark --concurrency 1 4 16 --payload-sizes 10 1000 --latency 0.005
+"""
+import argparse
+import itertools
+import json
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from plugins.modules.aas import ShellRepoClient
+from plugins.modules.aas_descriptor import SmRegistryClient
+from plugins.modules.submodel import SmRepoClient
+from tests.benchmark.fake_server import FakeAasServer
+
+SCENARIOS = ('submodel_create', 'submodel_get', 'shell_create', 'descriptor_register')
+
+
+def get_submodel(sm_id, payload_size) -> dict:
+    return dict(
+        modelType='Submodel',
+        id=sm_id,
+        idShort='Benchmark',
+        submodelElements=[
+            dict(modelType='Property', idShort=f'Property{i}', valueType='xs:string', value=f'value {i}')
+            for i in range(payload_size)
+        ],
+    )
+
+
+def get_shell(shell_id, payload_size) -> dict:
+    return dict(
+        modelType='AssetAdministrationShell',
+        id=shell_id,
+        idShort='Benchmark',
+        assetInformation=dict(assetKind='Instance', globalAssetId=f'{shell_id}:asset'),
+        submodels=[
+            dict(type='ModelReference', keys=[dict(type='Submodel', value=f'{shell_id}:sm:{i}')])
+            for i in range(payload_size)
+        ],
+    )
+
+
+def get_descriptor(shell_id, payload_size) -> dict:
+    return dict(
+        id=shell_id,
+        idShort='Benchmark',
+        endpoints=[
+            dict(interface='AAS-3.0', protocolInformation=dict(href=f'http://localhost/shells/{i}'))
+            for i in range(payload_size)
+        ],
+    )
+
+
+def get_percentile(values, percentile):
+    # Nearest-rank percentile of sorted values:
+    if not values:
+        return None
+    return values[max(math.ceil(percentile / 100 * len(values)), 1) - 1]
+
+
+def get_operation(scenario, url, concurrency, payload_size, prefix):
+    if scenario == 'submodel_create':
+        client = SmRepoClient(url, max_workers=concurrency)
+        return lambda i: client.create(get_submodel(f'{prefix}:{i}', payload_size), force=True)[0]
+
+    if scenario == 'submodel_get':
+        client = SmRepoClient(url, max_workers=concurrency)
+        sm_id = f'{prefix}:get'
+        client.create(get_submodel(sm_id, payload_size), force=True)
+        return lambda i: client.get_one(sm_id)[0]
+
+    if scenario == 'shell_create':
+        client = ShellRepoClient(url)
+        return lambda i: client.create_shell(get_shell(f'{prefix}:{i}', payload_size))[0]
+
+    if scenario == 'descriptor_register':
+        client = SmRegistryClient(url)
+        return lambda i: client.register_descriptor(get_descriptor(f'{prefix}:{i}', payload_size))[0]
+
+    raise ValueError(f'Unknown scenario: {scenario}')
+
+
+def run_benchmark(server, scenario, concurrency=1, payload_size=10, operations=100) -> dict:
+    """Runs 'operations' client calls of 'scenario' with 'concurrency' threads and returns their statistics.
+
+    Latencies are measured per client call (which may send more than one request), bytes and requests are counted
+    by the server.
+    """
+    prefix = f'urn:benchmark:{scenario}:{concurrency}:{payload_size}:{time.monotonic_ns()}'
+    operation = get_operation(scenario, server.url, concurrency, payload_size, prefix)
+    server.reset_stats()
+
+    def timed_operation(i):
+        start = time.perf_counter()
+        try:
+            status_code = operation(i)
+        except requests.exceptions.RequestException:
+            status_code = None
+        return time.perf_counter() - start, status_code
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as executor:
+        results = list(executor.map(timed_operation, range(operations)))
+    duration = time.perf_counter() - start
+
+    latencies = sorted(latency for latency, status_code in results)
+    failed = sum(1 for latency, status_code in results if status_code is None or status_code >= 400)
+    stats = server.stats.as_dict()
+
+    return dict(
+        scenario=scenario,
+        concurrency=concurrency,
+        payload_size=payload_size,
+        operations=operations,
+        failed=failed,
+        duration=round(duration, 6),
+        operations_per_second=round(operations / duration, 2),
+        requests_per_second=round(stats['requests'] / duration, 2),
+        latency_p50_ms=round(get_percentile(latencies, 50) * 1000, 3),
+        latency_p99_ms=round(get_percentile(latencies, 99) * 1000, 3),
+        requests=stats['requests'],
+        bytes_sent=stats['bytes_received'],
+        bytes_received=stats['bytes_sent'],
+    )
+
+
+def format_table(results) -> str:
+    columns = (
+        'scenario', 'concurrency', 'payload_size', 'operations', 'failed', 'operations_per_second',
+        'requests_per_second', 'latency_p50_ms', 'latency_p99_ms', 'bytes_sent', 'bytes_received',
+    )
+    rows = [columns] + [tuple(str(result[column]) for column in columns) for result in results]
+    widths = [max(len(row[i]) for row in rows) for i in range(len(columns))]
+    return '\n'.join('  '.join(value.rjust(width) for value, width in zip(row, widths)) for row in rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument('--concurrency', nargs='+', type=int, default=[1, 4, 16])
+    parser.add_argument('--payload-sizes', nargs='+', type=int, default=[10, 1000],
+                        help='Number of submodel elements, submodel references or endpoints per payload')
+    parser.add_argument('--operations', type=int, default=200, help='Client calls per run')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Random seconds added on top of the latency')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of requests answered with an error')
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--json', action='store_true', help='Print one JSON object per run')
+    args = parser.parse_args()
+
+    results = []
+    with FakeAasServer(args.latency, args.jitter, args.error_rate, args.error_status) as server:
+        for scenario, concurrency, payload_size in itertools.product(
+                args.scenarios, args.concurrency, args.payload_sizes):
+            result = run_benchmark(server, scenario, concurrency, payload_size, args.operations)
+            results.append(result)
+            if args.json:
+                print(json.dumps(result), flush=True)
+
+    if not args.json:
+        print(format_table(results))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,288 @@
+import base64
+import gzip
+import json
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+COLLECTIONS = ('shells', 'submodels', 'shell-descriptors', 'submodel-descriptors')
+DEFAULT_LIMIT = 100
+# Path segments following an item id, neither '$' nor '-' occur in base64:
+ITEM_SEGMENTS = ('$value', '$metadata', 'submodel-refs')
+
+
+def decode_id(encoded_id: str) -> str:
+    # The clients encode ids with standard base64, which may contain '/' and '+':
+    encoded_id = unquote(encoded_id)
+    return base64.b64decode(encoded_id + '=' * (-len(encoded_id) % 4)).decode('utf-8')
+
+
+def split_path(path: str) -> list:
+    """Splits 'path' into the collection, the decoded item id and the segments after it.
+
+    An encoded id may contain '/', it ends at the first segment after it which can not be part of an id.
+    """
+    segments = path.strip('/').split('/')
+    if len(segments) < 2 or segments[0] not in COLLECTIONS:
+        return segments
+
+    end = next((index for index in range(2, len(segments)) if segments[index] in ITEM_SEGMENTS), len(segments))
+    rest = segments[end:]
+    if rest[0:1] == ['submodel-refs'] and len(rest) > 1:
+        rest = [rest[0], decode_id('/'.join(rest[1:]))]
+    return [segments[0], decode_id('/'.join(segments[1:end]))] + rest
+
+
+def decompress(body: bytes, encoding) -> bytes:
+    if encoding == 'gzip':
+        return gzip.decompress(body)
+    elif encoding == 'deflate':
+        return zlib.decompress(body)
+    return body
+
+
+def get_reference_id(reference) -> str:
+    return reference['keys'][0]['value']
+
+
+class ServerStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = dict()
+        self.errors = 0
+        self.bytes_received = 0
+        self.bytes_sent = 0
+
+    def record(self, method, bytes_received, bytes_sent, error=False):
+        with self.lock:
+            self.requests[method] = self.requests.get(method, 0) + 1
+            self.bytes_received += bytes_received
+            self.bytes_sent += bytes_sent
+            self.errors += int(error)
+
+    def as_dict(self) -> dict:
+        with self.lock:
+            return dict(
+                requests=sum(self.requests.values()),
+                requests_per_method=dict(self.requests),
+                errors=self.errors,
+                bytes_received=self.bytes_received,
+                bytes_sent=self.bytes_sent,
+            )
+
+
+class FakeAasHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately, with Nagle's algorithm every response would wait for a delayed ACK:
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_body(self, method, status_code, content=None, error=False):
+        body = json.dumps(content).encode('utf-8') if content is not None else b''
+        # Recorded before the response is sent, a client reading the stats after its last response sees all requests:
+        self.server.stats.record(method, self.bytes_received, len(body), error=error)
+
+        self.send_response(status_code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Server-Timing', f'app;dur={(time.perf_counter() - self.started) * 1000:.3f}')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_body(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        self.bytes_received = len(body)
+        if not body:
+            return None
+        return json.loads(decompress(body, self.headers.get('Content-Encoding')))
+
+    def handle_method(self, method):
+        self.started = time.perf_counter()
+        self.bytes_received = 0
+        server = self.server
+
+        delay = server.latency + (random.uniform(0, server.jitter) if server.jitter else 0)
+        if delay:
+            time.sleep(delay)
+
+        if server.error_rate and random.random() < server.error_rate:
+            # The request body is read anyway, so the connection can be reused:
+            self.bytes_received = len(self.rfile.read(int(self.headers.get('Content-Length') or 0)))
+            self.send_body(method, server.error_status, dict(messages=[dict(text='Injected error')]), error=True)
+            return
+
+        url = urlsplit(self.path)
+        try:
+            path = split_path(url.path)
+        except ValueError:
+            # Invalid base64 or UTF-8 of an id, the request body is read so the connection can be reused:
+            self.bytes_received = len(self.rfile.read(int(self.headers.get('Content-Length') or 0)))
+            self.send_body(method, 400, dict(messages=[dict(text='Invalid id')]))
+            return
+
+        status_code, content = server.repository.handle(method, path, parse_qs(url.query), self.read_body)
+        self.send_body(method, status_code, content, error=status_code >= 500)
+
+    def do_GET(self):
+        self.handle_method('GET')
+
+    def do_POST(self):
+        self.handle_method('POST')
+
+    def do_PUT(self):
+        self.handle_method('PUT')
+
+    def do_DELETE(self):
+        self.handle_method('DELETE')
+
+
+class FakeAasRepository:
+    """In-memory AAS repository and registry with the endpoints used by the client modules."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.collections = {collection: dict() for collection in COLLECTIONS}
+
+    def get_page(self, items, query):
+        limit = int(query.get('limit', [DEFAULT_LIMIT])[0])
+        cursor = int(query.get('cursor', [0])[0])
+
+        content = dict(result=items[cursor:cursor + limit])
+        if cursor + limit < len(items):
+            content['paging_metadata'] = dict(cursor=str(cursor + limit))
+        return 200, content
+
+    def handle(self, method, path, query, read_body):
+        """Answers a request for 'path' as returned by split_path, with the ids already decoded."""
+        if not path or path[0] not in self.collections:
+            return 404, None
+
+        collection = self.collections[path[0]]
+        if len(path) == 1:
+            return self.handle_collection(method, collection, query, read_body)
+
+        item_id = path[1]
+        if len(path) == 2:
+            return self.handle_item(method, collection, item_id, read_body)
+
+        with self.lock:
+            item = collection.get(item_id)
+        if item is None:
+            return 404, None
+
+        if path[0] == 'submodels' and len(path) == 3 and path[2] == '$value':
+            return 200, {element['idShort']: element.get('value') for element in item.get('submodelElements', [])}
+        if path[0] == 'submodels' and len(path) == 3 and path[2] == '$metadata':
+            return 200, {key: value for key, value in item.items() if key != 'submodelElements'}
+        if path[0] == 'shells' and path[2] == 'submodel-refs':
+            return self.handle_submodel_refs(method, item, path[3:], query, read_body)
+        return 404, None
+
+    def handle_collection(self, method, collection, query, read_body):
+        if method == 'GET':
+            with self.lock:
+                items = list(collection.values())
+            return self.get_page(items, query)
+        if method != 'POST':
+            return 405, None
+
+        item = read_body()
+        with self.lock:
+            if item['id'] in collection:
+                return 409, dict(messages=[dict(text=f'{item["id"]} already exists')])
+            collection[item['id']] = item
+        return 201, item
+
+    def handle_item(self, method, collection, item_id, read_body):
+        with self.lock:
+            if method == 'GET':
+                return (200, collection[item_id]) if item_id in collection else (404, None)
+            if method == 'DELETE':
+                return (204, None) if collection.pop(item_id, None) is not None else (404, None)
+        if method != 'PUT':
+            return 405, None
+
+        item = read_body()
+        with self.lock:
+            if item_id not in collection:
+                return 404, None
+            collection[item_id] = item
+        return 204, None
+
+    def handle_submodel_refs(self, method, shell, path, query, read_body):
+        with self.lock:
+            references = shell.setdefault('submodels', [])
+            if not path and method == 'GET':
+                return self.get_page(list(references), query)
+
+        if not path and method == 'POST':
+            reference = read_body()
+            with self.lock:
+                references.append(reference)
+            return 201, reference
+
+        if len(path) == 1 and method == 'DELETE':
+            sm_id = path[0]
+            with self.lock:
+                remaining = [reference for reference in references if get_reference_id(reference) != sm_id]
+                if len(remaining) == len(references):
+                    return 404, None
+                shell['submodels'] = remaining
+            return 204, None
+        return 405, None
+
+
+class FakeAasServer:
+    """Local stand-in for an AAS environment and registry, running in a background thread.
+
+    Every request is delayed by 'latency' plus a random share of 'jitter' seconds, a share of 'error_rate'
+    requests is answered with 'error_status' instead. Request and byte counters are available in 'stats'.
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, error_status=503, port=0):
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), FakeAasHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.latency = latency
+        self.httpd.jitter = jitter
+        self.httpd.error_rate = error_rate
+        self.httpd.error_status = error_status
+        self.httpd.repository = FakeAasRepository()
+        self.httpd.stats = ServerStats()
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def repository(self) -> FakeAasRepository:
+        return self.httpd.repository
+
+    @property
+    def stats(self) -> ServerStats:
+        return self.httpd.stats
+
+    def reset_stats(self):
+        self.httpd.stats = ServerStats()
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
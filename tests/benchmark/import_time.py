@@ -0,0 +1,67 @@
+"""Import time of the modules, each measured in a fresh interpreter like a module run per host.
+
+Run from the repository root, e.g.:
+
+    python -m tests.benchmark.import_time --repeat 20
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+MODULES = ('convert_to_sm', 'submodel', 'aas', 'aas_descriptor', 'submodel_descriptor', 'submodel_reference')
+
+MEASURE_IMPORT = '''
+import json, sys, time
+start = time.perf_counter()
+import plugins.modules.{module}
+print(json.dumps(dict(
+    seconds=time.perf_counter() - start,
+    basyx='basyx.aas.model' in sys.modules,
+    modules=len(sys.modules),
+)))
+'''
+
+
+def measure_import(module) -> dict:
+    output = subprocess.run(
+        [sys.executable, '-c', MEASURE_IMPORT.format(module=module)],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def run_benchmark(module, repeat=10) -> dict:
+    """Imports 'module' 'repeat' times, each in a new interpreter, and returns the median and worst import time."""
+    runs = [measure_import(module) for i in range(repeat)]
+    seconds = [run['seconds'] for run in runs]
+
+    return dict(
+        module=module,
+        repeat=repeat,
+        median_ms=round(statistics.median(seconds) * 1000, 3),
+        max_ms=round(max(seconds) * 1000, 3),
+        imports_basyx=runs[-1]['basyx'],
+        loaded_modules=runs[-1]['modules'],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--modules', nargs='+', choices=MODULES, default=list(MODULES))
+    parser.add_argument('--repeat', type=int, default=10, help='Fresh interpreters per module')
+    parser.add_argument('--json', action='store_true', help='Print one JSON object per module')
+    args = parser.parse_args()
+
+    for module in args.modules:
+        result = run_benchmark(module, args.repeat)
+        if args.json:
+            print(json.dumps(result), flush=True)
+        else:
+            print(f'{module:>20}  median {result["median_ms"]:>9.3f} ms  max {result["max_ms"]:>9.3f} ms  '
+                  f'basyx {"yes" if result["imports_basyx"] else "no":>3}  {result["loaded_modules"]} modules')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+import base64
+import json
+import subprocess
+import sys
+import unittest
+
+from plugins.cache.aas_facts import CacheModule
+from tests.benchmark.fake_server import FakeAasServer
+from tests.unit.helpers import ROOT, FakeAdapter
+
+
+class FakeRepoAdapter(FakeAdapter):
+    """Submodel repository keeping submodels in memory, '$value' returns the facts stored in the submodel."""
+
+    def __init__(self):
+        super().__init__()
+        self.submodels = dict()
+
+    def respond(self, request):
+        segments = request.path_url.split('?')[0].strip('/').split('/')
+        status_code, content = self.handle(request, segments)
+        return status_code, content, dict()
+
+    def handle(self, request, segments):
+        if len(segments) == 1:
+            if request.method == 'GET':
+                return 200, dict(result=list(self.submodels.values()))
+            submodel = json.loads(request.body)
+            if submodel['id'] in self.submodels:
+                return 409, None
+            self.submodels[submodel['id']] = submodel
+            return 201, submodel
+
+        sm_id = base64.b64decode(segments[1]).decode('utf-8')
+        if request.method == 'PUT':
+            self.submodels[sm_id] = json.loads(request.body)
+            return 204, None
+        if sm_id not in self.submodels:
+            return 404, None
+        if request.method == 'DELETE':
+            del self.submodels[sm_id]
+            return 204, None
+        if segments[-1] == '$metadata':
+            return 200, {key: value for key, value in self.submodels[sm_id].items() if key != 'submodelElements'}
+        return 200, {element['idShort']: element['value'] for element in self.submodels[sm_id]['submodelElements']}
+
+
+class FakeOptionsCacheModule(CacheModule):
+    options = dict(
+        _uri='http://localhost:8081', _prefix='urn:facts:', semantic_id='urn:semantic:facts', batch_size=2,
+        concurrency=2
+    )
+
+    def set_options(self, task_keys=None, var_options=None, direct=None):
+        pass
+
+    def get_option(self, option, hostvars=None):
+        return self.options[option]
+
+
+class UnitTests(unittest.TestCase):
+    def get_cache(self, adapter):
+        cache = FakeOptionsCacheModule()
+        cache.client.session.mount('http://', adapter)
+        return cache
+
+    def get_writes(self, adapter):
+        return [request.method for request in adapter.requests if request.method in ['POST', 'PUT']]
+
+    def test_set_expect_writes_in_batches(self):
+        adapter = FakeRepoAdapter()
+        cache = self.get_cache(adapter)
+
+        cache.set('host1', dict(os='linux'))
+        self.assertEqual([], adapter.requests)
+
+        cache.set('host2', dict(os='windows'))
+        self.assertEqual(2, len(self.get_writes(adapter)))
+        self.assertEqual({'urn:facts:host1', 'urn:facts:host2'}, set(adapter.submodels))
+
+    def test_unchanged_facts_expect_no_write(self):
+        adapter = FakeRepoAdapter()
+        self.get_cache(adapter).set('host1', dict(os='linux'))
+        self.get_cache(adapter).write_pending()
+
+        cache = self.get_cache(adapter)
+        cache.set('host1', dict(os='linux'))
+        cache.write_pending()
+
+        self.assertEqual(1, len(self.get_writes(adapter)))
+
+    def test_changed_facts_expect_update(self):
+        adapter = FakeRepoAdapter()
+        cache = self.get_cache(adapter)
+        cache.set('host1', dict(os='linux'))
+        cache.write_pending()
+
+        cache = self.get_cache(adapter)
+        cache.set('host1', dict(os='windows'))
+        cache.write_pending()
+
+        self.assertEqual(['POST', 'PUT'], self.get_writes(adapter))
+
+    def test_get_expect_memory_first_then_repository(self):
+        adapter = FakeRepoAdapter()
+        cache = self.get_cache(adapter)
+        cache.set('host1', dict(os='linux'))
+        cache.write_pending()
+        self.assertEqual(dict(os='linux'), cache.get('host1'))
+
+        requests_before = len(adapter.requests)
+        self.assertEqual(dict(os='linux'), self.get_cache(adapter).get('host1'))
+        self.assertEqual(requests_before + 1, len(adapter.requests))
+
+    def test_get_missing_host_expect_key_error_once(self):
+        adapter = FakeRepoAdapter()
+        cache = self.get_cache(adapter)
+
+        for _ in range(2):
+            with self.assertRaises(KeyError):
+                cache.get('host1')
+        self.assertEqual(1, len(adapter.requests))
+
+    def test_keys_and_delete(self):
+        adapter = FakeRepoAdapter()
+        cache = self.get_cache(adapter)
+        cache.set('host1', dict(os='linux'))
+        cache.set('host2', dict(os='linux'))
+
+        self.assertEqual(['host1', 'host2'], self.get_cache(adapter).keys())
+
+        cache.delete('host1')
+        self.assertFalse(cache.contains('host1'))
+        self.assertTrue(cache.contains('host2'))
+
+    def test_get_from_repository_expect_facts_unchanged(self):
+        adapter = FakeRepoAdapter()
+        facts = {
+            'ansible_eth0.ipv4': {'address': '10.0.0.1', 'net-mask': '255.0.0.0'},
+            'ansible-version': '2.16',
+            '1st fact': 'first',
+            'ansible_all_ipv4_addresses': ['10.0.0.1', '10.0.0.2'],
+            'ansible_processor_count': 4,
+            'ansible_is_chroot': False,
+        }
+        cache = self.get_cache(adapter)
+        cache.set('host1', facts)
+        cache.write_pending()
+
+        self.assertEqual(facts, self.get_cache(adapter).get('host1'))
+
+    def test_get_submodel_without_facts_extension_expect_value(self):
+        adapter = FakeRepoAdapter()
+        adapter.submodels['urn:facts:host1'] = dict(
+            id='urn:facts:host1', submodelElements=[dict(idShort='os', value='linux')]
+        )
+
+        self.assertEqual(dict(os='linux'), self.get_cache(adapter).get('host1'))
+
+    def test_exit_expect_pending_facts_written(self):
+        with FakeAasServer() as server:
+            script = (
+                'from tests.unit.aas_facts.test_aas_facts import FakeOptionsCacheModule\n'
+                f'FakeOptionsCacheModule.options = dict(FakeOptionsCacheModule.options, _uri={server.url!r})\n'
+                'FakeOptionsCacheModule().set("host1", dict(os="linux"))\n'
+            )
+            process = subprocess.run([sys.executable, '-c', script], cwd=ROOT, capture_output=True, text=True)
+
+            self.assertEqual('', process.stderr)
+            self.assertIn('urn:facts:host1', server.repository.collections['submodels'])
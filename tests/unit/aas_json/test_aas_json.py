@@ -0,0 +1,68 @@
+import json
+import subprocess
+import sys
+import unittest
+from unittest import mock
+
+from basyx.aas.adapter.json import AASToJsonEncoder
+from basyx.aas.model import AssetAdministrationShell, AssetInformation, Key, KeyTypes, ModelReference, Submodel
+
+from plugins.module_utils import aas_json, submodel_repository
+from plugins.module_utils.aas_json import encode_json, get_model_reference, is_basyx_instance, to_json_dict
+from plugins.modules.submodel import SmRepoClient
+from tests.benchmark.fake_server import FakeAasServer
+from tests.benchmark.import_time import MODULES, measure_import
+
+
+class UnitTests(unittest.TestCase):
+    def test_model_reference_expect_basyx_serialization(self):
+        reference = ModelReference(key=[Key(type_=KeyTypes.SUBMODEL, value='sm_id')], type_=Submodel)
+        self.assertEqual(json.loads(json.dumps(reference, cls=AASToJsonEncoder)), get_model_reference('sm_id'))
+
+    def test_is_basyx_instance_expect_only_basyx_objects(self):
+        shell = AssetAdministrationShell(id_='shell_id', asset_information=AssetInformation(global_asset_id='asset'))
+        self.assertTrue(is_basyx_instance(shell, 'AssetAdministrationShell'))
+        self.assertFalse(is_basyx_instance(shell, 'Submodel'))
+        self.assertFalse(is_basyx_instance(to_json_dict(shell), 'AssetAdministrationShell'))
+        self.assertEqual('shell_id', to_json_dict(shell)['id'])
+
+    def test_is_basyx_instance_without_basyx_expect_no_import(self):
+        output = subprocess.run([sys.executable, '-c', '\n'.join([
+            'import sys',
+            'from plugins.module_utils.aas_json import is_basyx_instance',
+            'print(is_basyx_instance(dict(), "Submodel"), "basyx.aas.model" in sys.modules)',
+        ])], check=True, capture_output=True, text=True).stdout
+        self.assertEqual('False False', output.strip())
+
+    def test_import_network_modules_expect_no_basyx(self):
+        for module in MODULES:
+            if module != 'convert_to_sm':
+                self.assertFalse(measure_import(module)['basyx'], module)
+
+    def test_encode_json_expect_compact_json(self):
+        value = dict(id='sm_id', value=[1, 2.5, None, True, 'ä'])
+        self.assertEqual(value, json.loads(encode_json(value)))
+        self.assertNotIn(b', ', encode_json(value))
+
+        with mock.patch.object(aas_json, 'HAS_ORJSON', False):
+            self.assertEqual(value, json.loads(encode_json(value)))
+
+    def test_encode_json_unsupported_by_orjson_expect_json(self):
+        value = {1: 2 ** 70}
+        self.assertEqual({'1': 2 ** 70}, json.loads(encode_json(value)))
+
+    def test_encode_json_basyx_expect_encoder(self):
+        submodel = Submodel('sm_id', id_short='sm')
+        self.assertEqual(to_json_dict(submodel), json.loads(encode_json(submodel)))
+
+    def test_create_existing_submodel_expect_encoded_once(self):
+        with FakeAasServer() as server:
+            client = SmRepoClient(server.url)
+            client.create(dict(id='sm_id', modelType='Submodel'))
+
+            with mock.patch.object(submodel_repository, 'encode_json', wraps=encode_json) as encode:
+                status_code, content = client.create(Submodel('sm_id', id_short='sm'), force=True)
+
+            self.assertEqual(204, status_code)
+            self.assertEqual(1, encode.call_count)
+            self.assertEqual('sm', server.repository.collections['submodels']['sm_id']['idShort'])
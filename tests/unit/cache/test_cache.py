@@ -0,0 +1,131 @@
+import os
+import stat
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from plugins.module_utils import private_dir
+from plugins.module_utils.cache import DEFAULT_CACHE_DIR, FileResponseCache, ResponseCache
+from plugins.module_utils.session import create_session
+from tests.unit.helpers import FakeAdapter
+
+
+class FakeETagAdapter(FakeAdapter):
+    def __init__(self, etag=None):
+        super().__init__()
+        self.etag = etag
+
+    def respond(self, request):
+        status_code, content, headers = super().respond(request)
+        if request.method != 'GET':
+            status_code = 204
+        if self.etag is not None:
+            headers['ETag'] = self.etag
+            if request.headers.get('If-None-Match') == self.etag:
+                return 304, b'', headers
+        return status_code, content, headers
+
+
+class UnitTests(unittest.TestCase):
+    url = 'http://localhost:8081'
+
+    def get_session(self, cache, etag=None):
+        session = create_session(cache=cache)
+        adapter = FakeETagAdapter(etag)
+        session.mount('http://', adapter)
+        return session, adapter
+
+    def get_caches(self, ttl=60):
+        return [ResponseCache(ttl), FileResponseCache(tempfile.mkdtemp(), ttl)]
+
+    def test_get_twice_expect_one_request(self):
+        for cache in self.get_caches():
+            session, adapter = self.get_session(cache)
+            first = session.get(f'{self.url}/shells/c2hlbGw=')
+            second = session.get(f'{self.url}/shells/c2hlbGw=')
+
+            self.assertEqual(1, len(adapter.requests))
+            self.assertEqual(first.json(), second.json())
+
+    def test_get_with_other_params_expect_two_requests(self):
+        for cache in self.get_caches():
+            session, adapter = self.get_session(cache)
+            session.get(f'{self.url}/shells', params=dict(limit=1))
+            session.get(f'{self.url}/shells', params=dict(limit=2))
+
+            self.assertEqual(2, len(adapter.requests))
+
+    def test_write_expect_resource_and_parents_invalidated(self):
+        for cache in self.get_caches():
+            session, adapter = self.get_session(cache)
+            session.get(f'{self.url}/shells/c2hlbGw=')
+            session.get(f'{self.url}/shells')
+            session.get(f'{self.url}/submodels')
+            session.post(f'{self.url}/shells/c2hlbGw=/submodel-refs', json=dict())
+            session.get(f'{self.url}/shells/c2hlbGw=')
+            session.get(f'{self.url}/shells')
+            session.get(f'{self.url}/submodels')
+
+            self.assertEqual(6, len(adapter.requests))
+
+    def test_delete_expect_children_invalidated(self):
+        for cache in self.get_caches():
+            session, adapter = self.get_session(cache)
+            session.get(f'{self.url}/shells/c2hlbGw=/submodel-refs')
+            session.delete(f'{self.url}/shells/c2hlbGw=')
+            session.get(f'{self.url}/shells/c2hlbGw=/submodel-refs')
+
+            self.assertEqual(3, len(adapter.requests))
+
+    def test_stale_entry_with_etag_expect_revalidation(self):
+        for cache in self.get_caches(ttl=0):
+            session, adapter = self.get_session(cache, etag='"1"')
+            first = session.get(f'{self.url}/shells/c2hlbGw=')
+            time.sleep(0.01)
+            second = session.get(f'{self.url}/shells/c2hlbGw=')
+
+            self.assertEqual(2, len(adapter.requests))
+            self.assertEqual('"1"', adapter.requests[1].headers['If-None-Match'])
+            self.assertEqual(200, second.status_code)
+            self.assertEqual(first.json(), second.json())
+
+    def test_file_cache_expect_shared_between_sessions(self):
+        cache_dir = tempfile.mkdtemp()
+        session, adapter = self.get_session(FileResponseCache(cache_dir))
+        session.get(f'{self.url}/shells/c2hlbGw=')
+
+        other_session, other_adapter = self.get_session(FileResponseCache(cache_dir))
+        other_session.get(f'{self.url}/shells/c2hlbGw=')
+
+        self.assertEqual(0, len(other_adapter.requests))
+
+    def test_no_cache_expect_every_request(self):
+        session, adapter = self.get_session(None)
+        session.get(f'{self.url}/shells')
+        session.get(f'{self.url}/shells')
+
+        self.assertEqual(2, len(adapter.requests))
+
+    def test_default_cache_dir_expect_below_home(self):
+        self.assertEqual(os.path.expanduser('~/.ansible/tmp/slm-aas-cache'), DEFAULT_CACHE_DIR)
+
+    def test_file_cache_expect_private_dir_created(self):
+        cache_dir = os.path.join(tempfile.mkdtemp(), 'slm-aas-cache')
+        FileResponseCache(cache_dir)
+
+        self.assertEqual(0o700, stat.S_IMODE(os.stat(cache_dir).st_mode))
+
+    def test_file_cache_writable_by_others_expect_refused(self):
+        cache_dir = tempfile.mkdtemp()
+        os.chmod(cache_dir, 0o777)
+
+        with self.assertRaisesRegex(PermissionError, 'writable by group or others'):
+            FileResponseCache(cache_dir)
+
+    def test_file_cache_owned_by_other_user_expect_refused(self):
+        cache_dir = tempfile.mkdtemp()
+
+        with mock.patch.object(private_dir.os, 'getuid', return_value=os.getuid() + 1):
+            with self.assertRaisesRegex(PermissionError, 'owned by uid'):
+                FileResponseCache(cache_dir)
@@ -0,0 +1,124 @@
+import gzip
+import json
+import unittest
+import zlib
+
+from plugins.module_utils.compression import compress, is_compression_rejected
+from plugins.modules.submodel import SmRepoClient
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b''):
+        self.status_code = status_code
+        self.content = content
+
+
+class FakeSession:
+    def __init__(self, accepts_compression, rejection=None):
+        self.accepts_compression = accepts_compression
+        self.rejection = rejection or FakeResponse(415)
+        self.requests = []
+
+    def request(self, method, url, data, headers):
+        self.requests.append(dict(method=method, url=url, data=data, headers=headers))
+
+        if 'Content-Encoding' in headers and not self.accepts_compression:
+            return self.rejection
+        return FakeResponse(201)
+
+
+class UnitTests(unittest.TestCase):
+    submodel = {
+        'id': 'test-submodel-id',
+        'submodelElements': [
+            {'idShort': f'property_{index}', 'modelType': 'Property', 'valueType': 'xs:string', 'value': 'value'}
+            for index in range(100)
+        ]
+    }
+
+    def get_client(self, accepts_compression, compression='gzip', compression_threshold=1024, rejection=None):
+        client = SmRepoClient(
+            'http://localhost:8081',
+            compression=compression,
+            compression_threshold=compression_threshold
+        )
+        client.session = FakeSession(accepts_compression, rejection)
+        return client
+
+    def test_compress_gzip_expect_roundtrip(self):
+        body = json.dumps(self.submodel).encode('utf-8')
+
+        self.assertEqual(
+            body,
+            gzip.decompress(compress(body, 'gzip'))
+        )
+
+    def test_compress_deflate_expect_roundtrip(self):
+        body = json.dumps(self.submodel).encode('utf-8')
+
+        self.assertEqual(
+            body,
+            zlib.decompress(compress(body, 'deflate'))
+        )
+
+    def test_create_expect_compressed_body(self):
+        client = self.get_client(accepts_compression=True)
+        status_code, content = client.create(self.submodel)
+
+        self.assertEqual(201, status_code)
+        self.assertEqual(1, len(client.session.requests))
+        self.assertEqual('gzip', client.session.requests[0]['headers']['Content-Encoding'])
+
+        stats = client.transfer_stats.as_dict()
+        self.assertLess(stats['bytes_sent'], stats['bytes_sent_uncompressed'])
+
+    def test_create_below_threshold_expect_uncompressed_body(self):
+        client = self.get_client(accepts_compression=True, compression_threshold=10 ** 6)
+        client.create(self.submodel)
+
+        self.assertNotIn('Content-Encoding', client.session.requests[0]['headers'])
+
+    def test_is_compression_rejected_expect_only_encoding_errors(self):
+        self.assertTrue(is_compression_rejected(FakeResponse(415)))
+        self.assertTrue(is_compression_rejected(FakeResponse(400, b'Unsupported Content-Encoding: gzip')))
+        self.assertFalse(is_compression_rejected(FakeResponse(400, b'{"messages": ["idShort is invalid"]}')))
+        self.assertFalse(is_compression_rejected(FakeResponse(400)))
+        self.assertFalse(is_compression_rejected(FakeResponse(201)))
+
+    def test_create_rejected_expect_uncompressed_fallback(self):
+        client = self.get_client(accepts_compression=False)
+        status_code, content = client.create(self.submodel)
+
+        self.assertEqual(201, status_code)
+        self.assertEqual(2, len(client.session.requests))
+        self.assertNotIn('Content-Encoding', client.session.requests[1]['headers'])
+        self.assertEqual(1, client.transfer_stats.as_dict()['compression_fallbacks'])
+
+        # The fallback only applies to the rejected body, further bodies are compressed again:
+        self.assertEqual('gzip', client.compression)
+        client.session.accepts_compression = True
+        client.create(self.submodel)
+        self.assertEqual(3, len(client.session.requests))
+        self.assertEqual('gzip', client.session.requests[2]['headers']['Content-Encoding'])
+
+    def test_create_bad_request_with_encoding_message_expect_uncompressed_fallback(self):
+        client = self.get_client(
+            accepts_compression=False,
+            rejection=FakeResponse(400, b'Content-Encoding gzip is not supported')
+        )
+        status_code, content = client.create(self.submodel)
+
+        self.assertEqual(201, status_code)
+        self.assertEqual(2, len(client.session.requests))
+        self.assertEqual(1, client.transfer_stats.as_dict()['compression_fallbacks'])
+
+    def test_create_invalid_submodel_expect_no_fallback(self):
+        client = self.get_client(
+            accepts_compression=False,
+            rejection=FakeResponse(400, b'{"messages": [{"text": "idShort is invalid"}]}')
+        )
+        status_code, content = client.create(self.submodel)
+
+        self.assertEqual(400, status_code)
+        self.assertEqual(1, len(client.session.requests))
+        self.assertEqual(0, client.transfer_stats.as_dict()['compression_fallbacks'])
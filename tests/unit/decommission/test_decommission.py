@@ -0,0 +1,106 @@
+import unittest
+
+from plugins.modules.decommission import DecommissionClient
+from plugins.modules.submodel import get_reference
+from tests.benchmark.fake_server import FakeAasServer
+
+
+def add_shell(repository, shell_id, sm_ids):
+    collections = repository.collections
+    collections['shells'][shell_id] = dict(id=shell_id, submodels=[get_reference(sm_id) for sm_id in sm_ids])
+    collections['shell-descriptors'][shell_id] = dict(id=shell_id)
+    for sm_id in sm_ids:
+        collections['submodels'][sm_id] = dict(modelType='Submodel', id=sm_id)
+        collections['submodel-descriptors'][sm_id] = dict(id=sm_id)
+
+
+class UnitTests(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeAasServer().start()
+        self.client = DecommissionClient(self.server.url, self.server.url, self.server.url, max_workers=4, page_size=2)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_decommission_expect_shell_submodels_and_descriptors_deleted(self):
+        add_shell(self.server.repository, 'urn:shell:1', ['urn:sm:1', 'urn:sm:2', 'urn:sm:3'])
+        add_shell(self.server.repository, 'urn:shell:2', ['urn:sm:4'])
+
+        submodel_ids, operations, shared_submodel_ids = self.client.decommission(['urn:shell:1'])
+
+        self.assertEqual({'urn:shell:1': ['urn:sm:1', 'urn:sm:2', 'urn:sm:3']}, submodel_ids)
+        self.assertEqual([], shared_submodel_ids)
+        self.assertEqual(8, len(operations))
+        self.assertTrue(all(operation['status_code'] == 204 for operation in operations))
+
+        collections = self.server.repository.collections
+        self.assertEqual(['urn:shell:2'], list(collections['shells']))
+        self.assertEqual(['urn:shell:2'], list(collections['shell-descriptors']))
+        self.assertEqual(['urn:sm:4'], list(collections['submodels']))
+        self.assertEqual(['urn:sm:4'], list(collections['submodel-descriptors']))
+
+    def test_bulk_decommission_expect_shared_submodels_deleted_once(self):
+        add_shell(self.server.repository, 'urn:shell:1', ['urn:sm:1', 'urn:sm:shared'])
+        add_shell(self.server.repository, 'urn:shell:2', ['urn:sm:shared'])
+
+        submodel_ids, operations, shared_submodel_ids = self.client.decommission(
+            ['urn:shell:1', 'urn:shell:2', 'urn:shell:1']
+        )
+
+        self.assertEqual(['urn:shell:1', 'urn:shell:2'], list(submodel_ids))
+        self.assertEqual([], shared_submodel_ids)
+        self.assertEqual(1, sum(1 for operation in operations
+                                if operation['target'] == 'submodel' and operation['id'] == 'urn:sm:shared'))
+        self.assertTrue(all(not collection for collection in self.server.repository.collections.values()))
+
+    def test_decommission_again_expect_absent(self):
+        add_shell(self.server.repository, 'urn:shell:1', ['urn:sm:1'])
+        self.client.decommission(['urn:shell:1'])
+
+        submodel_ids, operations, shared_submodel_ids = self.client.decommission(['urn:shell:1'])
+
+        self.assertEqual({'urn:shell:1': None}, submodel_ids)
+        self.assertEqual([('shell_descriptor', 404), ('shell', 404)],
+                         [(operation['target'], operation['status_code']) for operation in operations])
+
+    def test_dry_run_and_keep_submodels_expect_submodels_kept(self):
+        add_shell(self.server.repository, 'urn:shell:1', ['urn:sm:1'])
+
+        self.assertEqual(
+            ({'urn:shell:1': ['urn:sm:1']}, [], []), self.client.decommission(['urn:shell:1'], dry_run=True)
+        )
+        self.assertIn('urn:shell:1', self.server.repository.collections['shells'])
+
+        self.client.decommission(['urn:shell:1'], delete_submodels=False)
+        self.assertEqual([], list(self.server.repository.collections['shells']))
+        self.assertEqual(['urn:sm:1'], list(self.server.repository.collections['submodels']))
+
+    def test_submodel_shared_with_other_shell_expect_kept(self):
+        add_shell(self.server.repository, 'urn:shell:1', ['urn:sm:1', 'urn:sm:shared'])
+        add_shell(self.server.repository, 'urn:shell:2', ['urn:sm:shared'])
+
+        submodel_ids, operations, shared_submodel_ids = self.client.decommission(['urn:shell:1'])
+
+        self.assertEqual(['urn:sm:shared'], shared_submodel_ids)
+        self.assertNotIn('urn:sm:shared', [operation['id'] for operation in operations])
+        collections = self.server.repository.collections
+        self.assertEqual(['urn:sm:shared'], list(collections['submodels']))
+        self.assertEqual(['urn:sm:shared'], list(collections['submodel-descriptors']))
+
+    def test_delete_shared_submodels_expect_deleted(self):
+        add_shell(self.server.repository, 'urn:shell:1', ['urn:sm:shared'])
+        add_shell(self.server.repository, 'urn:shell:2', ['urn:sm:shared'])
+        self.server.reset_stats()
+
+        submodel_ids, operations, shared_submodel_ids = self.client.decommission(
+            ['urn:shell:1'], delete_shared_submodels=True
+        )
+
+        self.assertEqual([], shared_submodel_ids)
+        self.assertEqual([], list(self.server.repository.collections['submodels']))
+        # The shells are not listed, only the references of the decommissioned one:
+        self.assertEqual(dict(GET=1, DELETE=4), self.server.stats.as_dict()['requests_per_method'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import tempfile
+import unittest
+
+from plugins.module_utils.descriptor import get_descriptor_hash
+from plugins.modules.descriptors import get_delta
+from tests.benchmark.fake_server import FakeAasServer
+from tests.unit.helpers import run_module
+
+
+class UnitTests(unittest.TestCase):
+    def get_descriptor(self, descriptor_id, href='http://localhost:8081'):
+        return {
+            'id': descriptor_id,
+            'endpoints': [
+                {'interface': 'AAS-3.0', 'protocolInformation': {'href': f'{href}/shells/{descriptor_id}'}}
+            ]
+        }
+
+    def get_registered_hashes(self, descriptors):
+        return {descriptor['id']: get_descriptor_hash(descriptor) for descriptor in descriptors}
+
+    def test_empty_registry_expect_create_all(self):
+        desired = [self.get_descriptor('a'), self.get_descriptor('b')]
+        delta = get_delta(desired, {})
+
+        self.assertEqual(desired, delta['create'])
+        self.assertEqual([], delta['update'])
+        self.assertEqual([], delta['delete'])
+
+    def test_steady_state_expect_no_operations(self):
+        desired = [self.get_descriptor('a'), self.get_descriptor('b')]
+        delta = get_delta(desired, self.get_registered_hashes(desired))
+
+        self.assertEqual([], delta['create'] + delta['update'] + delta['delete'])
+        self.assertEqual(['a', 'b'], delta['unchanged'])
+
+    def test_changed_descriptor_expect_update(self):
+        registered = [self.get_descriptor('a'), self.get_descriptor('b')]
+        desired = [self.get_descriptor('a'), self.get_descriptor('b', 'http://other:8081')]
+        delta = get_delta(desired, self.get_registered_hashes(registered))
+
+        self.assertEqual([desired[1]], delta['update'])
+        self.assertEqual(['a'], delta['unchanged'])
+
+    def test_stale_descriptor_with_prune_expect_delete(self):
+        registered = [self.get_descriptor('a'), self.get_descriptor('stale')]
+        delta = get_delta([self.get_descriptor('a')], self.get_registered_hashes(registered), prune=True)
+
+        self.assertEqual(['stale'], delta['delete'])
+
+    def test_stale_descriptor_without_prune_expect_no_delete(self):
+        registered = [self.get_descriptor('a'), self.get_descriptor('stale')]
+        delta = get_delta([self.get_descriptor('a')], self.get_registered_hashes(registered))
+
+        self.assertEqual([], delta['delete'])
+
+    def test_duplicate_desired_descriptor_expect_one_create(self):
+        delta = get_delta([self.get_descriptor('a'), self.get_descriptor('a')], {})
+
+        self.assertEqual(1, len(delta['create']))
+
+    def run_descriptors(self, server, **args):
+        return run_module('descriptors', dict(
+            host='127.0.0.1',
+            port=server.url.rsplit(':', 1)[1],
+            registry='submodel',
+            **args
+        ))
+
+    def test_module_without_prune_expect_nothing_deleted(self):
+        with FakeAasServer() as server:
+            registered = server.repository.collections['submodel-descriptors']
+            registered['stale'] = self.get_descriptor('stale')
+
+            result = self.run_descriptors(server, descriptors=[self.get_descriptor('a')])
+
+            self.assertEqual(dict(created=1, updated=0, deleted=0, unchanged=0, failed=0), result['counts'])
+            self.assertEqual({'a', 'stale'}, set(registered))
+            self.assertNotIn('DELETE', server.stats.as_dict()['requests_per_method'])
+
+    def test_module_with_prune_expect_stale_deleted(self):
+        with FakeAasServer() as server:
+            registered = server.repository.collections['submodel-descriptors']
+            registered['stale'] = self.get_descriptor('stale')
+
+            result = self.run_descriptors(server, descriptors=[self.get_descriptor('a')], prune=True)
+
+            self.assertEqual(1, result['counts']['deleted'])
+            self.assertEqual({'a'}, set(registered))
+
+    def test_module_without_port_expect_port_of_registry(self):
+        result = run_module('descriptors', dict(host='127.0.0.1', registry='submodel', descriptors=[]))
+
+        self.assertTrue(result['failed'])
+        self.assertIn('http://127.0.0.1:8083', result['msg'])
+
+    def test_module_with_limiter_dir_writable_by_others_expect_failed(self):
+        with FakeAasServer() as server, tempfile.TemporaryDirectory() as limiter_dir:
+            os.chmod(limiter_dir, 0o777)
+
+            result = self.run_descriptors(server, descriptors=[], max_in_flight=1, limiter_dir=limiter_dir)
+
+            self.assertTrue(result['failed'])
+            self.assertIn('writable by group or others', result['msg'])
+            self.assertEqual(0, server.stats.as_dict()['requests'])
@@ -0,0 +1,77 @@
+import io
+import json
+import tempfile
+import unittest
+
+from basyx.aas.adapter import aasx
+from basyx.aas.model import DictObjectStore
+
+from plugins.module_utils.multipart import MultipartFileStream
+from plugins.modules.environment import build_environment
+
+
+class UnitTests(unittest.TestCase):
+    shells = [
+        {
+            'id': f'shell-id-{index}',
+            'idShort': f'shell_{index}',
+            'modelType': 'AssetAdministrationShell',
+            'assetInformation': {'assetKind': 'Instance', 'globalAssetId': f'asset-id-{index}'}
+        }
+        for index in range(3)
+    ]
+    submodels = [
+        {
+            'id': f'submodel-id-{index}',
+            'idShort': f'submodel_{index}',
+            'modelType': 'Submodel',
+            'submodelElements': [
+                {'idShort': 'property', 'modelType': 'Property', 'valueType': 'xs:string', 'value': 'value'}
+            ]
+        }
+        for index in range(5)
+    ]
+
+    def test_build_json_environment_expect_all_objects(self):
+        fp = io.BytesIO()
+        build_environment(fp, 'json', self.shells, self.submodels)
+        environment = json.loads(fp.getvalue())
+
+        self.assertEqual(self.shells, environment['assetAdministrationShells'])
+        self.assertEqual(self.submodels, environment['submodels'])
+        self.assertEqual([], environment['conceptDescriptions'])
+
+    def test_build_aasx_environment_expect_all_objects(self):
+        with tempfile.SpooledTemporaryFile() as fp:
+            build_environment(fp, 'aasx', self.shells, self.submodels)
+            fp.seek(0)
+
+            with tempfile.NamedTemporaryFile(suffix='.aasx') as aasx_file:
+                aasx_file.write(fp.read())
+                aasx_file.flush()
+
+                object_store = DictObjectStore()
+                with aasx.AASXReader(aasx_file.name) as reader:
+                    reader.read_into(object_store, aasx.DictSupplementaryFileContainer())
+
+        self.assertEqual(
+            {aas_object['id'] for aas_object in self.shells + self.submodels},
+            {aas_object.id for aas_object in object_store}
+        )
+
+    def test_multipart_stream_expect_file_between_boundaries(self):
+        content = b'x' * 10000
+        body = MultipartFileStream(io.BytesIO(content), 'file', 'environment.json', 'application/json')
+
+        chunks = []
+        while True:
+            chunk = body.read(4096)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        data = b''.join(chunks)
+
+        self.assertEqual(len(body), len(data))
+        self.assertTrue(data.startswith(f'--{body.boundary}\r\n'.encode('utf-8')))
+        self.assertTrue(data.endswith(f'\r\n--{body.boundary}--\r\n'.encode('utf-8')))
+        self.assertIn(b'\r\n\r\n' + content + b'\r\n', data)
@@ -0,0 +1,72 @@
+import unittest
+
+from plugins.module_utils.submodel_repository import get_reference
+from plugins.modules.aas import ShellRepoClient
+from plugins.modules.submodel import SmRepoClient
+from tests.benchmark.benchmark import get_percentile, get_submodel, run_benchmark
+from tests.benchmark.fake_server import FakeAasServer
+
+
+class UnitTests(unittest.TestCase):
+    def test_submodel_crud_expect_stored(self):
+        with FakeAasServer() as server:
+            client = SmRepoClient(server.url, page_size=2)
+            for i in range(5):
+                self.assertEqual(201, client.create(get_submodel(f'sm:{i}', 3))[0])
+            self.assertEqual(204, client.create(get_submodel('sm:0', 1), force=True)[0])
+
+            status_code, content = client.get_one('sm:0')
+            self.assertEqual((200, 1), (status_code, len(content['submodelElements'])))
+            self.assertEqual({'Property0': 'value 0'}, client.get_value('sm:0')[1])
+            self.assertEqual(5, len(list(client.iter_all())))
+
+            self.assertEqual(204, client.delete('sm:0')[0])
+            self.assertEqual(404, client.get_one('sm:0')[0])
+            # Three pages of the listing, the conflicting POST is followed by a PUT:
+            self.assertEqual(dict(POST=6, PUT=1, GET=6, DELETE=1), server.stats.as_dict()['requests_per_method'])
+
+    def test_ids_with_base64_slash_and_plus_expect_decoded(self):
+        # Standard base64 of these ids contains '/' and '+':
+        sm_id, shell_id = 'urn:x?>>', 'urn:shell:>>?'
+        with FakeAasServer() as server:
+            sm_client = SmRepoClient(server.url)
+            shell_client = ShellRepoClient(server.url)
+            self.assertTrue({'/', '+'} & set(sm_client.get_encrypted_sm_id_from_id(sm_id)))
+            server.repository.collections['shells'][shell_id] = dict(id=shell_id, submodels=[])
+
+            self.assertEqual(201, sm_client.create(get_submodel(sm_id, 1))[0])
+            self.assertEqual(sm_id, sm_client.get_one(sm_id)[1]['id'])
+            self.assertEqual({'Property0': 'value 0'}, sm_client.get_value(sm_id)[1])
+            self.assertEqual(sm_id, sm_client.get_metadata(sm_id)[1]['id'])
+
+            self.assertEqual(201, shell_client.add_submodel_reference(shell_id, get_reference(sm_id))[0])
+            self.assertEqual(204, shell_client.delete_submodel_reference(shell_id, sm_id)[0])
+            self.assertEqual([], server.repository.collections['shells'][shell_id]['submodels'])
+
+    def test_compressed_body_expect_decompressed(self):
+        with FakeAasServer() as server:
+            client = SmRepoClient(server.url, compression='gzip', compression_threshold=0)
+            self.assertEqual(201, client.create(get_submodel('sm', 100))[0])
+            self.assertEqual(100, len(server.repository.collections['submodels']['sm']['submodelElements']))
+
+    def test_error_rate_expect_injected_errors(self):
+        with FakeAasServer(error_rate=1.0, error_status=500) as server:
+            self.assertEqual(500, ShellRepoClient(server.url).get_shell('shell')[0])
+            self.assertEqual(1, server.stats.as_dict()['errors'])
+
+    def test_run_benchmark_expect_statistics(self):
+        with FakeAasServer(latency=0.001) as server:
+            result = run_benchmark(server, 'descriptor_register', concurrency=4, payload_size=5, operations=20)
+
+        self.assertEqual(0, result['failed'])
+        # Registering a new descriptor is a GET and a POST:
+        self.assertEqual(40, result['requests'])
+        self.assertGreater(result['bytes_sent'], 0)
+        self.assertGreaterEqual(result['latency_p99_ms'], result['latency_p50_ms'])
+        self.assertGreaterEqual(result['latency_p50_ms'], 1)
+
+    def test_percentile_expect_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(50, get_percentile(values, 50))
+        self.assertEqual(99, get_percentile(values, 99))
+        self.assertEqual(1, get_percentile([1], 99))
@@ -0,0 +1,64 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+
+import requests
+from requests.adapters import BaseAdapter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def run_module(module, args) -> dict:
+    """Runs 'plugins/modules/<module>.py' with 'args' in a separate process, returns its result."""
+    with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as fp:
+        json.dump(dict(ANSIBLE_MODULE_ARGS=args), fp)
+    try:
+        output = subprocess.run(
+            [sys.executable, '-m', f'plugins.modules.{module}', fp.name],
+            cwd=ROOT, capture_output=True, text=True
+        ).stdout
+    finally:
+        os.remove(fp.name)
+
+    return json.loads(output.strip().splitlines()[-1])
+
+
+class FakeAdapter(BaseAdapter):
+    """Answers the requests of a session without network, mounted with session.mount('http://', adapter).
+
+    The sent requests are recorded in 'requests', subclasses override 'respond' for other responses.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.lock = threading.Lock()
+        self.requests = []
+
+    def respond(self, request):
+        """Returns status code, content (bytes or JSON) and headers of the response to 'request'."""
+        return 200, dict(url=request.url, count=len(self.requests)), dict()
+
+    def send(self, request, **kwargs):
+        with self.lock:
+            self.requests.append(request)
+            status_code, content, headers = self.respond(request)
+
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        response.status_code = status_code
+        response.headers.update(headers)
+        if content is None:
+            response._content = b''
+        elif isinstance(content, bytes):
+            response._content = content
+        else:
+            response._content = json.dumps(content).encode('utf-8')
+        response._content_consumed = True
+        return response
+
+    def close(self):
+        pass
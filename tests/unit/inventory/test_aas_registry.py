@@ -0,0 +1,123 @@
+import unittest
+from unittest import mock
+
+from ansible.inventory.data import InventoryData
+from ansible.parsing.dataloader import DataLoader
+from ansible.template import Templar, trust_as_template
+
+from plugins.inventory.aas_registry import InventoryModule, get_host_entry, get_variable_name
+from tests.benchmark.fake_server import FakeAasServer
+
+
+class FakeOptionsInventoryModule(InventoryModule):
+    defaults = dict(
+        strict=False, compose={}, groups={}, keyed_groups=[], hostname='idShort', submodel_var_prefix='aas_submodel_',
+        scheme='http', port='8082', page_size=100, fetch_submodels=False, concurrency=4
+    )
+
+    def __init__(self, options):
+        super().__init__()
+        self.options = dict(self.defaults, **options)
+        self.display = mock.Mock()
+
+    def get_option(self, option, hostvars=None):
+        return self.options[option]
+
+
+class UnitTests(unittest.TestCase):
+    descriptor = {
+        'id': 'urn:aas:host1',
+        'idShort': 'host1',
+        'assetKind': 'Instance',
+        'endpoints': [{'interface': 'AAS-3.0', 'protocolInformation': {'href': 'http://localhost:8081/shells/dXJu'}}],
+        'submodelDescriptors': [
+            {
+                'id': 'urn:sm:1',
+                'idShort': 'Technical-Data',
+                'endpoints': [
+                    {'interface': 'SUBMODEL-3.0', 'protocolInformation': {'href': 'http://localhost:8081/submodels/c20'}}
+                ]
+            }
+        ]
+    }
+
+    def get_plugin(self, **options):
+        plugin = FakeOptionsInventoryModule(options)
+        plugin.inventory = InventoryData()
+        plugin.templar = Templar(loader=DataLoader())
+        return plugin
+
+    def test_get_host_entry_expect_compact_entry(self):
+        entry = get_host_entry(self.descriptor)
+
+        self.assertEqual('host1', entry['idShort'])
+        self.assertEqual('http://localhost:8081/shells/dXJu', entry['href'])
+        self.assertEqual({'Technical-Data': 'http://localhost:8081/submodels/c20'}, entry['submodels'])
+        self.assertNotIn('submodelDescriptors', entry)
+
+    def test_get_variable_name_expect_valid_identifier(self):
+        self.assertEqual('aas_submodel_Technical_Data', get_variable_name('aas_submodel_', 'Technical-Data'))
+
+    def test_populate_expect_host_with_submodel_value(self):
+        plugin = self.get_plugin(
+            strict=True,
+            keyed_groups=[dict(key=trust_as_template('aas_asset_kind'), prefix='kind')]
+        )
+        entry = get_host_entry(self.descriptor)
+        entry['values']['Technical-Data'] = {'Speed': '{{ lookup("pipe", "id") }}'}
+        plugin.populate([entry])
+
+        host = plugin.inventory.get_host('host1')
+        self.assertEqual('urn:aas:host1', host.vars['aas_id'])
+        self.assertIn('kind_Instance', plugin.inventory.groups)
+
+        # The value is plain data, a template in it is kept as it is:
+        self.assertEqual({'Speed': '{{ lookup("pipe", "id") }}'}, host.vars['aas_submodel_Technical_Data'])
+
+    def test_get_host_entries_expect_submodel_values_fetched(self):
+        with FakeAasServer() as server:
+            port = server.url.rsplit(':', 1)[1]
+            submodels = server.repository.collections['submodels']
+            submodels['urn:sm:1'] = dict(id='urn:sm:1', submodelElements=[dict(idShort='Speed', value='1200')])
+
+            descriptor = dict(self.descriptor, submodelDescriptors=[
+                dict(self.descriptor['submodelDescriptors'][0], endpoints=[
+                    dict(interface='SUBMODEL-3.0', protocolInformation=dict(href=f'{server.url}/submodels/dXJuOnNtOjE'))
+                ]),
+                dict(id='urn:sm:missing', idShort='Missing', endpoints=[
+                    dict(interface='SUBMODEL-3.0', protocolInformation=dict(href=f'{server.url}/submodels/bWlzc2luZw'))
+                ]),
+            ])
+            server.repository.collections['shell-descriptors']['urn:aas:host1'] = descriptor
+
+            plugin = self.get_plugin(host='127.0.0.1', port=port, fetch_submodels=True)
+            host_entries = plugin.get_host_entries()
+
+        self.assertEqual({'Technical-Data': {'Speed': '1200'}}, host_entries[0]['values'])
+        plugin.display.warning.assert_called_once()
+        self.assertIn('Missing', plugin.display.warning.call_args[0][0])
+
+    def test_get_host_entries_by_default_expect_no_value_requests(self):
+        with FakeAasServer() as server:
+            server.repository.collections['submodels']['urn:sm:1'] = dict(id='urn:sm:1', submodelElements=[])
+            descriptor = dict(self.descriptor, submodelDescriptors=[
+                dict(self.descriptor['submodelDescriptors'][0], endpoints=[
+                    dict(interface='SUBMODEL-3.0', protocolInformation=dict(href=f'{server.url}/submodels/dXJuOnNtOjE'))
+                ]),
+            ])
+            server.repository.collections['shell-descriptors']['urn:aas:host1'] = descriptor
+
+            plugin = self.get_plugin(host='127.0.0.1', port=server.url.rsplit(':', 1)[1])
+            with mock.patch('plugins.inventory.aas_registry.get_submodel_value') as get_submodel_value:
+                host_entries = plugin.get_host_entries()
+
+            get_submodel_value.assert_not_called()
+            self.assertEqual({}, host_entries[0]['values'])
+            # Only the page of shell descriptors is requested:
+            self.assertEqual(dict(GET=1), server.stats.as_dict()['requests_per_method'])
+
+    def test_populate_with_hostname_id_expect_id_as_hostname(self):
+        plugin = self.get_plugin(hostname='id')
+        plugin.populate([get_host_entry(self.descriptor)])
+
+        self.assertIsNotNone(plugin.inventory.get_host('urn:aas:host1'))
@@ -0,0 +1,75 @@
+import os
+import stat
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from plugins.module_utils.limiter import DEFAULT_LIMITER_DIR, RequestLimiter, create_limiter
+
+
+class UnitTests(unittest.TestCase):
+    url = 'http://localhost:8081/submodels'
+
+    def test_no_limits_expect_no_limiter(self):
+        self.assertIsNone(create_limiter(dict(max_requests_per_second=0, max_in_flight=0, limiter_dir='')))
+
+    def test_max_requests_per_second_expect_requests_spread(self):
+        limiter = RequestLimiter(tempfile.mkdtemp(), max_requests_per_second=20)
+
+        start = time.monotonic()
+        for _ in range(30):
+            with limiter.acquire(self.url):
+                pass
+        duration = time.monotonic() - start
+
+        # 20 requests of the initial burst, 10 more at 20 per second:
+        self.assertGreaterEqual(duration, 0.45)
+        self.assertLess(duration, 2)
+
+    def test_max_requests_per_second_is_per_endpoint(self):
+        limiter = RequestLimiter(tempfile.mkdtemp(), max_requests_per_second=1)
+
+        start = time.monotonic()
+        for port in range(8081, 8091):
+            with limiter.acquire(f'http://localhost:{port}/submodels'):
+                pass
+
+        self.assertLess(time.monotonic() - start, 0.5)
+
+    def test_max_in_flight_expect_limited_concurrency(self):
+        limiter_dir = tempfile.mkdtemp()
+        lock = threading.Lock()
+        in_flight = [0, 0]
+
+        def request(index):
+            # Separate limiter per thread, like separate processes sharing 'limiter_dir':
+            with RequestLimiter(limiter_dir, max_in_flight=3).acquire(self.url):
+                with lock:
+                    in_flight[0] += 1
+                    in_flight[1] = max(in_flight)
+                time.sleep(0.02)
+                with lock:
+                    in_flight[0] -= 1
+
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            list(executor.map(request, range(30)))
+
+        self.assertEqual(3, in_flight[1])
+
+    def test_default_limiter_dir_expect_below_home(self):
+        self.assertEqual(os.path.expanduser('~/.ansible/tmp/slm-aas-limiter'), DEFAULT_LIMITER_DIR)
+
+    def test_limiter_dir_expect_private_dir_created(self):
+        limiter_dir = os.path.join(tempfile.mkdtemp(), 'slm-aas-limiter')
+        RequestLimiter(limiter_dir, max_in_flight=1)
+
+        self.assertEqual(0o700, stat.S_IMODE(os.stat(limiter_dir).st_mode))
+
+    def test_limiter_dir_writable_by_others_expect_refused(self):
+        limiter_dir = tempfile.mkdtemp()
+        os.chmod(limiter_dir, 0o1777)
+
+        with self.assertRaises(PermissionError):
+            RequestLimiter(limiter_dir, max_in_flight=1)
@@ -0,0 +1,113 @@
+import os
+import tempfile
+import unittest
+
+from ansible.errors import AnsibleLookupError
+
+from plugins.lookup.submodel_value import MISSING, LookupModule, get_levels, get_path_value, get_run_cache_dir, \
+    get_terms
+from plugins.modules.submodel import SmRepoClient
+from tests.benchmark.fake_server import FakeAasServer
+from tests.unit.helpers import FakeAdapter
+
+
+class FakeOptionsLookupModule(LookupModule):
+    defaults = dict(
+        scheme='http', host='127.0.0.1', port='8081', submodel_id=None, level=None, default=None, concurrency=4,
+        cache='none', cache_ttl=60, cache_dir=None
+    )
+
+    def __init__(self, **options):
+        super().__init__()
+        self.options = dict(self.defaults, **options)
+
+    def set_options(self, task_keys=None, var_options=None, direct=None):
+        self.options.update(direct or {})
+
+    def get_option(self, option, hostvars=None):
+        return self.options[option]
+
+
+class UnitTests(unittest.TestCase):
+    submodel_value = {
+        'SerialNumber': '123',
+        'Documents': [{'Title': 'Manual'}, {'Title': 'Datasheet'}],
+        'GeneralInformation': {'ManufacturerPartNumber': 'P-1'},
+    }
+
+    def test_get_path_value_expect_values(self):
+        self.assertEqual('123', get_path_value(self.submodel_value, 'SerialNumber'))
+        self.assertEqual('Datasheet', get_path_value(self.submodel_value, 'Documents[1].Title'))
+        self.assertEqual('P-1', get_path_value(self.submodel_value, 'GeneralInformation.ManufacturerPartNumber'))
+
+    def test_get_path_value_of_missing_path_expect_missing(self):
+        self.assertIs(MISSING, get_path_value(self.submodel_value, 'Missing'))
+        self.assertIs(MISSING, get_path_value(self.submodel_value, 'Documents[2].Title'))
+        self.assertIs(MISSING, get_path_value(self.submodel_value, 'SerialNumber.Value'))
+
+    def test_get_terms_expect_default_submodel_id(self):
+        terms = get_terms(['SerialNumber', dict(submodel_id='urn:sm:2', path='Speed')], 'urn:sm:1')
+
+        self.assertEqual([('urn:sm:1', 'SerialNumber'), ('urn:sm:2', 'Speed')], terms)
+
+    def test_get_terms_without_submodel_id_expect_error(self):
+        with self.assertRaises(AnsibleLookupError):
+            get_terms(['SerialNumber'])
+
+    def test_get_submodel_values_expect_one_request_per_submodel(self):
+        client = SmRepoClient('http://localhost:8081')
+        adapter = FakeAdapter()
+        client.session.mount('http://', adapter)
+
+        values = FakeOptionsLookupModule().get_submodel_values(client, {'urn:sm:1': 'core', 'urn:sm:2': 'core'})
+
+        self.assertEqual(2, len(adapter.requests))
+        self.assertEqual(['urn:sm:1', 'urn:sm:2'], list(values))
+        self.assertTrue(all(request.url.endswith('/$value?level=core') for request in adapter.requests))
+
+    def test_get_levels_expect_core_for_top_level_paths_only(self):
+        terms = [('urn:sm:1', 'SerialNumber'), ('urn:sm:2', 'Speed'), ('urn:sm:2', 'Documents[0].Title')]
+
+        self.assertEqual({'urn:sm:1': 'core', 'urn:sm:2': 'deep'}, get_levels(terms))
+        self.assertEqual({'urn:sm:1': 'deep', 'urn:sm:2': 'deep'}, get_levels(terms, 'deep'))
+
+    def run_lookup(self, server, terms, **options):
+        submodels = server.repository.collections['submodels']
+        submodels['urn:sm:1'] = dict(id='urn:sm:1', submodelElements=[
+            dict(idShort=id_short, value=value) for id_short, value in self.submodel_value.items()
+        ])
+        lookup = FakeOptionsLookupModule(port=server.url.rsplit(':', 1)[1], submodel_id='urn:sm:1')
+        return lookup.run(terms, **options)
+
+    def test_run_top_level_paths_expect_one_core_request(self):
+        with FakeAasServer() as server:
+            self.assertEqual(['123'], self.run_lookup(server, ['SerialNumber']))
+            self.assertEqual(1, server.stats.as_dict()['requests'])
+
+    def test_run_top_level_collection_expect_deep_request_again(self):
+        with FakeAasServer() as server:
+            values = self.run_lookup(server, ['SerialNumber', 'Documents'])
+
+            self.assertEqual(['123', self.submodel_value['Documents']], values)
+            self.assertEqual(2, server.stats.as_dict()['requests'])
+
+    def test_run_missing_path_with_null_default_expect_none(self):
+        with FakeAasServer() as server:
+            self.assertEqual(['123', None], self.run_lookup(server, ['SerialNumber', 'Missing.Path'], default=None))
+
+    def test_run_missing_path_without_default_expect_error(self):
+        with FakeAasServer() as server:
+            with self.assertRaisesRegex(AnsibleLookupError, 'Missing'):
+                self.run_lookup(server, ['SerialNumber', 'Missing.Path'])
+
+    def test_get_run_cache_dir_expect_directory_per_run(self):
+        cache_dir = os.path.join(tempfile.mkdtemp(), 'slm-aas-cache')
+        run_cache_dir = get_run_cache_dir(cache_dir)
+        os.makedirs(run_cache_dir)
+        # pid 2 ** 22 + 1 is above the maximum pid of Linux, the run is never alive:
+        finished_run_cache_dir = os.path.join(cache_dir, f'run-{2 ** 22 + 1}')
+        os.makedirs(finished_run_cache_dir)
+
+        self.assertEqual(run_cache_dir, get_run_cache_dir(cache_dir))
+        self.assertTrue(os.path.isdir(run_cache_dir))
+        self.assertFalse(os.path.exists(finished_run_cache_dir))
@@ -0,0 +1,59 @@
+import json
+import unittest
+
+from plugins.module_utils.cache import ResponseCache
+from plugins.module_utils.convert import convert_to_submodel
+from plugins.module_utils.metrics import Metrics, create_metrics, measure
+from plugins.module_utils.session import create_session
+from tests.unit.helpers import FakeAdapter
+
+
+class FakeServerTimingAdapter(FakeAdapter):
+    def respond(self, request):
+        return 200, dict(url=request.url), {'Server-Timing': 'db;dur=12.5'}
+
+
+class UnitTests(unittest.TestCase):
+    url = 'http://localhost:8081/submodels'
+
+    def get_session(self, metrics, cache=None):
+        session = create_session(cache=cache, metrics=metrics)
+        session.mount('http://', FakeServerTimingAdapter())
+        return session
+
+    def test_metrics_disabled_expect_none(self):
+        self.assertIsNone(create_metrics(dict(metrics=False)))
+        with measure(None, 'conversion'):
+            pass
+
+    def test_requests_expect_counted(self):
+        metrics = Metrics()
+        session = self.get_session(metrics)
+        session.post(self.url, data=b'12345')
+        session.get(self.url)
+
+        result = metrics.as_dict()
+        self.assertEqual(2, result['requests'])
+        self.assertEqual(5, result['bytes_sent'])
+        self.assertEqual(2 * len(json.dumps(dict(url=self.url))), result['bytes_received'])
+        self.assertEqual(0.025, result['server_time'])
+        self.assertIn('network', result['phases'])
+
+    def test_cache_hit_expect_no_request(self):
+        metrics = Metrics()
+        session = self.get_session(metrics, ResponseCache())
+        session.get(self.url)
+        session.get(self.url)
+
+        result = metrics.as_dict()
+        self.assertEqual(1, result['requests'])
+        self.assertEqual(1, result['cache_hits'])
+
+    def test_convert_expect_conversion_and_serialization_phases(self):
+        metrics = Metrics()
+        convert_to_submodel('test_id', dict(key='value'), metrics=metrics)
+
+        phases = metrics.as_dict()['phases']
+        for phase in ['import', 'conversion', 'serialization', 'total']:
+            self.assertIn(phase, phases)
+        self.assertGreater(phases['conversion']['wall'], 0)
@@ -0,0 +1,86 @@
+import io
+import json
+import unittest
+
+from plugins.module_utils import pagination
+from plugins.module_utils.pagination import iter_paged
+
+
+class FakeResponse:
+    def __init__(self, content: dict):
+        self.content = json.dumps(content).encode('utf-8')
+        self.raw = io.BytesIO(self.content)
+
+    def raise_for_status(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakeCollection:
+    def __init__(self, items):
+        self.items = items
+        self.requests = []
+
+    def get(self, url, params, stream=False):
+        self.requests.append(params)
+
+        start = int(params.get('cursor', 0))
+        end = start + params['limit']
+        content = dict(result=self.items[start:end])
+        if end < len(self.items):
+            content['paging_metadata'] = dict(cursor=str(end))
+
+        return FakeResponse(content)
+
+
+class UnitTests(unittest.TestCase):
+    items = [
+        {'id': f'id-{index}', 'endpoints': [{'interface': 'http', 'index': index}]}
+        for index in range(7)
+    ]
+
+    def test_iter_paged_expect_all_items_in_order(self):
+        collection = FakeCollection(self.items)
+
+        self.assertEqual(
+            self.items,
+            list(iter_paged(collection.get, 'http://localhost/submodels', limit=3))
+        )
+
+    def test_iter_paged_expect_one_request_per_page(self):
+        collection = FakeCollection(self.items)
+        list(iter_paged(collection.get, 'http://localhost/submodels', limit=3))
+
+        self.assertEqual(
+            [{'limit': 3}, {'limit': 3, 'cursor': '3'}, {'limit': 3, 'cursor': '6'}],
+            collection.requests
+        )
+
+    def test_iter_paged_is_lazy(self):
+        collection = FakeCollection(self.items)
+        items = iter_paged(collection.get, 'http://localhost/submodels', limit=3)
+        next(items)
+
+        self.assertEqual(
+            1,
+            len(collection.requests)
+        )
+
+    @unittest.skipUnless(pagination.HAS_IJSON, 'ijson is not installed')
+    def test_iter_paged_stream_expect_all_items_in_order(self):
+        collection = FakeCollection(self.items)
+
+        self.assertEqual(
+            self.items,
+            list(iter_paged(collection.get, 'http://localhost/submodels', limit=2, stream=True))
+        )
+
+    def test_iter_paged_empty_collection_expect_no_items(self):
+        collection = FakeCollection([])
+
+        self.assertEqual(
+            [],
+            list(iter_paged(collection.get, 'http://localhost/submodels', limit=3))
+        )
@@ -0,0 +1,102 @@
+import os
+import tempfile
+import unittest
+
+from plugins.module_utils.submodel_repository import get_reference
+from tests.benchmark.fake_server import FakeAasServer
+from tests.unit.helpers import run_module
+
+
+class UnitTests(unittest.TestCase):
+    shell_id = 'urn:shell:1'
+    submodel = dict(id='urn:sm:1', idShort='facts', modelType='Submodel', submodelElements=[])
+
+    def get_aas_descriptor(self, href='http://localhost:8081'):
+        return dict(
+            id=self.shell_id,
+            endpoints=[dict(interface='AAS-3.0', protocolInformation=dict(href=f'{href}/shells/urn:shell:1'))]
+        )
+
+    def publish(self, server, **args):
+        port = server.url.rsplit(':', 1)[1]
+
+        return run_module('publish', dict(
+            dict(
+                repository_host='127.0.0.1',
+                repository_port=port,
+                shell_registry_port=port,
+                submodel_registry_port=port,
+                submodel=self.submodel,
+                shell_id=self.shell_id,
+                aas_descriptor=self.get_aas_descriptor(),
+            ),
+            **args
+        ))
+
+    def get_status_codes(self, result) -> dict:
+        return {name: step['status_code'] for name, step in result['steps'].items()}
+
+    def test_publish_expect_all_steps_created(self):
+        with FakeAasServer() as server:
+            collections = server.repository.collections
+            collections['shells'][self.shell_id] = dict(id=self.shell_id, submodels=[])
+
+            result = self.publish(server)
+
+            self.assertTrue(result['changed'])
+            self.assertEqual(
+                dict(submodel=201, submodel_reference=201, submodel_descriptor=201, aas_descriptor=201),
+                self.get_status_codes(result)
+            )
+            self.assertEqual(self.submodel, collections['submodels'][self.submodel['id']])
+            self.assertEqual([get_reference(self.submodel['id'])], collections['shells'][self.shell_id]['submodels'])
+            self.assertEqual(result['submodel_descriptor'], collections['submodel-descriptors'][self.submodel['id']])
+            self.assertEqual(self.get_aas_descriptor(), collections['shell-descriptors'][self.shell_id])
+
+    def test_publish_again_expect_reference_added_once_and_descriptors_unchanged(self):
+        with FakeAasServer() as server:
+            collections = server.repository.collections
+            collections['shells'][self.shell_id] = dict(id=self.shell_id, submodels=[])
+            self.publish(server)
+            server.reset_stats()
+
+            result = self.publish(server, update_descriptors=True)
+
+            self.assertFalse(result['changed'])
+            # The existing submodel is updated (forced), the reference and descriptors are only compared:
+            self.assertEqual(
+                dict(submodel=204, submodel_reference=200, submodel_descriptor=200, aas_descriptor=200),
+                self.get_status_codes(result)
+            )
+            self.assertEqual(1, len(collections['shells'][self.shell_id]['submodels']))
+            self.assertEqual(dict(GET=3, POST=1, PUT=1), server.stats.as_dict()['requests_per_method'])
+
+    def test_publish_changed_descriptor_expect_updated(self):
+        with FakeAasServer() as server:
+            collections = server.repository.collections
+            collections['shells'][self.shell_id] = dict(id=self.shell_id, submodels=[])
+            self.publish(server)
+
+            aas_descriptor = self.get_aas_descriptor('http://other')
+            result = self.publish(server, update_descriptors=True, aas_descriptor=aas_descriptor)
+
+            self.assertTrue(result['changed'])
+            self.assertEqual(dict(status_code=204, changed=True), result['steps']['aas_descriptor'])
+            self.assertEqual(aas_descriptor, collections['shell-descriptors'][self.shell_id])
+
+    def test_publish_unknown_shell_expect_failed(self):
+        with FakeAasServer() as server:
+            result = self.publish(server)
+
+            self.assertTrue(result['failed'])
+            self.assertIn(self.shell_id, result['msg'])
+
+    def test_publish_with_cache_dir_writable_by_others_expect_failed(self):
+        with FakeAasServer() as server, tempfile.TemporaryDirectory() as cache_dir:
+            os.chmod(cache_dir, 0o777)
+
+            result = self.publish(server, cache='file', cache_dir=cache_dir)
+
+            self.assertTrue(result['failed'])
+            self.assertIn('writable by group or others', result['msg'])
+            self.assertEqual(0, server.stats.as_dict()['requests'])
@@ -0,0 +1,129 @@
+import unittest
+
+from plugins.module_utils.aas_json import encode_json
+from plugins.module_utils.sharding import (SHARD_MANIFEST_EXTENSION, SHARD_OF_EXTENSION, get_extension_value,
+                                           get_manifest_shards, group_elements, is_manifest, merge_shards,
+                                           shard_submodel)
+from plugins.module_utils.shell_repository import ShellRepoClient
+from plugins.module_utils.validation import validate_submodel
+from plugins.modules.submodel import SmRepoClient, get_reference
+from tests.benchmark.fake_server import FakeAasServer
+from tests.unit.helpers import run_module
+
+
+def get_submodel(element_count, value_size=100) -> dict:
+    return dict(
+        modelType='Submodel',
+        id='urn:sm',
+        idShort='Facts',
+        semanticId=dict(type='ExternalReference', keys=[dict(type='GlobalReference', value='urn:facts')]),
+        submodelElements=[
+            dict(modelType='Property', idShort=f'Property{i}', valueType='xs:string', value='x' * value_size)
+            for i in range(element_count)
+        ],
+    )
+
+
+class UnitTests(unittest.TestCase):
+    def test_small_submodel_expect_not_sharded(self):
+        submodel = get_submodel(10)
+        self.assertEqual([submodel], shard_submodel(submodel, 0))
+        self.assertEqual([submodel], shard_submodel(submodel, len(encode_json(submodel))))
+
+        single_element = get_submodel(1, value_size=10000)
+        self.assertEqual([single_element], shard_submodel(single_element, 100))
+
+    def test_group_elements_expect_consecutive_groups_up_to_max_bytes(self):
+        self.assertEqual([['a', 'b'], ['c'], ['d', 'e']], group_elements('abcde', [3, 4, 9, 5, 5], 10))
+        self.assertEqual([['a'], ['b']], group_elements('ab', [20, 1], 10))
+
+    def test_large_submodel_expect_manifest_and_shards(self):
+        submodel = get_submodel(10)
+        element_bytes = len(encode_json(submodel['submodelElements'][0]))
+        manifest, *shards = shard_submodel(submodel, 3 * element_bytes)
+
+        self.assertTrue(is_manifest(manifest))
+        self.assertEqual('urn:sm', manifest['id'])
+        self.assertEqual(submodel['semanticId'], manifest['semanticId'])
+        self.assertEqual([3, 3, 3, 1], [len(shard['submodelElements']) for shard in shards])
+        self.assertEqual(['urn:sm/shards/0', 'urn:sm/shards/1', 'urn:sm/shards/2', 'urn:sm/shards/3'],
+                         [shard['id'] for shard in shards])
+        self.assertEqual('Facts_shard3', shards[3]['idShort'])
+        self.assertEqual('urn:sm', get_extension_value(shards[0], SHARD_OF_EXTENSION))
+        self.assertEqual(('urn:sm/shards/1', ['Property3', 'Property4', 'Property5']), get_manifest_shards(manifest)[1])
+
+        for part in [manifest] + shards:
+            self.assertEqual([], validate_submodel(part))
+
+    def test_merge_shards_expect_original_submodel(self):
+        submodel = get_submodel(7)
+        manifest, *shards = shard_submodel(submodel, 250)
+
+        merged = merge_shards(manifest, list(reversed(shards)))
+        self.assertEqual(submodel, merged)
+        self.assertIsNone(get_extension_value(merged, SHARD_MANIFEST_EXTENSION))
+
+    def test_upload_shards_expect_references_on_shell(self):
+        with FakeAasServer() as server:
+            server.repository.collections['shells']['urn:shell'] = dict(
+                id='urn:shell', submodels=[get_reference('urn:sm')]
+            )
+            client = SmRepoClient(server.url, max_workers=4)
+            shell_client = ShellRepoClient(server.url, max_workers=4)
+            parts = shard_submodel(get_submodel(6), 250)
+            references = [get_reference(part['id']) for part in parts]
+
+            responses = client.create_many(parts)
+            added = shell_client.add_submodel_references('urn:shell', references + [references[-1]])
+
+            self.assertEqual([201] * len(parts), [status_code for status_code, content in responses])
+            # The duplicate reference is posted once and gets the response of its first occurrence:
+            self.assertEqual([200] + [201] * len(parts), [status_code for status_code, content in added])
+            self.assertCountEqual(references, server.repository.collections['shells']['urn:shell']['submodels'])
+            self.assertEqual(
+                [200] * len(parts),
+                [status_code for status_code, content in shell_client.add_submodel_references('urn:shell', references)]
+            )
+
+            stored = server.repository.collections['submodels']
+            self.assertEqual(get_submodel(6), merge_shards(stored['urn:sm'], stored.values()))
+
+    def test_module_with_shell_repository_expect_references_added_there(self):
+        with FakeAasServer() as sm_server, FakeAasServer() as shell_server:
+            shell_server.repository.collections['shells']['urn:shell'] = dict(id='urn:shell', submodels=[])
+            parts = shard_submodel(get_submodel(6), 250)
+
+            result = run_module('submodel', dict(
+                host='127.0.0.1',
+                port=sm_server.url.rsplit(':', 1)[1],
+                submodel=get_submodel(6),
+                shard_max_bytes=250,
+                shell_id='urn:shell',
+                shell_repository_port=shell_server.url.rsplit(':', 1)[1],
+            ))
+
+            self.assertTrue(result['changed'])
+            self.assertEqual({part['id']: 201 for part in parts}, result['shell_references'])
+            # The references are added concurrently, in any order:
+            self.assertCountEqual(
+                [get_reference(part['id']) for part in parts],
+                shell_server.repository.collections['shells']['urn:shell']['submodels']
+            )
+            self.assertNotIn('urn:shell', sm_server.repository.collections['shells'])
+
+    def test_module_with_unreachable_shell_repository_expect_failed(self):
+        with FakeAasServer() as server:
+            result = run_module('submodel', dict(
+                host='127.0.0.1',
+                port=server.url.rsplit(':', 1)[1],
+                submodel=get_submodel(1),
+                shell_id='urn:shell',
+                shell_repository_port='1',
+            ))
+
+            self.assertTrue(result['failed'])
+            self.assertIn('Failed to add submodel references to urn:shell', result['msg'])
+
+
+if __name__ == '__main__':
+    unittest.main()
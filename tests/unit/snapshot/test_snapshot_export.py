@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+
+import requests
+
+from plugins.module_utils.snapshot import iter_snapshot, open_snapshot
+from plugins.modules.snapshot_export import SnapshotExportClient
+from tests.benchmark.fake_server import FakeAasServer
+
+
+def fill_repository(repository, count):
+    collections = repository.collections
+    for i in range(count):
+        collections['submodels'][f'urn:sm:{i}'] = dict(modelType='Submodel', id=f'urn:sm:{i}', idShort=f'Sm{i}')
+        collections['submodel-descriptors'][f'urn:sm:{i}'] = dict(id=f'urn:sm:{i}')
+    for i in range(count // 2):
+        collections['shells'][f'urn:shell:{i}'] = dict(modelType='AssetAdministrationShell', id=f'urn:shell:{i}')
+        collections['shell-descriptors'][f'urn:shell:{i}'] = dict(id=f'urn:shell:{i}')
+
+
+class UnitTests(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeAasServer().start()
+        self.client = SnapshotExportClient(self.server.url, self.server.url, self.server.url, page_size=7)
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'snapshot.jsonl.gz')
+
+    def tearDown(self):
+        self.server.stop()
+        self.directory.cleanup()
+
+    def test_export_expect_all_items_as_lines(self):
+        fill_repository(self.server.repository, 50)
+        progress = []
+
+        statistics = self.client.export(
+            self.path, ['submodels', 'shells', 'submodel_descriptors', 'shell_descriptors'],
+            progress=progress.append, progress_interval=1e-9
+        )
+
+        self.assertEqual(dict(submodels=50, shells=25, submodel_descriptors=50, shell_descriptors=25),
+                         statistics['counts'])
+        self.assertEqual(150, statistics['items'])
+        self.assertLess(statistics['file_bytes'], statistics['bytes'])
+        self.assertTrue(progress)
+
+        with open_snapshot(self.path) as fp:
+            entries = list(iter_snapshot(fp))
+        self.assertEqual(150, len(entries))
+        self.assertEqual(
+            self.server.repository.collections['submodels'],
+            {item['id']: item for collection, item in entries if collection == 'submodels'}
+        )
+        self.assertEqual(['snapshot.jsonl.gz'], os.listdir(self.directory.name))
+
+    def test_uncompressed_export_expect_json_lines(self):
+        fill_repository(self.server.repository, 2)
+
+        self.client.export(self.path, ['shells'], compression_level=0)
+
+        with open(self.path, 'rb') as fp:
+            self.assertEqual(
+                b'{"collection":"shells","item":{"modelType":"AssetAdministrationShell","id":"urn:shell:0"}}\n',
+                fp.read()
+            )
+
+    def test_failed_export_expect_no_snapshot_written(self):
+        fill_repository(self.server.repository, 50)
+        self.server.httpd.error_rate = 0.5
+
+        with self.assertRaises(requests.exceptions.HTTPError):
+            self.client.export(self.path, ['submodels', 'shells', 'submodel_descriptors', 'shell_descriptors'])
+
+        self.assertEqual([], os.listdir(self.directory.name))
+
+
+if __name__ == '__main__':
+    unittest.main()
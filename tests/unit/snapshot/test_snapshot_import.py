@@ -0,0 +1,123 @@
+import os
+import tempfile
+import unittest
+
+import requests
+
+from plugins.module_utils.snapshot import SNAPSHOT_COLLECTIONS, get_snapshot_line, open_snapshot
+from plugins.modules.snapshot_export import SnapshotExportClient
+from plugins.modules.snapshot_import import Checkpoint, SnapshotImportClient
+from tests.benchmark.fake_server import FakeAasServer
+from tests.unit.helpers import FakeAdapter
+from tests.unit.snapshot.test_snapshot_export import fill_repository
+
+
+class FakeTimeoutAdapter(FakeAdapter):
+    def respond(self, request):
+        raise requests.exceptions.ReadTimeout(request=request)
+
+
+class UnitTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'snapshot.jsonl.gz')
+        self.checkpoint_path = f'{self.path}.checkpoint'
+
+        with FakeAasServer() as source:
+            fill_repository(source.repository, 40)
+            self.collections = source.repository.collections
+            SnapshotExportClient(source.url, source.url, source.url).export(self.path, list(SNAPSHOT_COLLECTIONS))
+
+        self.server = FakeAasServer().start()
+        self.client = SnapshotImportClient(self.server.url, self.server.url, self.server.url, max_workers=4)
+
+    def tearDown(self):
+        self.server.stop()
+        self.directory.cleanup()
+
+    def get_checkpoint(self, collections=tuple(SNAPSHOT_COLLECTIONS)):
+        checkpoint = Checkpoint(self.checkpoint_path, self.path, collections)
+        checkpoint.load()
+        return checkpoint
+
+    def test_import_expect_all_items_created(self):
+        statistics = self.client.import_snapshot(self.path, self.get_checkpoint(), set(SNAPSHOT_COLLECTIONS))
+
+        self.assertEqual(dict(created=120, updated=0, existing=0, failed=0, resumed=0), statistics['counts'])
+        self.assertEqual(self.collections, self.server.repository.collections)
+
+        statistics = self.client.import_snapshot(self.path, Checkpoint(self.checkpoint_path, self.path, []),
+                                                 set(SNAPSHOT_COLLECTIONS))
+        self.assertEqual(120, statistics['counts']['updated'])
+
+    def test_import_collections_expect_others_skipped(self):
+        statistics = self.client.import_snapshot(self.path, self.get_checkpoint(['shells']), {'shells'})
+
+        self.assertEqual(20, statistics['counts']['created'])
+        self.assertEqual(self.collections['shells'], self.server.repository.collections['shells'])
+        self.assertEqual({}, self.server.repository.collections['submodels'])
+        self.assertEqual(120, self.get_checkpoint(['shells']).lines)
+        self.assertEqual(0, self.get_checkpoint().lines)
+
+    def test_resume_after_failures_expect_only_failed_items_uploaded(self):
+        self.server.httpd.error_rate = 0.3
+        statistics = self.client.import_snapshot(self.path, self.get_checkpoint(), set(SNAPSHOT_COLLECTIONS))
+        failed = statistics['counts']['failed']
+        self.assertGreater(failed, 0)
+        self.assertEqual(sorted(failure['line'] for failure in statistics['failures']),
+                         sorted(self.get_checkpoint().failed))
+
+        self.server.httpd.error_rate = 0
+        self.server.reset_stats()
+        statistics = self.client.import_snapshot(self.path, self.get_checkpoint(), set(SNAPSHOT_COLLECTIONS))
+
+        self.assertEqual(dict(created=failed, updated=0, existing=0, failed=0, resumed=120 - failed),
+                         statistics['counts'])
+        self.assertEqual(failed, self.server.stats.as_dict()['requests'])
+        self.assertEqual(self.collections, self.server.repository.collections)
+        self.assertEqual((120, set(), set()), (self.get_checkpoint().lines, self.get_checkpoint().completed,
+                                               self.get_checkpoint().failed))
+
+    def test_import_item_without_id_expect_failure(self):
+        path = os.path.join(self.directory.name, 'without_id.jsonl.gz')
+        with open_snapshot(path, 'wb') as fp:
+            fp.write(get_snapshot_line('submodels', dict(modelType='Submodel', id='urn:sm:1')))
+            fp.write(get_snapshot_line('submodels', dict(modelType='Submodel', idShort='NoId')))
+            fp.write(get_snapshot_line('shell_descriptors', dict(id='urn:shell:1')))
+
+        checkpoint = Checkpoint(f'{path}.checkpoint', path, SNAPSHOT_COLLECTIONS)
+        statistics = self.client.import_snapshot(path, checkpoint, set(SNAPSHOT_COLLECTIONS))
+
+        self.assertEqual(dict(created=2, updated=0, existing=0, failed=1, resumed=0), statistics['counts'])
+        self.assertEqual([dict(line=1, collection='submodels', id=None, status_code=None)], statistics['failures'])
+        self.assertEqual({1}, checkpoint.failed)
+
+    def test_import_timeout_expect_request_exception_and_checkpoint_saved(self):
+        self.client.session.mount('http://', FakeTimeoutAdapter())
+
+        with self.assertRaises(requests.exceptions.RequestException):
+            self.client.import_snapshot(self.path, self.get_checkpoint(), set(SNAPSHOT_COLLECTIONS))
+        self.assertTrue(os.path.exists(self.checkpoint_path))
+        self.assertEqual(0, self.get_checkpoint().lines)
+
+    def test_checkpoint_expect_lines_merged_and_other_snapshots_ignored(self):
+        checkpoint = self.get_checkpoint()
+        for line in [0, 1, 3, 4]:
+            checkpoint.mark(line)
+        checkpoint.mark(2, failed=True)
+        checkpoint.mark(6)
+        checkpoint.save()
+
+        checkpoint = self.get_checkpoint()
+        self.assertEqual((5, {6}, {2}), (checkpoint.lines, checkpoint.completed, checkpoint.failed))
+        self.assertEqual([True, False, False, True], [checkpoint.is_done(line) for line in (1, 2, 5, 6)])
+
+        checkpoint.mark(2)
+        self.assertEqual((5, set()), (checkpoint.lines, checkpoint.failed))
+
+        os.utime(self.path, ns=(0, 0))
+        self.assertFalse(Checkpoint(self.checkpoint_path, self.path, SNAPSHOT_COLLECTIONS).load())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -192,3 +192,81 @@ class UnitTests(unittest.TestCase):
             0,
             len(content['result'])
         )
+
+    def get_submodels(self, count=3):
+        return [
+            model.Submodel(
+                id_=f'test-submodel-id-{index}',
+                submodel_element={
+                    model.Property(
+                        id_short=self.se_property_id,
+                        value_type=model.datatypes.String,
+                        value=self.se_property_value,
+                    )
+                }
+            )
+            for index in range(count)
+        ]
+
+    def test_12_create_many_expect_201(self):
+        responses = UnitTests.sm_repo_client.create_many(self.get_submodels(), max_workers=2)
+
+        self.assertEqual(
+            [201, 201, 201],
+            [status_code for status_code, content in responses]
+        )
+
+    def test_13_create_many_again_expect_409(self):
+        responses = UnitTests.sm_repo_client.create_many(self.get_submodels(), max_workers=2)
+
+        self.assertEqual(
+            [409, 409, 409],
+            [status_code for status_code, content in responses]
+        )
+
+    def test_14_create_many_force_expect_204(self):
+        responses = UnitTests.sm_repo_client.create_many(self.get_submodels(), force=True)
+
+        self.assertEqual(
+            [204, 204, 204],
+            [status_code for status_code, content in responses]
+        )
+
+    def test_15_get_all_expect_three(self):
+        status_code, content = UnitTests.sm_repo_client.get_all()
+
+        self.assertEqual(
+            3,
+            len(content['result'])
+        )
+
+    def test_16_get_all_limit_one_expect_cursor(self):
+        status_code, content = UnitTests.sm_repo_client.get_all(limit=1)
+
+        self.assertEqual(
+            1,
+            len(content['result'])
+        )
+
+        self.assertTrue(
+            content['paging_metadata']['cursor']
+        )
+
+    def test_17_iter_all_page_size_one_expect_three(self):
+        submodels = list(UnitTests.sm_repo_client.iter_all(page_size=1))
+
+        self.assertEqual(
+            sorted(submodel.id for submodel in self.get_submodels()),
+            sorted(submodel['id'] for submodel in submodels)
+        )
+
+    def test_18_iter_all_stream_expect_three(self):
+        submodels = list(UnitTests.sm_repo_client.iter_all(page_size=2, stream=True))
+
+        self.assertEqual(
+            3,
+            len(submodels)
+        )
+
+        for submodel in self.get_submodels():
+            UnitTests.sm_repo_client.delete(submodel.id)
@@ -0,0 +1,71 @@
+import unittest
+
+from plugins.module_utils.descriptor import descriptors_equal, normalize_descriptor
+from plugins.module_utils.registry import SubmodelRegistryClient
+from tests.benchmark.fake_server import FakeAasServer
+
+
+class UnitTests(unittest.TestCase):
+    descriptor = {
+        'id': 'sm-id',
+        'semanticId': {
+            'type': 'ExternalReference',
+            'keys': [
+                {'type': 'GlobalReference', 'value': 'first'},
+                {'type': 'GlobalReference', 'value': 'second'}
+            ]
+        },
+        'endpoints': [
+            {'interface': 'http', 'protocolInformation': {'href': 'http://localhost:8081/submodels/sm-id'}},
+            {'interface': 'https', 'protocolInformation': {'href': 'https://localhost:8443/submodels/sm-id'}}
+        ]
+    }
+
+    def test_equal_descriptors_expect_equal(self):
+        self.assertTrue(descriptors_equal(self.descriptor, dict(self.descriptor)))
+
+    def test_endpoint_order_expect_equal(self):
+        existing = dict(self.descriptor, endpoints=list(reversed(self.descriptor['endpoints'])))
+
+        self.assertTrue(descriptors_equal(self.descriptor, existing))
+
+    def test_key_order_expect_not_equal(self):
+        semantic_id = dict(self.descriptor['semanticId'], keys=list(reversed(self.descriptor['semanticId']['keys'])))
+        existing = dict(self.descriptor, semanticId=semantic_id)
+
+        self.assertFalse(descriptors_equal(self.descriptor, existing))
+
+    def test_empty_values_expect_equal(self):
+        existing = dict(self.descriptor, description=[], administration=None, extensions={})
+
+        self.assertTrue(descriptors_equal(self.descriptor, existing))
+
+    def test_changed_href_expect_not_equal(self):
+        existing = dict(self.descriptor, endpoints=[
+            {'interface': 'http', 'protocolInformation': {'href': 'http://other:8081/submodels/sm-id'}},
+            self.descriptor['endpoints'][1]
+        ])
+
+        self.assertFalse(descriptors_equal(self.descriptor, existing))
+
+    def test_normalize_does_not_modify_input(self):
+        endpoints = list(reversed(self.descriptor['endpoints']))
+        normalize_descriptor(dict(self.descriptor, endpoints=endpoints))
+
+        self.assertEqual('https', endpoints[0]['interface'])
+
+    def test_register_descriptor_expect_create_unchanged_update(self):
+        with FakeAasServer() as server:
+            client = SubmodelRegistryClient(server.url)
+
+            self.assertEqual(201, client.register_descriptor(self.descriptor)[0])
+            # An equal descriptor (endpoints in a different order) is only compared, not sent again:
+            existing = dict(self.descriptor, endpoints=list(reversed(self.descriptor['endpoints'])))
+            self.assertEqual(200, client.register_descriptor(existing)[0])
+            self.assertEqual(204, client.register_descriptor(dict(self.descriptor, idShort='changed'))[0])
+
+            self.assertEqual(
+                'changed',
+                server.repository.collections['submodel-descriptors']['sm-id']['idShort']
+            )
+            self.assertEqual(dict(GET=3, POST=1, PUT=1), server.stats.as_dict()['requests_per_method'])
@@ -161,3 +161,43 @@ class UnitTests(unittest.TestCase):
             0,
             len(content['result'])
         )
+
+    def test_09_register_submodel_descriptor_expect_201(self):
+        status_code, content = UnitTests.shell_repo_client.register_descriptor(UnitTests.test_submodel_descriptor)
+
+        self.assertEqual(
+            201,
+            status_code
+        )
+
+    def test_10_register_submodel_descriptor_unchanged_expect_200(self):
+        status_code, content = UnitTests.shell_repo_client.register_descriptor(UnitTests.test_submodel_descriptor)
+
+        self.assertEqual(
+            200,
+            status_code
+        )
+
+    def test_11_register_submodel_descriptor_changed_expect_204(self):
+        changed_descriptor = dict(UnitTests.test_submodel_descriptor, idShort='sm-id-short')
+        status_code, content = UnitTests.shell_repo_client.register_descriptor(changed_descriptor)
+
+        self.assertEqual(
+            204,
+            status_code
+        )
+
+        status_code, content = UnitTests.shell_repo_client.get_descriptor(changed_descriptor['id'])
+
+        self.assertEqual(
+            'sm-id-short',
+            content['idShort']
+        )
+
+    def test_12_delete_submodel_descriptor_expect_204(self):
+        status_code, content = UnitTests.shell_repo_client.delete_descriptor(UnitTests.test_submodel_descriptor['id'])
+
+        self.assertEqual(
+            204,
+            status_code
+        )
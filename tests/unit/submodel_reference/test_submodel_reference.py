@@ -238,3 +238,62 @@ class UnitTests(unittest.TestCase):
             0,
             len(content['result'])
         )
+
+    def get_sm_refs(self, count=3):
+        return [
+            ModelReference(
+                key=[Key(type_=KeyTypes.SUBMODEL, value=f'{UnitTests.test_sm_id}_{index}')],
+                type_=ModelReference.__name__
+            )
+            for index in range(count)
+        ]
+
+    def test_15_add_submodel_references_expect_201(self):
+        responses = UnitTests.shell_repo_client.add_submodel_references(
+            UnitTests.test_shell.id,
+            self.get_sm_refs()
+        )
+
+        self.assertEqual(
+            [201, 201, 201],
+            [status_code for status_code, content in responses]
+        )
+
+    def test_16_add_submodel_references_again_expect_200(self):
+        sm_refs = self.get_sm_refs(4)
+        responses = UnitTests.shell_repo_client.add_submodel_references(
+            UnitTests.test_shell.id,
+            sm_refs + [sm_refs[3]]
+        )
+
+        # The duplicate reference is added once and reports the result of that addition:
+        self.assertEqual(
+            [200, 200, 200, 201, 201],
+            [status_code for status_code, content in responses]
+        )
+
+    def test_17_get_submodel_reference_ids_expect_four(self):
+        sm_ids = UnitTests.shell_repo_client.get_submodel_reference_ids(UnitTests.test_shell.id)
+
+        self.assertEqual(
+            {sm_ref.key[0].value for sm_ref in self.get_sm_refs(4)},
+            sm_ids
+        )
+
+    def test_18_delete_submodel_references_expect_204_404(self):
+        sm_ids = [sm_ref.key[0].value for sm_ref in self.get_sm_refs(4)]
+        responses = UnitTests.shell_repo_client.delete_submodel_references(
+            UnitTests.test_shell.id,
+            sm_ids + [sm_ids[0], 'unknown_sm_id']
+        )
+
+        # The duplicate id is deleted once and reports the result of that deletion:
+        self.assertEqual(
+            [204, 204, 204, 204, 204, 404],
+            [status_code for status_code, content in responses]
+        )
+
+        self.assertEqual(
+            0,
+            len(UnitTests.shell_repo_client.get_submodel_reference_ids(UnitTests.test_shell.id))
+        )
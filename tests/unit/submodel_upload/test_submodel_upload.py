@@ -0,0 +1,117 @@
+import json
+import unittest
+from unittest import mock
+
+import requests
+
+from plugins.callback.submodel_upload import CallbackModule, get_facts
+from tests.unit.helpers import FakeAdapter
+
+
+class FakeRepoAdapter(FakeAdapter):
+    def __init__(self, timeout_ids=()):
+        super().__init__()
+        self.submodels = []
+        self.timeout_ids = timeout_ids
+
+    def respond(self, request):
+        submodel = json.loads(request.body)
+        if submodel['id'] in self.timeout_ids:
+            raise requests.exceptions.ReadTimeout(request=request)
+        self.submodels.append(submodel)
+        return 201, request.body, dict()
+
+
+class FakeHost:
+    def __init__(self, name):
+        self.name = name
+
+    def get_name(self):
+        return self.name
+
+
+class FakeTask:
+    def __init__(self, action):
+        self.action = action
+
+
+class FakeResult:
+    def __init__(self, host, action, result):
+        self._host = FakeHost(host)
+        self._task = FakeTask(action)
+        self._result = result
+
+
+class FakeOptionsCallbackModule(CallbackModule):
+    options = dict(
+        url='http://localhost:8081', id_prefix='urn:facts:', semantic_id='urn:semantic:facts', batch_size=2,
+        concurrency=2
+    )
+
+    def get_option(self, option, hostvars=None):
+        return self.options[option]
+
+
+class UnitTests(unittest.TestCase):
+    def get_callback(self, timeout_ids=()):
+        callback = FakeOptionsCallbackModule()
+        callback.set_options()
+        callback._display = mock.Mock()
+        adapter = FakeRepoAdapter(timeout_ids)
+        callback.client.session.mount('http://', adapter)
+        return callback, adapter
+
+    def get_facts_result(self, host, action='ansible.builtin.setup'):
+        return FakeResult(host, action, dict(ansible_facts=dict(ansible_hostname=host, ansible_os_family='Debian')))
+
+    def test_get_facts_expect_prefix_removed(self):
+        self.assertEqual(
+            dict(hostname='host1', os_family='Debian'),
+            get_facts(self.get_facts_result('host1')._result)
+        )
+
+    def test_other_task_expect_no_upload(self):
+        callback, adapter = self.get_callback()
+        callback.v2_runner_on_ok(self.get_facts_result('host1', 'ansible.builtin.set_fact'))
+        callback.v2_playbook_on_stats(None)
+
+        self.assertEqual([], adapter.submodels)
+
+    def test_facts_expect_upload_at_end_of_play(self):
+        callback, adapter = self.get_callback()
+        callback.v2_runner_on_ok(self.get_facts_result('host1'))
+        self.assertEqual([], callback.uploads)
+
+        callback.v2_playbook_on_play_start(None)
+
+        self.assertEqual(['urn:facts:host1'], [submodel['id'] for submodel in adapter.submodels])
+
+    def test_batch_size_expect_upload_before_end_of_play(self):
+        callback, adapter = self.get_callback()
+        for host in ['host1', 'host2', 'host3']:
+            callback.v2_runner_on_ok(self.get_facts_result(host))
+
+        self.assertEqual(2, len(callback.uploads))
+        self.assertEqual(['host3'], list(callback.pending))
+
+        callback.v2_playbook_on_stats(None)
+        self.assertEqual(
+            ['urn:facts:host1', 'urn:facts:host2', 'urn:facts:host3'],
+            sorted(submodel['id'] for submodel in adapter.submodels)
+        )
+
+    def test_failed_hosts_expect_warning_and_other_hosts_uploaded(self):
+        callback, adapter = self.get_callback(timeout_ids=['urn:facts:host2'])
+        callback.v2_runner_on_ok(self.get_facts_result('host1'))
+        callback.v2_runner_on_ok(self.get_facts_result('host2'))
+        # An idShort without any allowed character can not be converted:
+        callback.v2_runner_on_ok(FakeResult('host3', 'ansible.builtin.setup', dict(ansible_facts={'---': dict(a=1)})))
+
+        callback.v2_playbook_on_stats(None)
+
+        self.assertEqual(['urn:facts:host1'], [submodel['id'] for submodel in adapter.submodels])
+        callback._display.warning.assert_called_once()
+        warning = callback._display.warning.call_args[0][0]
+        self.assertIn('2 hosts', warning)
+        self.assertIn('host2 (', warning)
+        self.assertIn('host3 (Failed to convert facts.', warning)
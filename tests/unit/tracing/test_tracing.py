@@ -0,0 +1,94 @@
+import json
+import os
+import tempfile
+import unittest
+
+from plugins.module_utils.convert import convert_to_submodel
+from plugins.module_utils.session import create_session
+from plugins.module_utils.tracing import (STATUS_CODE_ERROR, STATUS_CODE_OK, SPAN_KIND_CLIENT, Tracer, create_tracer,
+                                          trace)
+from tests.unit.helpers import FakeAdapter
+
+
+class FakeStatusAdapter(FakeAdapter):
+    def respond(self, request):
+        return 404 if request.url.endswith('missing') else 200, dict(), dict()
+
+
+def get_attributes(span) -> dict:
+    return {attribute['key']: list(attribute['value'].values())[0] for attribute in span['attributes']}
+
+
+class UnitTests(unittest.TestCase):
+    url = 'http://localhost:8081/submodels'
+
+    def setUp(self):
+        self.trace_dir = tempfile.TemporaryDirectory()
+        self.tracer = Tracer(self.trace_dir.name, 'submodel', 'host1')
+
+    def tearDown(self):
+        # Nothing left to export at exit:
+        self.tracer.exported = True
+        self.trace_dir.cleanup()
+
+    def get_spans(self) -> dict:
+        spans = self.tracer.as_dict()['resourceSpans'][0]['scopeSpans'][0]['spans']
+        return {span['name']: span for span in spans}
+
+    def test_tracing_disabled_expect_none(self):
+        self.assertIsNone(create_tracer(dict(trace_dir=None), 'submodel'))
+        with trace(None, 'create_submodel'):
+            pass
+
+    def test_nested_spans_expect_parents(self):
+        with trace(self.tracer, 'outer'):
+            with trace(self.tracer, 'inner', count=2):
+                pass
+
+        spans = self.get_spans()
+        self.assertEqual('', spans['submodel']['parentSpanId'])
+        self.assertEqual(spans['submodel']['spanId'], spans['outer']['parentSpanId'])
+        self.assertEqual(spans['outer']['spanId'], spans['inner']['parentSpanId'])
+        self.assertEqual({'count': '2'}, get_attributes(spans['inner']))
+
+    def test_exception_expect_error_status(self):
+        with self.assertRaises(ValueError):
+            with trace(self.tracer, 'failing'):
+                raise ValueError('test')
+
+        self.assertEqual(STATUS_CODE_ERROR, self.get_spans()['failing']['status']['code'])
+
+    def test_requests_expect_client_spans(self):
+        session = create_session(tracer=self.tracer)
+        session.mount('http://', FakeStatusAdapter())
+        session.post(self.url, data=b'12345')
+        session.get(f'{self.url}/missing')
+
+        spans = self.get_spans()
+        post, get = spans['POST /submodels'], spans['GET /submodels/missing']
+        self.assertEqual(SPAN_KIND_CLIENT, post['kind'])
+        self.assertEqual(STATUS_CODE_OK, post['status']['code'])
+        self.assertEqual('5', get_attributes(post)['http.request.body.size'])
+        self.assertEqual('200', get_attributes(post)['http.response.status_code'])
+        self.assertEqual(STATUS_CODE_ERROR, get['status']['code'])
+
+    def test_convert_expect_span(self):
+        convert_to_submodel('test_id', dict(key='value'), tracer=self.tracer)
+
+        self.assertEqual('test_id', get_attributes(self.get_spans()['convert_to_submodel'])['aas.submodel.id'])
+
+    def test_export_expect_otlp_json_line(self):
+        with trace(self.tracer, 'create_submodel'):
+            pass
+        self.tracer.export()
+        self.tracer.export()
+
+        with open(os.path.join(self.trace_dir.name, 'host1.jsonl')) as fp:
+            lines = fp.readlines()
+        self.assertEqual(1, len(lines))
+
+        resource_spans = json.loads(lines[0])['resourceSpans'][0]
+        self.assertIn(dict(key='host.name', value=dict(stringValue='host1')), resource_spans['resource']['attributes'])
+        spans = resource_spans['scopeSpans'][0]['spans']
+        self.assertEqual(['submodel', 'create_submodel'], [span['name'] for span in spans])
+        self.assertEqual({self.tracer.trace_id}, {span['traceId'] for span in spans})
@@ -0,0 +1,107 @@
+import unittest
+
+from plugins.module_utils.convert import convert_to_submodel
+from plugins.module_utils.validation import (get_value_error, validate_aas_descriptor, validate_submodel,
+                                             validate_submodel_descriptor)
+
+
+def get_property(id_short, value_type='xs:string', value=None) -> dict:
+    element = dict(modelType='Property', valueType=value_type, value=value)
+    if id_short is not None:
+        element['idShort'] = id_short
+    return element
+
+
+def get_submodel(*elements) -> dict:
+    return dict(modelType='Submodel', id='sm_id', idShort='sm', submodelElements=list(elements))
+
+
+def get_endpoint(href='http://localhost:8081/submodels/c21faWQ') -> dict:
+    return dict(interface='SUBMODEL-3.0', protocolInformation=dict(href=href))
+
+
+class UnitTests(unittest.TestCase):
+    def test_converted_facts_expect_valid(self):
+        facts = dict(
+            hostname='host', processor_count=4, is_chroot=False, memory_mb=dict(real=dict(total=1024)),
+            interfaces=['lo', 'eth0'], mounts=[dict(mount='/', size_total=1000)], python_version='3.11.7',
+        )
+        self.assertEqual([], validate_submodel(convert_to_submodel('sm_id', facts, sm_id_short='facts')))
+
+    def test_id_shorts_expect_constraint_aasd_002(self):
+        for id_short in ['ab', 'a1', 'a_', 'a-b', 'serial-number_2']:
+            self.assertEqual([], validate_submodel(get_submodel(get_property(id_short))), id_short)
+        for id_short in ['a', 'a-', '1a', '_a', 'a.b', 'a b', 'a' * 129]:
+            self.assertEqual(1, len(validate_submodel(get_submodel(get_property(id_short)))), id_short)
+
+    def test_value_types_expect_lexical_checks(self):
+        self.assertIsNone(get_value_error('-128', 'xs:byte'))
+        self.assertIsNone(get_value_error(True, 'xs:boolean'))
+        self.assertIsNone(get_value_error('1.5E3', 'xs:double'))
+        self.assertIsNone(get_value_error('2024-01-31T12:00:00.5Z', 'xs:dateTime'))
+        self.assertIsNone(get_value_error('anything', 'xs:string'))
+        self.assertIn('out of range', get_value_error('-129', 'xs:byte'))
+        self.assertIn('out of range', get_value_error('0', 'xs:positiveInteger'))
+        self.assertIn('is no xs:decimal', get_value_error('1e3', 'xs:decimal'))
+        self.assertIn('is no xs:date', get_value_error('31.01.2024', 'xs:date'))
+
+    def test_invalid_elements_expect_errors_with_paths(self):
+        errors = validate_submodel(get_submodel(
+            get_property('1st'),
+            get_property('count', 'xs:int', 'many'),
+            get_property('unit', 'xs:text'),
+            get_property(None),
+            dict(modelType='SubmodelElementCollection', idShort='collection', value=[
+                get_property('ab'), get_property('ab'), dict(modelType='Unknown', idShort='bc'),
+            ]),
+        ))
+
+        self.assertEqual([
+            "$.submodelElements[0].idShort: '1st' is no valid idShort (a letter followed by at least one letter, "
+            "digit, _ or -, not ending with -)",
+            "$.submodelElements[1].value: 'many' is no xs:int",
+            "$.submodelElements[2].valueType: 'xs:text' is no valid data type",
+            '$.submodelElements[3].idShort: is required for elements which are not in a SubmodelElementList',
+            "$.submodelElements[4].value[1].idShort: duplicate idShort 'ab'",
+            "$.submodelElements[4].value[2].modelType: 'Unknown' is no submodel element type",
+        ], errors)
+
+    def test_list_elements_expect_list_constraints(self):
+        errors = validate_submodel(get_submodel(dict(
+            modelType='SubmodelElementList', idShort='list', typeValueListElement='Property',
+            valueTypeListElement='xs:int', value=[
+                get_property(None, 'xs:int', '1'),
+                get_property('named', 'xs:int', '2'),
+                get_property(None, 'xs:string', 'three'),
+                dict(modelType='File', contentType='text/plain'),
+            ]
+        )))
+
+        self.assertEqual([
+            '$.submodelElements[0].value[1].idShort: must not be set for elements of a SubmodelElementList',
+            "$.submodelElements[0].value[2].valueType: 'xs:string' does not match valueTypeListElement xs:int",
+            '$.submodelElements[0].value[3].modelType: File does not match typeValueListElement Property',
+        ], errors)
+
+    def test_many_errors_expect_bounded_report(self):
+        errors = validate_submodel(get_submodel(*[get_property(f'p{i}', 'xs:int', 'x') for i in range(1000)]), 5)
+
+        self.assertEqual(6, len(errors))
+        self.assertEqual('Validation stopped after 5 errors', errors[-1])
+
+    def test_descriptors_expect_id_and_endpoints(self):
+        self.assertEqual([], validate_submodel_descriptor(dict(id='sm_id', endpoints=[get_endpoint()])))
+        self.assertEqual([
+            '$.id: is required and must be a non-empty string',
+            '$.endpoints: at least one endpoint is required',
+        ], validate_submodel_descriptor(dict(idShort='sm')))
+
+        self.assertEqual([], validate_aas_descriptor(dict(id='shell_id')))
+        self.assertEqual([
+            '$.endpoints[0].protocolInformation.href: is required',
+            '$.submodelDescriptors[0].endpoints[0].interface: is required',
+        ], validate_aas_descriptor(dict(
+            id='shell_id',
+            endpoints=[get_endpoint('')],
+            submodelDescriptors=[dict(id='sm_id', endpoints=[dict(protocolInformation=dict(href='http://x'))])],
+        )))
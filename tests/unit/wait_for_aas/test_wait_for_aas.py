@@ -0,0 +1,71 @@
+import socket
+import threading
+import time
+import unittest
+
+from plugins.modules.wait_for_aas import ReadinessProbe
+from tests.benchmark.fake_server import FakeAasServer
+
+
+def get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class UnitTests(unittest.TestCase):
+    def test_ready_endpoints_expect_one_probe_each(self):
+        with FakeAasServer() as repository, FakeAasServer() as registry:
+            probe = ReadinessProbe(health_path='/shells')
+
+            endpoints = probe.wait_all([repository.url, registry.url, repository.url], timeout=5)
+
+            self.assertEqual([repository.url, registry.url], list(endpoints))
+            self.assertTrue(all(endpoint['ready'] and endpoint['attempts'] == 1 for endpoint in endpoints.values()))
+
+    def test_endpoint_started_later_expect_ready_with_backoff(self):
+        port = get_free_port()
+        servers = []
+        # The server binds its port when it is created, so it is created late as well:
+        timer = threading.Timer(0.5, lambda: servers.append(FakeAasServer(port=port).start()))
+        timer.start()
+        try:
+            endpoint = ReadinessProbe(health_path='/shells', initial_interval=0.05).wait_all(
+                [f'http://127.0.0.1:{port}'], timeout=10
+            )[f'http://127.0.0.1:{port}']
+        finally:
+            timer.join()
+            for server in servers:
+                server.stop()
+
+        self.assertTrue(endpoint['ready'])
+        self.assertEqual(200, endpoint['status'])
+        self.assertGreater(endpoint['attempts'], 1)
+        # Probes after 0, 0.05, 0.15, 0.35, 0.75 seconds instead of one every 0.05 seconds:
+        self.assertLessEqual(endpoint['attempts'], 6)
+
+    def test_unavailable_endpoint_expect_not_ready_at_deadline(self):
+        url = f'http://127.0.0.1:{get_free_port()}'
+        start = time.monotonic()
+
+        endpoint = ReadinessProbe(initial_interval=0.05, max_interval=0.1).wait_all([url], timeout=0.5)[url]
+
+        self.assertFalse(endpoint['ready'])
+        self.assertEqual('ConnectionError', endpoint['status'])
+        self.assertGreater(endpoint['attempts'], 2)
+        self.assertLess(time.monotonic() - start, 1.5)
+
+    def test_health_status_down_expect_not_ready(self):
+        with FakeAasServer() as server:
+            self.assertEqual((False, 404), ReadinessProbe().probe(server.url, 1))
+
+            server.repository.collections['shells']['health'] = dict(id='health', status='DOWN')
+            probe = ReadinessProbe(health_path='/shells/aGVhbHRo')
+            self.assertEqual((False, 200), probe.probe(server.url, 1))
+
+            server.repository.collections['shells']['health']['status'] = 'UP'
+            self.assertEqual((True, 200), probe.probe(server.url, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()